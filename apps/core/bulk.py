@@ -0,0 +1,111 @@
+import datetime
+import io
+
+from django.db import connections, router
+from django.db.models.fields import AutoFieldMixin
+
+
+def copy_value(value):
+    """Format a database value for PostgreSQL's COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if hasattr(value, "adapted") and hasattr(value, "dumps"):
+        # psycopg2's Json adapter, as prepared for JSONField
+        value = value.dumps(value.adapted)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_bulk_create(model, objs):
+    """
+    Insert model instances with PostgreSQL's COPY ... FROM STDIN instead
+    of one large parameterized INSERT. Primary keys are reserved from the
+    table's sequence first, so they're set on `objs` like bulk_create.
+    Falls back to bulk_create on other database backends.
+    """
+    objs = list(objs)
+    db = router.db_for_write(model)
+    connection = connections[db]
+    if connection.vendor != "postgresql" or not objs:
+        return model.objects.bulk_create(objs)
+
+    opts = model._meta
+    quote_name = connection.ops.quote_name
+    fields = opts.concrete_fields
+
+    with connection.cursor() as cursor:
+        if isinstance(opts.pk, AutoFieldMixin):
+            # Reserve ids for every row in a single query
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+                "FROM generate_series(1, %s)",
+                [opts.db_table, opts.pk.column, len(objs)],
+            )
+            for obj, (pk,) in zip(objs, cursor.fetchall()):
+                obj.pk = pk
+
+        buffer = io.StringIO()
+        for obj in objs:
+            values = (
+                field.get_db_prep_save(field.pre_save(obj, True), connection)
+                for field in fields
+            )
+            buffer.write("\t".join(map(copy_value, values)) + "\n")
+        buffer.seek(0)
+
+        columns = ", ".join(quote_name(field.column) for field in fields)
+        cursor.copy_expert(
+            f"COPY {quote_name(opts.db_table)} ({columns}) FROM STDIN", buffer
+        )
+
+    for obj in objs:
+        obj._state.adding = False
+        obj._state.db = db
+    return objs
+
+
+def unnest_bulk_update(model, objs, fields):
+    """
+    Update `fields` of model instances with one UPDATE ... FROM unnest()
+    statement that takes a typed array per column, instead of the
+    CASE WHEN per row and field that bulk_update builds. Falls back to
+    bulk_update on other database backends.
+    """
+    objs = list(objs)
+    db = router.db_for_write(model)
+    connection = connections[db]
+    if connection.vendor != "postgresql" or not objs:
+        return model.objects.bulk_update(objs, fields)
+
+    opts = model._meta
+    quote_name = connection.ops.quote_name
+    fields = [opts.pk, *(opts.get_field(name) for name in fields)]
+    columns = [quote_name(field.column) for field in fields]
+    arrays = [
+        [
+            field.get_db_prep_save(getattr(obj, field.attname), connection)
+            for obj in objs
+        ]
+        for field in fields
+    ]
+    unnest = ", ".join(f"%s::{field.db_type(connection)}[]" for field in fields)
+    assignments = ", ".join(f"{column} = v.{column}" for column in columns[1:])
+    table = quote_name(opts.db_table)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET {assignments} "  # nosec B608
+            f"FROM unnest({unnest}) AS v({', '.join(columns)}) "
+            f"WHERE {table}.{columns[0]} = v.{columns[0]}",
+            arrays,
+        )
+        return cursor.rowcount
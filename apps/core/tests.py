@@ -1,4 +1,8 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
+from django.db import connection
 from django.test import (
     Client,
     RequestFactory,
@@ -6,8 +10,12 @@ from django.test import (
     TestCase,
     override_settings,
 )
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from apps.leagues.models import Conference, League
+
+from .bulk import copy_bulk_create, unnest_bulk_update
 from .services import show_toolbar
 from .utils import env_to_bool
 
@@ -109,3 +117,77 @@ class ShowToolbarTests(TestCase):
 # RandomStringGeneratorTest
 
 # UniqueSlugifyTest
+
+
+class CopyBulkCreateTest(TestCase):
+    """Test bulk loading rows with PostgreSQL COPY."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email="copyuser@example.com", password="testpass123", is_active=True
+        )
+        self.league = League(name="Copy League", user=user, gm_name="Test GM")
+        self.league.save(isolate=True)
+
+    def test_rows_are_copied_with_primary_keys(self):
+        names = ["Tab\tName", "New\nLine", "Back\\slash"]
+        conferences = copy_bulk_create(
+            Conference, [Conference(name=name, league=self.league) for name in names]
+        )
+        self.assertTrue(all(conference.pk for conference in conferences))
+        self.assertEqual(
+            [Conference.objects.get(pk=conf.pk).name for conf in conferences], names
+        )
+
+        # The sequence continues after the reserved ids
+        conference = Conference.objects.create(name="Next", league=self.league)
+        self.assertGreater(conference.pk, max(conf.pk for conf in conferences))
+
+    def test_other_backends_use_bulk_create(self):
+        conferences = [Conference(name="Fallback", league=self.league)]
+        with (
+            mock.patch.object(connection, "vendor", "sqlite"),
+            mock.patch.object(
+                Conference.objects, "bulk_create", return_value=conferences
+            ) as bulk_create,
+        ):
+            copy_bulk_create(Conference, conferences)
+        bulk_create.assert_called_once_with(conferences)
+
+
+class UnnestBulkUpdateTest(TestCase):
+    """Test updating many rows with one UPDATE ... FROM unnest()."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email="unnestuser@example.com", password="testpass123", is_active=True
+        )
+        self.league = League(name="Unnest League", user=user, gm_name="Test GM")
+        self.league.save(isolate=True)
+        self.conferences = copy_bulk_create(
+            Conference,
+            [Conference(name=f"Conf {i}", league=self.league) for i in range(3)],
+        )
+
+    def test_rows_are_updated_in_one_query(self):
+        for conference, name in zip(self.conferences, ["O'Brien", "Tab\tName", ""]):
+            conference.name = name
+        with CaptureQueriesContext(connection) as queries:
+            updated = unnest_bulk_update(Conference, self.conferences[:2], ["name"])
+        self.assertEqual((updated, len(queries)), (2, 1))
+        self.assertEqual(
+            list(
+                Conference.objects.filter(league=self.league)
+                .order_by("pk")
+                .values_list("name", flat=True)
+            ),
+            ["O'Brien", "Tab\tName", "Conf 2"],
+        )
+
+    def test_other_backends_use_bulk_update(self):
+        with (
+            mock.patch.object(connection, "vendor", "sqlite"),
+            mock.patch.object(Conference.objects, "bulk_update") as bulk_update,
+        ):
+            unnest_bulk_update(Conference, self.conferences, ["name"])
+        bulk_update.assert_called_once_with(self.conferences, ["name"])
@@ -15,6 +15,7 @@ class LeagueAdmin(admin.ModelAdmin):
         "gm_name",
         "creation_date",
         "slug",
+        "is_template",
     )
     readonly_fields = ("id",)
 
@@ -0,0 +1,46 @@
+import hashlib
+
+from django.apps import apps
+from django.db.models import F
+from django.utils import timezone
+
+
+def get_league_cache_key(league, *parts):
+    """
+    Build a cache key for league data that changes whenever the
+    league's version is bumped, so stale entries are never read again.
+    """
+    digest = hashlib.md5(
+        ":".join(map(str, parts)).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"league:{league.pk}:{league.version}:{digest}"
+
+
+def bump_league_version(league_id):
+    """
+    Invalidate everything cached for a league. Call whenever data shown
+    on its pages changes, e.g. advancing the season or selecting a team.
+    """
+    League = apps.get_model("leagues.League")
+    League.objects.filter(pk=league_id).update(
+        version=F("version") + 1, modified_at=timezone.now()
+    )
+
+
+def get_league_etag(league, season, *parts):
+    """
+    Build an ETag for a league page from the league's version, the state
+    of its current season and any other `parts` the page depends on.
+    """
+    parts = [league.pk, league.version, league.modified_at.isoformat(), *parts]
+    if season is not None:
+        parts += [
+            season.pk,
+            season.week_number,
+            season.phase,
+            season.current_date.isoformat(),
+        ]
+    digest = hashlib.md5(
+        ":".join(map(str, parts)).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f'"{digest}"'
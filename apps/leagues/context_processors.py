@@ -0,0 +1,16 @@
+from .resolver import get_league_resolver
+
+
+def current_season(request):
+    """
+    Make the URL's league's current season available in template context
+    for league pages whose views don't already provide it
+    """
+    if getattr(request, "resolver_match", None) is None:
+        return {}
+    resolver = get_league_resolver(request)
+    if resolver.league_slug is None:
+        return {}
+    return {
+        "season": resolver.season,
+    }
@@ -0,0 +1,29 @@
+from django import forms
+
+from .models import League
+
+
+class LeagueCreateForm(forms.ModelForm):
+    """
+    Form for creating a league, optionally copied from the default
+    template league instead of being generated from scratch.
+    """
+
+    use_template = forms.BooleanField(
+        required=False,
+        initial=True,
+        label="Start from the default league",
+        help_text="Copies a ready-made league, which is much faster to create.",
+    )
+
+    class Meta:
+        model = League
+        fields = ["name", "gm_name"]
+
+    def __init__(self, *args, **kwargs):
+        self.template = kwargs.pop("template", None)
+        super().__init__(*args, **kwargs)
+
+        # Only offer the option when there's a template to copy
+        if self.template is None:
+            del self.fields["use_template"]
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from apps.leagues.services.pool import run_pool_worker
+
+
+class Command(BaseCommand):
+    help = "Run a worker that keeps a pool of pre-built leagues ready to claim."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size",
+            type=int,
+            help="Number of leagues to keep in the pool. Defaults to the "
+            "LEAGUE_POOL_SIZE setting.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait before checking a full pool again.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the pool is full instead of refilling forever.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Filling the league pool...")
+        run_pool_worker(
+            size=options["size"], interval=options["interval"], once=options["once"]
+        )
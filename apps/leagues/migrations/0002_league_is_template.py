@@ -0,0 +1,18 @@
+# Generated by Django 4.2.3 on 2026-10-18 09:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leagues', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='league',
+            name='is_template',
+            field=models.BooleanField(default=False, help_text='Copied when users create a league from the default league'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:01
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('leagues', '0002_league_is_template'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='league',
+            name='user',
+            field=models.ForeignKey(blank=True, help_text='Unowned leagues are kept in the pool for new leagues to claim', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leagues', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leagues', '0003_league_pool'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='league',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.3 on 2026-10-18 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leagues', '0004_league_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='league',
+            name='modified_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
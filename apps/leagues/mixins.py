@@ -1,8 +1,14 @@
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
 from django.views.generic.base import ContextMixin
 
-from .models import League
+from .cache import get_league_cache_key, get_league_etag
+from .resolver import get_league_resolver
 
 
 class LeagueOwnerRequiredMixin(LoginRequiredMixin):
@@ -20,18 +26,88 @@ class LeagueContextMixin(ContextMixin):
     """
     Mixin that adds the League an object or view is associated with
     to the template context. Not for use in generic League views themselves.
+    The league and its current season are loaded once per request.
     """
 
+    def get_league(self):
+        return get_league_resolver(self.request).get_league_or_404()
+
+    def get_season(self):
+        resolver = get_league_resolver(self.request)
+        resolver.get_league_or_404()
+        return resolver.season
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context["league"] = self.get_league()
+        context["season"] = self.get_season()
+        return context
 
-        league_slug = self.kwargs.get("league")
-        if league_slug is not None:
-            league = get_object_or_404(League, slug=league_slug)
-        else:
-            league = None
 
-        context["league"] = league
-        context["season"] = league.current_season
+class LeagueCacheMixin:
+    """
+    Cache the rendered GET response of a league page until the league's
+    version is bumped. Must come after the permission mixin. Pages with
+    pending messages or without a CSRF cookie yet are never cached, as
+    they contain one-off or per-session output.
+    """
 
-        return context
+    def get(self, request, *args, **kwargs):
+        league = get_league_resolver(request).get_league_or_404()
+        csrf_cookie = request.META.get("CSRF_COOKIE")
+        if csrf_cookie is None or len(messages.get_messages(request)):
+            return super().get(request, *args, **kwargs)
+
+        cache_key = get_league_cache_key(
+            league, "page", request.user.pk, csrf_cookie, request.get_full_path()
+        )
+        content = cache.get(cache_key)
+        if content is not None:
+            return HttpResponse(content)
+
+        def cache_response(response):
+            # Messages added while rendering, e.g. finished advance jobs
+            if response.status_code == 200 and not len(messages.get_messages(request)):
+                cache.set(cache_key, response.content, settings.LEAGUE_CACHE_TIMEOUT)
+
+        response = super().get(request, *args, **kwargs)
+        response.add_post_render_callback(cache_response)
+        return response
+
+
+class LeagueConditionalMixin:
+    """
+    Answer conditional GETs of a league page with 304 Not Modified while
+    the league's version and current season are unchanged, before any of
+    the view's own queries run. Must come after the permission mixin and
+    before LeagueCacheMixin. Pages showing messages get no validators.
+    """
+
+    def get(self, request, *args, **kwargs):
+        resolver = get_league_resolver(request)
+        league = resolver.get_league_or_404()
+        csrf_cookie = request.META.get("CSRF_COOKIE")
+        if (
+            not request.user.is_authenticated
+            or league.user_id != request.user.pk
+            or csrf_cookie is None
+            or len(messages.get_messages(request))
+        ):
+            return super().get(request, *args, **kwargs)
+
+        etag = get_league_etag(league, resolver.season, request.user.pk, csrf_cookie)
+        response = condition(
+            etag_func=lambda *args, **kwargs: etag,
+            last_modified_func=lambda *args, **kwargs: league.modified_at,
+        )(super().get)(request, *args, **kwargs)
+        patch_cache_control(response, private=True, no_cache=True)
+
+        def drop_validators(response):
+            # Messages added while rendering mustn't be shown again from cache
+            if len(messages.get_messages(request)):
+                del response["ETag"]
+                del response["Last-Modified"]
+
+        if hasattr(response, "add_post_render_callback"):
+            response.add_post_render_callback(drop_validators)
+        return response
@@ -1,6 +1,6 @@
 from django.conf import settings
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
 from django.utils.functional import cached_property
 from django.utils.text import slugify
@@ -12,12 +12,24 @@ from .services.setup import create_league_structure
 
 class League(models.Model):
     user = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="leagues"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="leagues",
+        blank=True,
+        null=True,
+        help_text="Unowned leagues are kept in the pool for new leagues to claim",
     )
     name = models.CharField(max_length=50)
     gm_name = models.CharField(max_length=50)
     creation_date = models.DateTimeField(auto_now_add=True)
     slug = models.SlugField(blank=True, null=True, unique=True)
+    # Bumped whenever the league's pages change, see apps.leagues.cache
+    version = models.PositiveIntegerField(default=1)
+    modified_at = models.DateTimeField(auto_now=True)
+    is_template = models.BooleanField(
+        default=False,
+        help_text="Copied when users create a league from the default league",
+    )
 
     class Meta:
         ordering = ["-creation_date"]
@@ -31,16 +43,29 @@ class League(models.Model):
             self.slug = slugify(self.name + "-" + random_string())
         # False if saving an existing instance
         no_instance_exists = self._state.adding
-        # Save League instance before creating its structure
-        super().save(*args, **kwargs)
-        # Only create structure on initial save() call
-        # And skip if isolate=True is passed (for tests, etc.)
-        if no_instance_exists and not isolate:
-            create_league_structure(self)
+        # Save the League and its structure together or not at all
+        with transaction.atomic():
+            # Save League instance before creating its structure
+            super().save(*args, **kwargs)
+            # Only create structure on initial save() call
+            # And skip if isolate=True is passed (for tests, etc.)
+            if no_instance_exists and not isolate:
+                create_league_structure(self)
 
     def get_absolute_url(self):
         return reverse("leagues:league_detail", args=[self.slug])
 
+    @classmethod
+    def get_template(cls):
+        """
+        Return the most recent template league, or None if there's none
+        that can be cloned, see apps.leagues.services.clone.can_clone.
+        """
+        from .services.clone import can_clone
+
+        template = cls.objects.filter(is_template=True).first()
+        return template if can_clone(template) else None
+
     @property
     def current_season(self):
         try:
@@ -1,9 +1,9 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.core.exceptions import PermissionDenied
-from django.shortcuts import get_object_or_404
+from rest_framework import permissions
 
-from .models import League
+from .resolver import get_league_resolver
 
 
 class IsLeagueOwner(LoginRequiredMixin, UserPassesTestMixin):
@@ -12,12 +12,11 @@ class IsLeagueOwner(LoginRequiredMixin, UserPassesTestMixin):
     """
 
     def test_func(self):
-        league_slug = self.kwargs.get("league")
-        if league_slug is not None:
-            league = get_object_or_404(League, slug=league_slug)
-        else:
+        resolver = get_league_resolver(self.request)
+        if resolver.league_slug is None:
             return False
-        return self.request.user == league.user
+        league = resolver.get_league_or_404()
+        return league.user_id == self.request.user.pk
 
 
 @login_required
@@ -27,11 +26,24 @@ def is_league_owner(func):
     """
 
     def wrap(request, *args, **kwargs):
-        league_slug = kwargs.get("league")
-        if league_slug is not None:
-            league = get_object_or_404(League, slug=league_slug)
-            if league.user == request.user:
+        resolver = get_league_resolver(request)
+        if resolver.league_slug is not None:
+            league = resolver.get_league_or_404()
+            if league.user_id == request.user.pk:
                 return func(request, *args, **kwargs)
         raise PermissionDenied
 
     return wrap
+
+
+class IsLeagueOwnerUser(permissions.BasePermission):
+    """
+    Permission that verifies a user's league ownership in DRF views.
+    """
+
+    def has_permission(self, request, view):
+        resolver = get_league_resolver(request)
+        if resolver.league_slug is None:
+            return False
+        league = resolver.get_league_or_404()
+        return league.user_id == request.user.pk
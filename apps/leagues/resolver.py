@@ -0,0 +1,58 @@
+from django.http import Http404
+from django.utils.functional import cached_property
+
+from .models import League
+
+
+class LeagueResolver:
+    """
+    Loads the league named in a request's URL, its current season and
+    its active user team at most once each, on first access, so views,
+    permissions and context processors can share them.
+    """
+
+    def __init__(self, league_slug):
+        self.league_slug = league_slug
+
+    @cached_property
+    def league(self):
+        if self.league_slug is None:
+            return None
+        return League.objects.filter(slug=self.league_slug).first()
+
+    @cached_property
+    def season(self):
+        if self.league is None:
+            return None
+        season = self.league.current_season
+        if season is not None:
+            season.league = self.league
+        return season
+
+    @cached_property
+    def user_team(self):
+        if self.league is None:
+            return None
+        user_teams = self.league.user_teams.filter(is_active_team=True)
+        user_team = user_teams.select_related("team").first()
+        if user_team is not None:
+            user_team.league = user_team.team.league = self.league
+        return user_team
+
+    def get_league_or_404(self):
+        if self.league is None:
+            raise Http404("No league found matching the query")
+        return self.league
+
+
+def get_league_resolver(request):
+    """
+    Return the request's LeagueResolver, attaching one keyed by the
+    URL's `league` kwarg on first use.
+    """
+    resolver = getattr(request, "league_resolver", None)
+    if resolver is None:
+        resolver_match = getattr(request, "resolver_match", None)
+        league_slug = resolver_match.kwargs.get("league") if resolver_match else None
+        resolver = request.league_resolver = LeagueResolver(league_slug)
+    return resolver
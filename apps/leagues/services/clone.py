@@ -0,0 +1,313 @@
+from django.apps import apps
+from django.db import connection, transaction
+
+from apps.seasons.services.setup import create_team_schedules
+
+
+def can_clone(template):
+    """
+    Whether `template` can be copied with clone_league(): copying runs
+    PostgreSQL-only SQL and the template needs a current season where no
+    games have been played yet, as its box scores and season stats
+    aren't copied.
+    """
+    if template is None or connection.vendor != "postgresql":
+        return False
+    season = template.current_season
+    return season is not None and not season.matchups.filter(is_final=True).exists()
+
+
+def get_map_table(model):
+    """Return the quoted name of the model's temporary id map table."""
+    return connection.ops.quote_name(f"clone_map_{model._meta.db_table}")
+
+
+def create_id_map(cursor, model, source_sql, params):
+    """
+    Create a temporary table mapping the ids selected by `source_sql`
+    to new ids reserved from the model's sequence, dropped at the end of
+    the transaction at the latest. Returns its quoted name.
+    """
+    opts = model._meta
+    map_table = get_map_table(model)
+    cursor.execute(
+        f"CREATE TEMPORARY TABLE {map_table} ON COMMIT DROP AS "  # nosec B608
+        "SELECT src.id AS old_id, nextval(pg_get_serial_sequence(%s, %s)) AS new_id "
+        f"FROM ({source_sql}) src",
+        [opts.db_table, opts.pk.column, *params],
+    )
+    return map_table
+
+
+def copy_rows(cursor, model, source_sql, params, remap=None, values=None):
+    """
+    Copy the rows selected by `source_sql` with INSERT ... SELECT under
+    new ids. `remap` maps foreign key columns to the models whose new ids
+    replace them and `values` maps columns to SQL expressions (with their
+    params) evaluated against the source row, aliased `src`.
+    """
+    remap = remap or {}
+    values = values or {}
+    opts = model._meta
+    map_table = create_id_map(cursor, model, source_sql, params)
+
+    quote_name = connection.ops.quote_name
+    columns = [field.column for field in opts.concrete_fields if field != opts.pk]
+    selects = []
+    select_params = []
+    joins = []
+    for column in columns:
+        if column in values:
+            expression, expression_params = values[column]
+            selects.append(expression)
+            select_params.extend(expression_params)
+        elif column in remap:
+            alias = f"map_{column}"
+            joins.append(
+                f"JOIN {get_map_table(remap[column])} {alias} "
+                f"ON {alias}.old_id = src.{quote_name(column)}"
+            )
+            selects.append(f"{alias}.new_id")
+        else:
+            selects.append(f"src.{quote_name(column)}")
+
+    cursor.execute(
+        f"INSERT INTO {quote_name(opts.db_table)} "  # nosec B608
+        f"({', '.join(map(quote_name, [opts.pk.column, *columns]))}) "
+        f"SELECT map.new_id, {', '.join(selects)} "
+        f"FROM {quote_name(opts.db_table)} src "
+        f"JOIN {map_table} map ON map.old_id = src.{quote_name(opts.pk.column)} "
+        f"{' '.join(joins)}",
+        select_params,
+    )
+
+
+def shuffle_contracts(cursor, Contract, template_id):
+    """
+    Copy the template's contracts, handing each roster spot to a random
+    player of the same position. Team overall ratings are recalculated.
+    """
+    Player = apps.get_model("personnel.Player")
+    Team = apps.get_model("teams.Team")
+    quote_name = connection.ops.quote_name
+    contract_table = quote_name(Contract._meta.db_table)
+    player_table = quote_name(Player._meta.db_table)
+    team_table = quote_name(Team._meta.db_table)
+    create_id_map(
+        cursor,
+        Contract,
+        f"SELECT c.id FROM {contract_table} c "  # nosec B608
+        f"JOIN {team_table} t ON t.id = c.team_id WHERE t.league_id = %s",
+        [template_id],
+    )
+    cursor.execute(
+        f"""
+        WITH spots AS (
+            SELECT c.team_id, c.is_active, p.position,
+                row_number() OVER (PARTITION BY p.position ORDER BY c.id) AS num
+            FROM {contract_table} c
+            JOIN {player_table} p ON p.id = c.player_id
+            JOIN {get_map_table(Contract)} map ON map.old_id = c.id
+        ),
+        players AS (
+            SELECT p.id, p.position,
+                row_number() OVER (PARTITION BY p.position ORDER BY random()) AS num
+            FROM {player_table} p
+            JOIN {get_map_table(Player)} map ON map.old_id = p.id
+        )
+        INSERT INTO {contract_table} (id, player_id, team_id, is_active)
+        SELECT nextval(pg_get_serial_sequence(%s, 'id')), player_map.new_id,
+            team_map.new_id, spots.is_active
+        FROM spots
+        JOIN players
+            ON players.position = spots.position AND players.num = spots.num
+        JOIN {get_map_table(Player)} player_map
+            ON player_map.old_id = players.id
+        JOIN {get_map_table(Team)} team_map
+            ON team_map.old_id = spots.team_id
+        """,  # nosec B608
+        [Contract._meta.db_table],
+    )
+    # Same as Team.update_team_overall(), for every cloned team at once
+    cursor.execute(
+        f"""
+        UPDATE {team_table} team SET overall_rating = ratings.overall
+        FROM (
+            SELECT c.team_id, trunc(avg(p.overall_rating)) AS overall
+            FROM {contract_table} c
+            JOIN {player_table} p ON p.id = c.player_id
+            JOIN {get_map_table(Team)} map ON map.new_id = c.team_id
+            GROUP BY c.team_id
+        ) ratings
+        WHERE team.id = ratings.team_id
+        """  # nosec B608
+    )
+
+
+def rank_depth_charts(cursor, league_id):
+    """
+    Same as refresh_depth_charts() in apps.teams.services.depth_chart,
+    for every team in the league at once.
+    """
+    DepthChartSpot = apps.get_model("teams.DepthChartSpot")
+    quote_name = connection.ops.quote_name
+    spot_table = quote_name(DepthChartSpot._meta.db_table)
+    contract_table = quote_name(apps.get_model("personnel.Contract")._meta.db_table)
+    player_table = quote_name(apps.get_model("personnel.Player")._meta.db_table)
+    team_table = quote_name(apps.get_model("teams.Team")._meta.db_table)
+    cursor.execute(
+        f"""
+        INSERT INTO {spot_table} (id, team_id, player_id, position, depth)
+        SELECT nextval(pg_get_serial_sequence(%s, 'id')), c.team_id, c.player_id,
+            p.position,
+            row_number() OVER (
+                PARTITION BY c.team_id, p.position
+                ORDER BY p.overall_rating DESC, p.id
+            )
+        FROM {contract_table} c
+        JOIN {player_table} p ON p.id = c.player_id
+        JOIN {team_table} t ON t.id = c.team_id
+        WHERE t.league_id = %s AND c.is_active
+        """,  # nosec B608
+        [DepthChartSpot._meta.db_table, league_id],
+    )
+
+
+def clone_league(template, league, shuffle_players=False):
+    """
+    Copy a template league's conferences, divisions, teams, players,
+    contracts, depth charts and current season (with its matchups and
+    standings) into a saved but empty league, entirely inside the
+    database. Player slugs are re-randomized and season dates are reset
+    to this year's defaults.
+    If `shuffle_players` is True, rosters are reshuffled by position.
+    Raises ValueError if the template can't be cloned, see can_clone().
+    """
+    Conference = apps.get_model("leagues.Conference")
+    Division = apps.get_model("leagues.Division")
+    Team = apps.get_model("teams.Team")
+    Player = apps.get_model("personnel.Player")
+    Contract = apps.get_model("personnel.Contract")
+    Season = apps.get_model("seasons.Season")
+    Matchup = apps.get_model("matchups.Matchup")
+    TeamStanding = apps.get_model("seasons.TeamStanding")
+
+    if not can_clone(template):
+        raise ValueError(f"League {template.pk} can't be cloned.")
+
+    def table(model):
+        return connection.ops.quote_name(model._meta.db_table)
+
+    template_season = template.current_season
+    start_date = Season._meta.get_field("start_date").get_default()
+    league_id = ("%s", [league.pk])
+    cloned_models = (
+        Conference,
+        Division,
+        Team,
+        Player,
+        Contract,
+        Season,
+        Matchup,
+        TeamStanding,
+    )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        copy_rows(
+            cursor,
+            Conference,
+            f"SELECT id FROM {table(Conference)} WHERE league_id = %s",  # nosec B608
+            [template.pk],
+            values={"league_id": league_id},
+        )
+        copy_rows(
+            cursor,
+            Division,
+            f"SELECT d.id FROM {table(Division)} d "  # nosec B608
+            f"JOIN {table(Conference)} c ON c.id = d.conference_id "
+            "WHERE c.league_id = %s",
+            [template.pk],
+            remap={"conference_id": Conference},
+        )
+        copy_rows(
+            cursor,
+            Team,
+            f"SELECT id FROM {table(Team)} WHERE league_id = %s",  # nosec B608
+            [template.pk],
+            remap={"conference_id": Conference, "division_id": Division},
+            values={"league_id": league_id},
+        )
+        copy_rows(
+            cursor,
+            Player,
+            f"SELECT id FROM {table(Player)} WHERE league_id = %s",  # nosec B608
+            [template.pk],
+            values={
+                "league_id": league_id,
+                # Replace the random 6 digit suffix
+                "slug": (
+                    "regexp_replace(src.slug, '-[0-9]+$', '') || '-' || "
+                    "lpad(floor(random() * 1000000)::text, 6, '0')",
+                    [],
+                ),
+            },
+        )
+        if shuffle_players:
+            shuffle_contracts(cursor, Contract, template.pk)
+        else:
+            copy_rows(
+                cursor,
+                Contract,
+                f"SELECT c.id FROM {table(Contract)} c "  # nosec B608
+                f"JOIN {table(Team)} t ON t.id = c.team_id WHERE t.league_id = %s",
+                [template.pk],
+                remap={"player_id": Player, "team_id": Team},
+            )
+        copy_rows(
+            cursor,
+            Season,
+            f"SELECT id FROM {table(Season)} WHERE id = %s",  # nosec B608
+            [template_season.pk],
+            values={
+                "league_id": league_id,
+                "start_date": ("%s", [start_date]),
+                "current_date": (
+                    '%s::date + (src."current_date" - src.start_date)',
+                    [start_date],
+                ),
+            },
+        )
+        copy_rows(
+            cursor,
+            Matchup,
+            f"SELECT id FROM {table(Matchup)} WHERE season_id = %s",  # nosec B608
+            [template_season.pk],
+            remap={
+                "home_team_id": Team,
+                "away_team_id": Team,
+                "season_id": Season,
+            },
+            values={
+                "date": (
+                    "%s::date + (src.date - %s::date)",
+                    [start_date, template_season.start_date],
+                ),
+            },
+        )
+        copy_rows(
+            cursor,
+            TeamStanding,
+            f"SELECT id FROM {table(TeamStanding)} WHERE season_id = %s",  # nosec B608
+            [template_season.pk],
+            remap={"team_id": Team, "season_id": Season},
+        )
+
+        for model in cloned_models:
+            cursor.execute(f"DROP TABLE {get_map_table(model)}")
+
+        rank_depth_charts(cursor, league.pk)
+
+        # Bye weeks are read back from the cloned matchups
+        create_team_schedules(league.current_season)
+
+    return league
@@ -0,0 +1,105 @@
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from apps.core.utils import random_string_generator as random_string
+
+from .clone import clone_league
+
+POOL_LEAGUE_NAME = "Pooled League"
+# Advisory lock key held by the worker topping up the pool
+POOL_LOCK_KEY = 7316
+
+
+def get_pooled_leagues():
+    """Return the unowned, fully built leagues waiting to be claimed."""
+    League = apps.get_model("leagues.League")
+    return League.objects.filter(user__isnull=True, is_template=False)
+
+
+def create_pooled_league():
+    """
+    Build an unowned league for the pool. Copies the template league
+    with reshuffled rosters when there is one, otherwise generates it.
+    """
+    League = apps.get_model("leagues.League")
+    template = League.get_template()
+    league = League(name=POOL_LEAGUE_NAME, gm_name=POOL_LEAGUE_NAME)
+    with transaction.atomic():
+        if template is not None:
+            league.save(isolate=True)
+            clone_league(template, league, shuffle_players=True)
+        else:
+            league.save()
+    return league
+
+
+def lock_league_pool():
+    """
+    Hold the pool's lock until the transaction ends, so concurrent
+    workers don't count the same missing leagues. Other backends
+    already serialize writes to the whole database.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [POOL_LOCK_KEY])
+
+
+def fill_league_pool(size=None):
+    """
+    Build leagues until the pool holds `size` of them, defaulting to
+    the LEAGUE_POOL_SIZE setting. The pool is counted again under its
+    lock before each league is built. Returns the number of leagues built.
+    """
+    size = settings.LEAGUE_POOL_SIZE if size is None else size
+    built = 0
+    while True:
+        with transaction.atomic():
+            lock_league_pool()
+            if get_pooled_leagues().count() >= size:
+                return built
+            create_pooled_league()
+        built += 1
+
+
+def claim_pooled_league(user, name, gm_name):
+    """
+    Hand the oldest pooled league to `user` under a new name and slug.
+    Leagues locked by another request are skipped.
+    Returns None if the pool is empty.
+    """
+    with transaction.atomic():
+        league = (
+            get_pooled_leagues().select_for_update(skip_locked=True).order_by("pk")
+        ).first()
+        if league is not None:
+            league.user = user
+            league.name = name
+            league.gm_name = gm_name
+            league.slug = slugify(name + "-" + random_string())
+            league.creation_date = timezone.now()
+            # A plain UPDATE, skipping League.save()'s nested transaction
+            get_pooled_leagues().filter(pk=league.pk).update(
+                user=user,
+                name=league.name,
+                gm_name=league.gm_name,
+                slug=league.slug,
+                creation_date=league.creation_date,
+            )
+    return league
+
+
+def run_pool_worker(size=None, interval=5.0, once=False):
+    """
+    Keep the league pool full until stopped, checking it again every
+    `interval` seconds. Returns after one refill if `once` is True.
+    """
+    while True:
+        fill_league_pool(size)
+        if once:
+            return
+        time.sleep(interval)
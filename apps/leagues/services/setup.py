@@ -9,7 +9,9 @@ DIVISION_CARDINALS = ("East", "North", "South", "West")
 
 def create_league_structure(league):
     """
-    Creates a league's structure, teams and first season.
+    Creates a league's structure, teams, players and first season.
+    Everything is built in memory and saved with a fixed number of
+    bulk queries, regardless of the number of teams or players.
     Called during initial save() of new League instance in models.py.
     """
     # Can't manually import these due to circular import in models.py
@@ -20,7 +22,7 @@ def create_league_structure(league):
     conf_objs = Conference.objects.bulk_create(
         [Conference(name=conf_name, league=league) for conf_name in CONFERENCE_NAMES]
     )
-    Division.objects.bulk_create(
+    div_objs = Division.objects.bulk_create(
         [
             Division(name=cardinal, conference=conf)
             for cardinal in DIVISION_CARDINALS
@@ -28,5 +30,5 @@ def create_league_structure(league):
         ]
     )
 
-    create_teams(league)
+    create_teams(league, conf_objs, div_objs)
     create_first_season(league)
@@ -1,8 +1,30 @@
+import tempfile
+from unittest import mock, skipUnless
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
-from django.urls import reverse
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from apps.matchups.models import Matchup
+from apps.personnel.models import Contract, Player
+from apps.seasons.models import TeamSchedule, TeamStanding
+from apps.seasons.services.season import advance_season
+from apps.teams.models import DepthChartSpot, UserTeam
+from apps.teams.services.depth_chart import get_depth_chart
 
+from .cache import bump_league_version
 from .models import League
+from .resolver import get_league_resolver
+from .services.clone import can_clone, clone_league
+from .services.pool import (
+    claim_pooled_league,
+    create_pooled_league,
+    fill_league_pool,
+    get_pooled_leagues,
+)
 
 
 class LeagueViewTest(TestCase):
@@ -37,3 +59,462 @@ class LeagueViewTest(TestCase):
         self.assertRedirects(response, "%s?next=/leagues/" % (reverse("users:login")))
         response = self.client.get("%s?next=/leagues/" % (reverse("users:login")))
         self.assertContains(response, "Log In")
+
+
+class LeagueCreationTest(TestCase):
+    """Test building a whole league in a fixed number of queries."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="creationuser@example.com", password="testpass123", is_active=True
+        )
+
+    def test_league_is_created_within_query_budget(self):
+        with CaptureQueriesContext(connection) as queries:
+            league = League.objects.create(
+                name="Budget League", user=self.user, gm_name="Test GM"
+            )
+        # Players and contracts are inserted in batches without COPY
+        self.assertLessEqual(
+            len(queries), 23 if connection.vendor == "postgresql" else 80
+        )
+
+        self.assertEqual(league.conferences.count(), 2)
+        self.assertEqual(league.teams.count(), 32)
+        self.assertEqual(Player.objects.filter(league=league).count(), 1696)
+        self.assertEqual(Contract.objects.filter(team__league=league).count(), 1696)
+
+        season = league.current_season
+        self.assertEqual(season.matchups.count(), 272)
+        self.assertEqual(season.team_standings.count(), 32)
+
+    def test_team_overall_matches_players(self):
+        league = League.objects.create(
+            name="Overall League", user=self.user, gm_name="Test GM"
+        )
+        for team in league.teams.all():
+            overall = team.overall_rating
+            team.update_team_overall()
+            team.refresh_from_db(fields=["overall_rating"])
+            self.assertEqual(team.overall_rating, overall)
+
+
+@skipUnless(connection.vendor == "postgresql", "Leagues are only cloned on PostgreSQL")
+class CloneLeagueTest(TestCase):
+    """Test copying a template league inside the database."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="cloneuser@example.com", password="testpass123", is_active=True
+        )
+        cls.template = League.objects.create(
+            name="Template League", user=cls.user, gm_name="Test GM", is_template=True
+        )
+
+    def create_empty_league(self):
+        league = League(name="Cloned League", user=self.user, gm_name="Test GM")
+        league.save(isolate=True)
+        return league
+
+    def test_league_is_copied(self):
+        league = self.create_empty_league()
+        with CaptureQueriesContext(connection) as queries:
+            clone_league(self.template, league)
+        self.assertLessEqual(len(queries), 35)
+
+        self.assertEqual(league.conferences.count(), 2)
+        self.assertEqual(league.teams.count(), 32)
+        self.assertEqual(
+            set(league.teams.values_list("division__conference__league", flat=True)),
+            {league.pk},
+        )
+        players = Player.objects.filter(league=league)
+        self.assertEqual(players.count(), 1696)
+        self.assertEqual(
+            Contract.objects.filter(player__league=league, team__league=league).count(),
+            1696,
+        )
+        self.assertFalse(
+            players.filter(
+                slug__in=Player.objects.filter(league=self.template).values("slug")
+            ).exists()
+        )
+
+        season = league.current_season
+        self.assertEqual(season.week_number, 1)
+        matchups = Matchup.objects.filter(
+            season=season, home_team__league=league, away_team__league=league
+        )
+        self.assertEqual(matchups.count(), 272)
+        self.assertEqual(
+            TeamStanding.objects.filter(season=season, team__league=league).count(), 32
+        )
+        schedules = TeamSchedule.objects.filter(season=season, team__league=league)
+        self.assertEqual(schedules.count(), 32)
+        self.assertFalse(schedules.filter(bye_week=None).exists())
+        self.assertEqual(
+            DepthChartSpot.objects.filter(
+                team__league=league, player__league=league
+            ).count(),
+            1696,
+        )
+
+    def test_shuffled_rosters_keep_positions(self):
+        league = self.create_empty_league()
+        clone_league(self.template, league, shuffle_players=True)
+
+        template_team = self.template.teams.get(abbreviation="ARI")
+        team = league.teams.get(abbreviation="ARI")
+        self.assertCountEqual(
+            team.player_set.values_list("position", flat=True),
+            template_team.player_set.values_list("position", flat=True),
+        )
+        self.assertEqual(Contract.objects.filter(team__league=league).count(), 1696)
+
+        # Ratings and depth charts match the per-team refresh
+        depth_charts = {}
+        for team in league.teams.all():
+            overall = team.overall_rating
+            depth_charts[team.pk] = get_depth_chart(team)
+            team.update_team_overall()
+            team.refresh_from_db(fields=["overall_rating"])
+            self.assertEqual(team.overall_rating, overall)
+            self.assertEqual(get_depth_chart(team), depth_charts[team.pk])
+
+    def test_played_template_is_not_cloned(self):
+        self.assertEqual(League.get_template(), self.template)
+        season = self.template.current_season
+        Matchup.objects.filter(season=season, week_number=1).update(is_final=True)
+
+        self.assertFalse(can_clone(self.template))
+        self.assertIsNone(League.get_template())
+        with self.assertRaises(ValueError):
+            clone_league(self.template, self.create_empty_league())
+
+    def test_failed_clone_is_rolled_back(self):
+        league = self.create_empty_league()
+        with mock.patch(
+            "apps.leagues.services.clone.create_team_schedules",
+            side_effect=RuntimeError,
+        ), self.assertRaises(RuntimeError):
+            clone_league(self.template, league)
+        self.assertFalse(league.teams.exists())
+        self.assertFalse(Player.objects.filter(league=league).exists())
+
+        # The id map tables went with the failed copy
+        clone_league(self.template, league)
+        self.assertEqual(league.teams.count(), 32)
+
+    def test_create_view_copies_template(self):
+        self.client.login(email="cloneuser@example.com", password="testpass123")
+        response = self.client.post(
+            reverse("leagues:league_create"),
+            {"name": "Quick League", "gm_name": "Test GM", "use_template": "on"},
+        )
+        league = League.objects.get(name="Quick League")
+        self.assertRedirects(
+            response, reverse("teams:team_list", args=[league.slug]), 302, 200
+        )
+        self.assertFalse(league.is_template)
+        self.assertEqual(league.teams.count(), 32)
+
+
+class LeaguePoolTest(TestCase):
+    """Test keeping and claiming a pool of pre-built leagues."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="pooluser@example.com", password="testpass123", is_active=True
+        )
+        League.objects.create(
+            name="Template League", user=cls.user, gm_name="Test GM", is_template=True
+        )
+
+    def test_fill_league_pool(self):
+        self.assertEqual(fill_league_pool(2), 2)
+        self.assertEqual(fill_league_pool(2), 0)
+
+        pooled = get_pooled_leagues()
+        self.assertEqual(pooled.count(), 2)
+        for league in pooled:
+            self.assertEqual(league.teams.count(), 32)
+            self.assertEqual(Player.objects.filter(league=league).count(), 1696)
+
+    def test_fill_stops_when_pool_is_full(self):
+        def build_two():
+            # Another worker tops up the pool at the same time
+            create_pooled_league()
+            create_pooled_league()
+
+        with mock.patch(
+            "apps.leagues.services.pool.create_pooled_league", side_effect=build_two
+        ) as create:
+            self.assertEqual(fill_league_pool(2), 1)
+        self.assertEqual(create.call_count, 1)
+        self.assertEqual(get_pooled_leagues().count(), 2)
+
+    def test_claim_pooled_league(self):
+        self.assertIsNone(claim_pooled_league(self.user, "Mine", "Me"))
+        fill_league_pool(1)
+        pooled_pk = get_pooled_leagues().get().pk
+
+        with CaptureQueriesContext(connection) as queries:
+            league = claim_pooled_league(self.user, "Mine", "Me")
+        self.assertLessEqual(len(queries), 4)
+
+        league.refresh_from_db()
+        self.assertEqual(league.pk, pooled_pk)
+        self.assertEqual(league.user, self.user)
+        self.assertEqual((league.name, league.gm_name), ("Mine", "Me"))
+        self.assertTrue(league.slug.startswith("mine-"))
+        self.assertFalse(get_pooled_leagues().exists())
+
+    def test_create_view_claims_pooled_league(self):
+        fill_league_pool(1)
+        pooled_pk = get_pooled_leagues().get().pk
+
+        self.client.login(email="pooluser@example.com", password="testpass123")
+        response = self.client.post(
+            reverse("leagues:league_create"),
+            {"name": "Claimed League", "gm_name": "Test GM", "use_template": "on"},
+        )
+        league = League.objects.get(name="Claimed League")
+        self.assertEqual(league.pk, pooled_pk)
+        self.assertRedirects(
+            response, reverse("teams:team_list", args=[league.slug]), 302, 200
+        )
+
+    @skipUnless(
+        connection.vendor == "postgresql", "Leagues are only cloned on PostgreSQL"
+    )
+    def test_create_view_skips_pool_without_template(self):
+        fill_league_pool(1)
+        pooled_pk = get_pooled_leagues().get().pk
+
+        self.client.login(email="pooluser@example.com", password="testpass123")
+        self.client.post(
+            reverse("leagues:league_create"),
+            {"name": "Fresh League", "gm_name": "Test GM"},
+        )
+        league = League.objects.get(name="Fresh League")
+        self.assertNotEqual(league.pk, pooled_pk)
+        self.assertEqual(get_pooled_leagues().get().pk, pooled_pk)
+        self.assertEqual(league.teams.count(), 32)
+
+
+class LeagueResolverTest(TestCase):
+    """Test loading a page's league, season and user team once per request."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="resolveruser@example.com", password="testpass123", is_active=True
+        )
+        cls.league = League.objects.create(
+            name="Resolver League", user=cls.user, gm_name="Test GM"
+        )
+        cls.user_team = UserTeam.objects.create(
+            league=cls.league, team=cls.league.teams.first()
+        )
+
+    def test_resolver_caches_lookups(self):
+        url = reverse("seasons:league_standings", args=[self.league.slug])
+        request = RequestFactory().get(url)
+        request.resolver_match = resolve(url)
+
+        season = self.league.seasons.get()
+        resolver = get_league_resolver(request)
+        with self.assertNumQueries(3):
+            self.assertEqual(resolver.league, self.league)
+            self.assertEqual(resolver.season, season)
+            self.assertEqual(resolver.user_team.team, self.user_team.team)
+        with self.assertNumQueries(0):
+            self.assertIs(get_league_resolver(request), resolver)
+            resolver.league, resolver.season, resolver.user_team
+
+    def test_league_page_resolves_league_once(self):
+        self.client.login(email="resolveruser@example.com", password="testpass123")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("seasons:league_standings", args=[self.league.slug])
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["active_user_team"], self.user_team)
+
+        league_lookups = [
+            query
+            for query in queries
+            if query["sql"].startswith('SELECT "leagues_league"."id"')
+        ]
+        self.assertEqual(len(league_lookups), 1, league_lookups)
+
+    def test_missing_league_is_not_found(self):
+        self.client.login(email="resolveruser@example.com", password="testpass123")
+        response = self.client.get(reverse("seasons:league_standings", args=["nope"]))
+        self.assertEqual(response.status_code, 404)
+
+
+class LeagueCacheTest(TestCase):
+    """Test caching league pages until the league's version is bumped."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="cacheuser@example.com", password="testpass123", is_active=True
+        )
+        cls.league = League.objects.create(
+            name="Cache League", user=cls.user, gm_name="Test GM"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(email="cacheuser@example.com", password="testpass123")
+        self.url = reverse("seasons:league_standings", args=[self.league.slug])
+        # Sets the CSRF cookie pages are cached by
+        self.client.get(self.url)
+
+    def get_page(self, url=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url or self.url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_page_is_cached(self):
+        response, queries = self.get_page()
+        cached_response, cached_queries = self.get_page()
+        self.assertEqual(cached_response.content, response.content)
+        self.assertIsNone(cached_response.context)
+        self.assertLess(cached_queries, queries)
+        self.assertLessEqual(cached_queries, 4)
+
+    def test_query_string_is_part_of_the_key(self):
+        self.get_page()
+        response, queries = self.get_page(self.url + "?entity=power")
+        self.assertIsNotNone(response.context)
+        self.assertEqual(response.context["entity"], "power")
+
+    def test_advancing_invalidates_pages(self):
+        self.get_page()
+        advance_season(self.league.current_season, 1)
+        response, queries = self.get_page()
+        self.assertIsNotNone(response.context)
+        self.assertContains(response, "Week 2")
+
+    def test_bumped_version_invalidates_pages(self):
+        self.get_page()
+        bump_league_version(self.league.pk)
+        response, queries = self.get_page()
+        self.assertIsNotNone(response.context)
+
+    def test_pages_with_messages_are_not_cached(self):
+        self.client.post(
+            reverse("leagues:league_update", args=[self.league.slug]),
+            {"name": "Cache League 2", "gm_name": "Test GM"},
+        )
+        response, queries = self.get_page()
+        self.assertContains(response, "updated successfully")
+        response, queries = self.get_page()
+        self.assertIsNotNone(response.context)
+        self.assertNotContains(response, "updated successfully")
+        self.assertContains(response, "Cache League 2")
+
+    def test_file_based_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            backend = "django.core.cache.backends.filebased.FileBasedCache"
+            with override_settings(
+                CACHES={"default": {"BACKEND": backend, "LOCATION": cache_dir}}
+            ):
+                response, queries = self.get_page()
+                cached_response, cached_queries = self.get_page()
+        self.assertEqual(cached_response.content, response.content)
+        self.assertIsNone(cached_response.context)
+
+
+class LeagueConditionalTest(TestCase):
+    """Test answering conditional GETs of league pages with 304."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="etaguser@example.com", password="testpass123", is_active=True
+        )
+        cls.league = League.objects.create(
+            name="ETag League", user=cls.user, gm_name="Test GM"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(email="etaguser@example.com", password="testpass123")
+        self.url = reverse("teams:team_list", args=[self.league.slug])
+        # Sets the CSRF cookie the ETag depends on
+        self.client.get(self.url)
+
+    def test_validators_are_set(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_unchanged_page_is_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        # Session, user, league and current season
+        self.assertLessEqual(len(queries), 4)
+
+    def test_unchanged_page_is_not_modified_since(self):
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_advancing_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        advance_season(self.league.current_season, 1)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_bumped_version_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        bump_league_version(self.league.pk)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_pages_with_messages_have_no_validators(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.post(
+            reverse("leagues:league_update", args=[self.league.slug]),
+            {"name": "ETag League 2", "gm_name": "Test GM"},
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "updated successfully")
+        self.assertNotIn("ETag", response)
+
+    def test_other_users_are_not_answered(self):
+        etag = self.client.get(self.url)["ETag"]
+        get_user_model().objects.create_user(
+            email="otheruser@example.com", password="testpass123", is_active=True
+        )
+        self.client.login(email="otheruser@example.com", password="testpass123")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 403)
+
+    def test_player_page(self):
+        player = Player.objects.filter(league=self.league).first()
+        url = reverse("personnel:player_detail", args=[self.league.slug, player.slug])
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_leaders_api(self):
+        url = reverse("matchups:leaders_api", args=[self.league.slug])
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
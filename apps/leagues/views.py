@@ -1,11 +1,17 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
+from django.http import HttpResponseRedirect
 from django.urls import reverse_lazy
 from django.views.generic import DetailView, ListView
 from django.views.generic.edit import CreateView, DeleteView, UpdateView
 
+from .cache import bump_league_version
+from .forms import LeagueCreateForm
 from .mixins import LeagueOwnerRequiredMixin
 from .models import League
+from .services.clone import clone_league
+from .services.pool import claim_pooled_league
 
 
 class LeagueListView(LeagueOwnerRequiredMixin, ListView):
@@ -35,14 +41,40 @@ class LeagueCreateView(LoginRequiredMixin, CreateView):
     """
 
     model = League
-    fields = ["name", "gm_name"]
+    form_class = LeagueCreateForm
     template_name = "leagues/league_create.html"
     success_message = "Your league has been created successfully."
 
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs["template"] = League.get_template()
+        return kwargs
+
     def form_valid(self, form):
-        """Overriden to add success message"""
+        """
+        Overriden to add success message and, unless the user opted out
+        of the template league, claim a pre-built copy of it from the
+        pool or copy it. Without a template, pooled leagues are generated
+        from scratch and are always claimed.
+        """
         form.instance.user = self.request.user
         messages.success(self.request, self.success_message)
+
+        use_template = form.cleaned_data.get("use_template", form.template is None)
+        if use_template:
+            self.object = claim_pooled_league(
+                self.request.user, form.instance.name, form.instance.gm_name
+            )
+            if self.object is not None:
+                return HttpResponseRedirect(self.get_success_url())
+
+        if use_template and form.template is not None:
+            with transaction.atomic():
+                self.object = form.save(commit=False)
+                self.object.save(isolate=True)
+                clone_league(form.template, self.object)
+            return HttpResponseRedirect(self.get_success_url())
+
         return super().form_valid(form)
 
     def get_success_url(self):
@@ -61,9 +93,11 @@ class LeagueUpdateView(LeagueOwnerRequiredMixin, UpdateView):
     slug_url_kwarg = "league"
 
     def form_valid(self, form):
-        """Overriden to add success message"""
+        """Overriden to add success message and invalidate cached pages"""
         messages.success(self.request, self.success_message)
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        bump_league_version(self.object.pk)
+        return response
 
 
 class LeagueDeleteView(LeagueOwnerRequiredMixin, DeleteView):
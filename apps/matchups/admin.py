@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Matchup, PlayerMatchStat
+from .models import Matchup, PlayerMatchStat, PlayerSeasonStat, TeamSeasonStat
 
 
 class MatchupAdmin(admin.ModelAdmin):
@@ -26,5 +26,15 @@ class PlayerMatchStatAdmin(admin.ModelAdmin):
     list_display = ("__str__", "player", "matchup")
 
 
+class PlayerSeasonStatAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "player", "season", "team", "games_played")
+
+
+class TeamSeasonStatAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "team", "season", "games_played")
+
+
 admin.site.register(Matchup, MatchupAdmin)
 admin.site.register(PlayerMatchStat, PlayerMatchStatAdmin)
+admin.site.register(PlayerSeasonStat, PlayerSeasonStatAdmin)
+admin.site.register(TeamSeasonStat, TeamSeasonStatAdmin)
@@ -0,0 +1,99 @@
+import statistics
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.leagues.models import League
+from apps.matchups.models import Matchup
+from apps.matchups.services.engine import (
+    build_box_scores,
+    load_lineups,
+    simulate_games,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the game engine on a week of a league's matchups: loading "
+        "lineups, simulating, building box scores and the full simulate_all() "
+        "with its saves, which are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--league",
+            help="Slug of the league to simulate. Defaults to the first league.",
+        )
+        parser.add_argument(
+            "--week",
+            type=int,
+            default=1,
+            help="Regular season week to simulate.",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=10,
+            help="Number of times to simulate the week.",
+        )
+
+    def handle(self, *args, **options):
+        leagues = League.objects.exclude(seasons=None)
+        if options["league"]:
+            leagues = leagues.filter(slug=options["league"])
+        league = leagues.first()
+        if league is None:
+            raise CommandError("No league found to simulate.")
+
+        week = Matchup.objects.filter(
+            season=league.current_season, week_number=options["week"]
+        )
+        matchups = list(week)
+        if not matchups:
+            raise CommandError(f"Week {options['week']} has no matchups.")
+        for matchup in matchups:
+            matchup.is_final = False
+
+        team_ids = sorted(
+            {m.home_team_id for m in matchups} | {m.away_team_id for m in matchups}
+        )
+        rng = np.random.default_rng()
+        timings = {
+            "load lineups": [],
+            "simulate": [],
+            "box scores": [],
+            "simulate_all": [],
+        }
+
+        for _ in range(options["runs"]):
+            start = time.perf_counter()
+            lineups = load_lineups(team_ids)
+            timings["load lineups"].append(time.perf_counter() - start)
+
+            home = np.array([lineups["team_index"][m.home_team_id] for m in matchups])
+            away = np.array([lineups["team_index"][m.away_team_id] for m in matchups])
+            start = time.perf_counter()
+            home_scores, away_scores, box = simulate_games(
+                lineups, home, away, np.zeros(len(matchups), dtype=bool), rng
+            )
+            timings["simulate"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            build_box_scores(matchups, lineups, box)
+            timings["box scores"].append(time.perf_counter() - start)
+
+            with transaction.atomic():
+                week.update(is_final=False)
+                start = time.perf_counter()
+                week.simulate_all()
+                timings["simulate_all"].append(time.perf_counter() - start)
+                transaction.set_rollback(True)
+
+        self.stdout.write(f"{len(matchups)} games, {options['runs']} runs")
+        for name, times in timings.items():
+            self.stdout.write(
+                f"{name:>13}: mean {statistics.mean(times):.4f}s "
+                f"min {min(times):.4f}s max {max(times):.4f}s"
+            )
@@ -0,0 +1,80 @@
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.leagues.models import League
+from apps.matchups.services.engine import load_lineups
+from apps.matchups.services.score_tables import (
+    SCORE_TABLES_VERSION,
+    build_default_score_tables,
+    build_score_tables,
+    get_score_tables_path,
+    read_score_tables,
+    save_score_tables,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate games between every pair of team rating buckets with the "
+        "game engine and store their scorelines as the score tables drawn "
+        "from by the playoff odds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--league",
+            help="Slug of the league whose lineups to start from. Defaults to "
+            "the first league, or default lineups if there are no leagues.",
+        )
+        parser.add_argument(
+            "--default",
+            action="store_true",
+            help="Start from default lineups instead of a league's.",
+        )
+        parser.add_argument(
+            "--if-missing",
+            action="store_true",
+            help="Only build the tables if the current version's are missing, "
+            "e.g. when deploying.",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=512,
+            help="Number of games to simulate per pair of rating buckets.",
+        )
+        parser.add_argument("--seed", type=int, help="Random seed.")
+
+    def handle(self, *args, **options):
+        path = get_score_tables_path()
+        if options["if_missing"] and read_score_tables(path) is not None:
+            self.stdout.write(f"Score tables already built at {path}.")
+            return
+
+        rng = np.random.default_rng(options["seed"])
+        league = None
+        if not options["default"]:
+            leagues = League.objects.all()
+            if options["league"]:
+                leagues = leagues.filter(slug=options["league"])
+            league = leagues.first()
+            if league is None and options["league"]:
+                raise CommandError("No league found to take the lineups from.")
+
+        if league is None:
+            tables = build_default_score_tables(options["samples"], rng)
+        else:
+            teams = dict(league.teams.values_list("id", "overall_rating"))
+            lineups = load_lineups(sorted(teams))
+            tables = build_score_tables(
+                lineups,
+                [teams[team_id] for team_id in sorted(teams)],
+                options["samples"],
+                rng,
+            )
+
+        save_score_tables(tables)
+        self.stdout.write(
+            f"Saved version {SCORE_TABLES_VERSION} score tables of shape "
+            f"{tables.shape} to {path}."
+        )
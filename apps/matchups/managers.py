@@ -1,7 +1,12 @@
 from django.db import models
-from django.db.models import Case, F, Q, When
+from django.db.models import Case, F, OuterRef, Q, When
 from django.db.models.fields import BooleanField
 
+from apps.seasons.managers import team_record_subquery
+
+from .services.simulation import RESULT_FIELDS, simulate_matchups
+from .services.stats import save_box_scores
+
 
 def is_conf_name_case(conf_name: str):
     """
@@ -71,8 +76,28 @@ class MatchupQuerySet(models.QuerySet):
             is_conference=is_conf_matchup_case(),
         ).order_by("-is_american", "-is_national", "-is_divisional", "-is_conference")
 
+    def with_records(self):
+        """Annotate both teams' season records as home_record and away_record."""
+        return self.annotate(
+            home_record=team_record_subquery(OuterRef("home_team"), OuterRef("season")),
+            away_record=team_record_subquery(OuterRef("away_team"), OuterRef("season")),
+        )
+
     def filter_by_team(self, team):
         return self.filter(Q(home_team=team) | Q(away_team=team))
 
     def filter_by_reg_season(self, season):
         return self.filter(season=season, week_number__lte=18)
+
+    def simulate_all(self, rng=None):
+        """
+        Simulate every matchup in the queryset as one batch, save the
+        results with a single bulk update and the box scores with a
+        single bulk insert, then add them to the season stats. Raises
+        MatchFinalizedError if any of them has already been played.
+        """
+        matchups = list(self)
+        box_scores = simulate_matchups(matchups, rng)
+        self.model.objects.bulk_update(matchups, RESULT_FIELDS)
+        save_box_scores(matchups, box_scores)
+        return matchups
@@ -0,0 +1,183 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('personnel', '0001_initial'),
+        ('seasons', '0008_teamstanding_split_records'),
+        ('teams', '0002_depth_chart_spot'),
+        ('matchups', '0004_matchup_away_score_matchup_away_timeouts_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerSeasonStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('passing_comps', models.SmallIntegerField(default=0)),
+                ('passing_atts', models.SmallIntegerField(default=0)),
+                ('passing_yds', models.SmallIntegerField(default=0)),
+                ('passing_tds', models.SmallIntegerField(default=0)),
+                ('passing_ints', models.SmallIntegerField(default=0)),
+                ('passing_fds', models.SmallIntegerField(default=0)),
+                ('times_sacked', models.SmallIntegerField(default=0)),
+                ('receptions', models.SmallIntegerField(default=0)),
+                ('receiving_targets', models.SmallIntegerField(default=0)),
+                ('receiving_yds', models.SmallIntegerField(default=0)),
+                ('receiving_tds', models.SmallIntegerField(default=0)),
+                ('receiving_fds', models.SmallIntegerField(default=0)),
+                ('rushing_atts', models.SmallIntegerField(default=0)),
+                ('rushing_yds', models.SmallIntegerField(default=0)),
+                ('rushing_tds', models.SmallIntegerField(default=0)),
+                ('rushing_fds', models.SmallIntegerField(default=0)),
+                ('fumbles_lost', models.SmallIntegerField(default=0)),
+                ('def_ints', models.SmallIntegerField(default=0)),
+                ('forced_fumbles', models.SmallIntegerField(default=0)),
+                ('def_tds', models.SmallIntegerField(default=0)),
+                ('def_return_yds', models.SmallIntegerField(default=0)),
+                ('tackles', models.SmallIntegerField(default=0)),
+                ('tackles_for_loss', models.SmallIntegerField(default=0)),
+                ('qb_hits', models.SmallIntegerField(default=0)),
+                ('sacks', models.SmallIntegerField(default=0)),
+                ('safeties', models.SmallIntegerField(default=0)),
+                ('field_goals', models.SmallIntegerField(default=0)),
+                ('field_goal_atts', models.SmallIntegerField(default=0)),
+                ('field_goal_long', models.SmallIntegerField(default=0)),
+                ('extra_points', models.SmallIntegerField(default=0)),
+                ('extra_point_atts', models.SmallIntegerField(default=0)),
+                ('kickoffs', models.SmallIntegerField(default=0)),
+                ('kickoff_yds', models.SmallIntegerField(default=0)),
+                ('touchbacks', models.SmallIntegerField(default=0)),
+                ('punts', models.SmallIntegerField(default=0)),
+                ('punt_yds', models.SmallIntegerField(default=0)),
+                ('punt_long', models.SmallIntegerField(default=0)),
+                ('punt_blocks', models.SmallIntegerField(default=0)),
+                ('punt_returns', models.SmallIntegerField(default=0)),
+                ('punt_return_yds', models.SmallIntegerField(default=0)),
+                ('punt_return_tds', models.SmallIntegerField(default=0)),
+                ('punt_return_long', models.SmallIntegerField(default=0)),
+                ('kick_returns', models.SmallIntegerField(default=0)),
+                ('kick_return_yds', models.SmallIntegerField(default=0)),
+                ('kick_return_tds', models.SmallIntegerField(default=0)),
+                ('kick_return_long', models.SmallIntegerField(default=0)),
+                ('penalties', models.SmallIntegerField(default=0)),
+                ('penalty_yds', models.SmallIntegerField(default=0)),
+                ('games_played', models.PositiveSmallIntegerField(default=0)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_stats', to='personnel.player')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_stats', to='seasons.season')),
+                ('team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='player_season_stats', to='teams.team')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TeamSeasonStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('passing_comps', models.SmallIntegerField(default=0)),
+                ('passing_atts', models.SmallIntegerField(default=0)),
+                ('passing_yds', models.SmallIntegerField(default=0)),
+                ('passing_tds', models.SmallIntegerField(default=0)),
+                ('passing_ints', models.SmallIntegerField(default=0)),
+                ('passing_fds', models.SmallIntegerField(default=0)),
+                ('times_sacked', models.SmallIntegerField(default=0)),
+                ('receptions', models.SmallIntegerField(default=0)),
+                ('receiving_targets', models.SmallIntegerField(default=0)),
+                ('receiving_yds', models.SmallIntegerField(default=0)),
+                ('receiving_tds', models.SmallIntegerField(default=0)),
+                ('receiving_fds', models.SmallIntegerField(default=0)),
+                ('rushing_atts', models.SmallIntegerField(default=0)),
+                ('rushing_yds', models.SmallIntegerField(default=0)),
+                ('rushing_tds', models.SmallIntegerField(default=0)),
+                ('rushing_fds', models.SmallIntegerField(default=0)),
+                ('fumbles_lost', models.SmallIntegerField(default=0)),
+                ('def_ints', models.SmallIntegerField(default=0)),
+                ('forced_fumbles', models.SmallIntegerField(default=0)),
+                ('def_tds', models.SmallIntegerField(default=0)),
+                ('def_return_yds', models.SmallIntegerField(default=0)),
+                ('tackles', models.SmallIntegerField(default=0)),
+                ('tackles_for_loss', models.SmallIntegerField(default=0)),
+                ('qb_hits', models.SmallIntegerField(default=0)),
+                ('sacks', models.SmallIntegerField(default=0)),
+                ('safeties', models.SmallIntegerField(default=0)),
+                ('field_goals', models.SmallIntegerField(default=0)),
+                ('field_goal_atts', models.SmallIntegerField(default=0)),
+                ('field_goal_long', models.SmallIntegerField(default=0)),
+                ('extra_points', models.SmallIntegerField(default=0)),
+                ('extra_point_atts', models.SmallIntegerField(default=0)),
+                ('kickoffs', models.SmallIntegerField(default=0)),
+                ('kickoff_yds', models.SmallIntegerField(default=0)),
+                ('touchbacks', models.SmallIntegerField(default=0)),
+                ('punts', models.SmallIntegerField(default=0)),
+                ('punt_yds', models.SmallIntegerField(default=0)),
+                ('punt_long', models.SmallIntegerField(default=0)),
+                ('punt_blocks', models.SmallIntegerField(default=0)),
+                ('punt_returns', models.SmallIntegerField(default=0)),
+                ('punt_return_yds', models.SmallIntegerField(default=0)),
+                ('punt_return_tds', models.SmallIntegerField(default=0)),
+                ('punt_return_long', models.SmallIntegerField(default=0)),
+                ('kick_returns', models.SmallIntegerField(default=0)),
+                ('kick_return_yds', models.SmallIntegerField(default=0)),
+                ('kick_return_tds', models.SmallIntegerField(default=0)),
+                ('kick_return_long', models.SmallIntegerField(default=0)),
+                ('penalties', models.SmallIntegerField(default=0)),
+                ('penalty_yds', models.SmallIntegerField(default=0)),
+                ('games_played', models.PositiveSmallIntegerField(default=0)),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_stats', to='seasons.season')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_stats', to='teams.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['season', 'team'], name='matchups_te_season__721d7a_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='teamseasonstat',
+            constraint=models.UniqueConstraint(fields=('team', 'season'), name='unique_team_season_stat'),
+        ),
+        migrations.AddIndex(
+            model_name='playerseasonstat',
+            index=models.Index(fields=['season', '-passing_yds'], name='player_leaders_passing_yds'),
+        ),
+        migrations.AddIndex(
+            model_name='playerseasonstat',
+            index=models.Index(fields=['season', '-passing_tds'], name='player_leaders_passing_tds'),
+        ),
+        migrations.AddIndex(
+            model_name='playerseasonstat',
+            index=models.Index(fields=['season', '-rushing_yds'], name='player_leaders_rushing_yds'),
+        ),
+        migrations.AddIndex(
+            model_name='playerseasonstat',
+            index=models.Index(fields=['season', '-rushing_tds'], name='player_leaders_rushing_tds'),
+        ),
+        migrations.AddIndex(
+            model_name='playerseasonstat',
+            index=models.Index(fields=['season', '-receiving_yds'], name='player_leaders_receiving_yds'),
+        ),
+        migrations.AddIndex(
+            model_name='playerseasonstat',
+            index=models.Index(fields=['season', '-receiving_tds'], name='player_leaders_receiving_tds'),
+        ),
+        migrations.AddIndex(
+            model_name='playerseasonstat',
+            index=models.Index(fields=['season', '-tackles'], name='player_leaders_tackles'),
+        ),
+        migrations.AddIndex(
+            model_name='playerseasonstat',
+            index=models.Index(fields=['season', '-sacks'], name='player_leaders_sacks'),
+        ),
+        migrations.AddIndex(
+            model_name='playerseasonstat',
+            index=models.Index(fields=['season', '-def_ints'], name='player_leaders_def_ints'),
+        ),
+        migrations.AddIndex(
+            model_name='playerseasonstat',
+            index=models.Index(fields=['season', '-field_goals'], name='player_leaders_field_goals'),
+        ),
+        migrations.AddConstraint(
+            model_name='playerseasonstat',
+            constraint=models.UniqueConstraint(fields=('player', 'season'), name='unique_player_season_stat'),
+        ),
+    ]
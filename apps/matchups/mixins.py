@@ -0,0 +1,37 @@
+from django.http import Http404
+
+from apps.leagues.mixins import LeagueContextMixin
+
+from .models import LEADERBOARD_STATS
+from .services.stats import get_leaders
+
+
+class LeadersMixin(LeagueContextMixin):
+    """
+    Mixin that adds the current season's leaders in the requested stat,
+    read from the season stat rollups, to the context.
+    """
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        stat = self.request.GET.get("stat", "passing_yds")
+        entity = self.request.GET.get("entity", "player")
+
+        if stat not in LEADERBOARD_STATS:
+            raise Http404("Stat does not exist")
+        if entity not in ("player", "team"):
+            entity = "player"
+
+        leaders = get_leaders(context["season"], stat, entity)
+        for leader in leaders:
+            # Avoids a league query per link
+            for obj in (getattr(leader, "player", None), leader.team):
+                if obj is not None:
+                    obj.league = context["league"]
+
+        context["stats"] = LEADERBOARD_STATS
+        context["active_stat"] = stat
+        context["active_stat_label"] = LEADERBOARD_STATS[stat]
+        context["entity"] = entity
+        context["leaders"] = [(leader, getattr(leader, stat)) for leader in leaders]
+        return context
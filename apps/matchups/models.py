@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import random
 from datetime import date
 from typing import TYPE_CHECKING
 
@@ -14,6 +13,8 @@ from django.utils.functional import cached_property
 
 from .exceptions import MatchFinalizedError, MatchInProgressError
 from .managers import MatchupManager, MatchupQuerySet
+from .services.simulation import simulate_matchups
+from .services.stats import save_box_scores
 
 
 class Matchup(models.Model):
@@ -71,65 +72,20 @@ class Matchup(models.Model):
     def is_conference(self) -> bool:
         return self.home_team.conference == self.away_team.conference
 
-    def simulate(self):
+    def simulate(self, commit: bool = True):
         """
-        Simulate the match based on random dice rolls.
+        Simulate the match drive by drive based on the ratings of each
+        team's starters, see apps.matchups.services.engine.
 
-        This will be updated in the future to add in additional complexity
-        by taking into account team/player strength and scenario-based results.
+        Pass commit=False to skip saving the result and the box scores,
+        e.g. when results for a whole week are persisted in bulk by the
+        caller. Returns the box scores, shared with simulate_all().
         """
-        if self.is_final:
-            raise MatchFinalizedError(
-                "Unable to simulate match. Match has been finalized."
-            )
-        scoreline = self._generate_score()
-        valid_score = self._check_impossible_scoreline(scoreline)
-        if scoreline != valid_score:
-            self.home_score, self.away_score = valid_score
-
-        # If postseason and a tie, break it with a tiebreaker roll
-        if self.is_postseason and self.home_score == self.away_score:
-            self._tiebreaker()
-
-        self.is_final = True
-        self.save()
-
-    def _generate_score(self) -> tuple:
-        min_score, max_score = 0, 50
-        self.home_score = random.randint(min_score, max_score)
-        self.away_score = random.randint(min_score, max_score)
-        scoreline = (self.home_score, self.away_score)
-        return scoreline
-
-    def _check_impossible_scoreline(self, scoreline: tuple) -> tuple:
-        """
-        Checks whether the generated scoreline is impossible or not
-        and if so, generates a new one.
-
-        Impossible scorelines in American football:
-        1-0, 1-1, 2-1, 3-1, 4-1, 5-1, 7-1 (and their inverses)
-        6-1 is possible with 1-point safety after an opposing TD (very rare)
-        """
-        score_1_to_1 = scoreline[0] == 1 and scoreline[1] == 1
-        score_1_to_any = 1 in scoreline and any(
-            score in scoreline for score in (0, 2, 3, 4, 5, 7)
-        )
-        impossible_score = score_1_to_1 or score_1_to_any
-
-        if impossible_score:
-            # Impossible scoreline based on rules; generate again
-            scoreline = self._generate_score()
-
-        return scoreline
-
-    def _tiebreaker(self):
-        """Tiebreaker for playoff matches that end in a tie."""
-        tiebreak_winner = random.choice((self.home_score, self.away_score))
-        add_score = random.choice((3, 7))  # Field goal or TD
-        if tiebreak_winner == self.home_score:
-            self.home_score += add_score
-            return
-        self.away_score += add_score
+        box_scores = simulate_matchups([self])
+        if commit:
+            self.save()
+            save_box_scores([self], box_scores)
+        return box_scores
 
     def get_score(self):
         """Return the current match score, final or not."""
@@ -171,17 +127,9 @@ class Matchup(models.Model):
             return home_team if home_score > away_score else away_team
 
 
-class PlayerMatchStat(models.Model):
-    player = models.ForeignKey(
-        "personnel.Player",
-        on_delete=models.CASCADE,
-        related_name="player_stats",
-    )
-    matchup = models.ForeignKey(
-        Matchup,
-        on_delete=models.CASCADE,
-        related_name="player_stats",
-    )
+class StatLine(models.Model):
+    """Per-game counters, shared by box scores and their season rollups."""
+
     # Passing offense
     passing_comps = models.SmallIntegerField(default=0)
     passing_atts = models.SmallIntegerField(default=0)
@@ -239,5 +187,103 @@ class PlayerMatchStat(models.Model):
     penalties = models.SmallIntegerField(default=0)
     penalty_yds = models.SmallIntegerField(default=0)
 
+    class Meta:
+        abstract = True
+
+
+class PlayerMatchStat(StatLine):
+    player = models.ForeignKey(
+        "personnel.Player",
+        on_delete=models.CASCADE,
+        related_name="player_stats",
+    )
+    matchup = models.ForeignKey(
+        Matchup,
+        on_delete=models.CASCADE,
+        related_name="player_stats",
+    )
+
     def __str__(self):
         return f"{self.player} stats - {self.matchup}"
+
+
+# Stats that have leaderboards, see apps.matchups.services.stats
+LEADERBOARD_STATS = {
+    "passing_yds": "Passing Yards",
+    "passing_tds": "Passing TDs",
+    "rushing_yds": "Rushing Yards",
+    "rushing_tds": "Rushing TDs",
+    "receiving_yds": "Receiving Yards",
+    "receiving_tds": "Receiving TDs",
+    "tackles": "Tackles",
+    "sacks": "Sacks",
+    "def_ints": "Interceptions",
+    "field_goals": "Field Goals",
+}
+
+
+class PlayerSeasonStat(StatLine):
+    """
+    A player's season totals, rolled up from PlayerMatchStat as games are
+    finalized. `team` is the team the player last played for.
+    """
+
+    player = models.ForeignKey(
+        "personnel.Player",
+        on_delete=models.CASCADE,
+        related_name="season_stats",
+    )
+    season = models.ForeignKey(
+        "seasons.Season",
+        on_delete=models.CASCADE,
+        related_name="player_stats",
+    )
+    team = models.ForeignKey(
+        "teams.Team",
+        on_delete=models.SET_NULL,
+        related_name="player_season_stats",
+        blank=True,
+        null=True,
+    )
+    games_played = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["player", "season"], name="unique_player_season_stat"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["season", f"-{stat}"], name=f"player_leaders_{stat}")
+            for stat in LEADERBOARD_STATS
+        ]
+
+    def __str__(self):
+        return f"{self.player} stats - {self.season}"
+
+
+class TeamSeasonStat(StatLine):
+    """A team's season totals, rolled up from its players' box scores."""
+
+    team = models.ForeignKey(
+        "teams.Team",
+        on_delete=models.CASCADE,
+        related_name="season_stats",
+    )
+    season = models.ForeignKey(
+        "seasons.Season",
+        on_delete=models.CASCADE,
+        related_name="team_stats",
+    )
+    games_played = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["team", "season"], name="unique_team_season_stat"
+            )
+        ]
+        indexes = [models.Index(fields=["season", "team"])]
+
+    def __str__(self):
+        return f"{self.team} stats - {self.season}"
@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+
+class LeaderSerializer(serializers.Serializer):
+    """A player or team's place on a stat's leaderboard."""
+
+    rank = serializers.IntegerField()
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    team = serializers.CharField(allow_null=True)
+    games_played = serializers.IntegerField()
+    value = serializers.IntegerField()
+
+
+class LeadersSerializer(serializers.Serializer):
+    """A season's leaders in a stat."""
+
+    season = serializers.IntegerField()
+    stat = serializers.CharField()
+    entity = serializers.CharField()
+    leaders = LeaderSerializer(many=True)
@@ -0,0 +1,393 @@
+import numpy as np
+from django.apps import apps
+
+# Starting lineup slots as (position, depth)
+LINEUP = (
+    ("QB", 1),
+    ("HB", 1),
+    ("WR", 1),
+    ("WR", 2),
+    ("WR", 3),
+    ("TE", 1),
+    ("LT", 1),
+    ("LG", 1),
+    ("C", 1),
+    ("RG", 1),
+    ("RT", 1),
+    ("DE", 1),
+    ("DE", 2),
+    ("DT", 1),
+    ("DT", 2),
+    ("OLB", 1),
+    ("OLB", 2),
+    ("MLB", 1),
+    ("CB", 1),
+    ("CB", 2),
+    ("FS", 1),
+    ("SS", 1),
+    ("K", 1),
+    ("P", 1),
+)
+SLOTS = {slot: i for i, slot in enumerate(LINEUP)}
+QB, HB, K, P = SLOTS[("QB", 1)], SLOTS[("HB", 1)], SLOTS[("K", 1)], SLOTS[("P", 1)]
+RECEIVERS = [SLOTS[slot] for slot in (("WR", 1), ("WR", 2), ("WR", 3), ("TE", 1))]
+RECEIVERS.append(HB)
+OFFENSIVE_LINE = [SLOTS[(pos, 1)] for pos in ("LT", "LG", "C", "RG", "RT")]
+DEFENDERS = list(range(SLOTS[("DE", 1)], SLOTS[("SS", 1)] + 1))
+PASS_RUSHERS = DEFENDERS[:6]  # DE, DT and OLB
+COVERAGE = DEFENDERS[7:]  # CB, FS and SS
+
+# Share of each group's events, in the order of the slots above
+RECEIVER_SHARES = (0.3, 0.22, 0.14, 0.2, 0.14)
+TACKLE_SHARES = (0.08, 0.08, 0.07, 0.07, 0.1, 0.1, 0.16, 0.08, 0.08, 0.09, 0.09)
+PASS_RUSH_SHARES = (0.3, 0.3, 0.1, 0.1, 0.1, 0.1, 0, 0, 0, 0, 0)
+COVERAGE_SHARES = (0, 0, 0, 0, 0.05, 0.05, 0, 0.3, 0.3, 0.15, 0.15)
+
+# Player ratings loaded for the starters, unrated slots default to 50
+RATINGS = ("pass_off", "run_off", "pass_def", "run_def", "speed", "strength")
+R = {rating: i for i, rating in enumerate(RATINGS)}
+DEFAULT_RATING = 50
+SPECIAL_OFF = "special_off"
+
+# Drive outcomes with their base rates and how the offense's edge over
+# the defense in passing, rushing or both shifts their log odds
+OUTCOMES = ("touchdown", "field_goal", "punt", "interception", "fumble", "downs")
+TD, FG, PUNT, INT, FUMBLE, DOWNS = range(len(OUTCOMES))
+OUTCOME_RATES = np.array([0.22, 0.16, 0.44, 0.07, 0.05, 0.06])
+MIN_DRIVES, MAX_DRIVES = 10, 12
+HOME_EDGE = 0.02
+
+# Box score counters produced by the engine, see StatLine
+FIELDS = (
+    "passing_comps",
+    "passing_atts",
+    "passing_yds",
+    "passing_tds",
+    "passing_ints",
+    "passing_fds",
+    "times_sacked",
+    "receptions",
+    "receiving_targets",
+    "receiving_yds",
+    "receiving_tds",
+    "rushing_atts",
+    "rushing_yds",
+    "rushing_tds",
+    "rushing_fds",
+    "fumbles_lost",
+    "def_ints",
+    "forced_fumbles",
+    "tackles",
+    "tackles_for_loss",
+    "qb_hits",
+    "sacks",
+    "field_goals",
+    "field_goal_atts",
+    "field_goal_long",
+    "extra_points",
+    "extra_point_atts",
+    "kickoffs",
+    "kickoff_yds",
+    "touchbacks",
+    "punts",
+    "punt_yds",
+    "punt_long",
+)
+F = {field: i for i, field in enumerate(FIELDS)}
+
+
+def load_lineups(team_ids):
+    """
+    Load the starters of each team from its depth chart with one query.
+    Returns each team's row index, and the starters' player ids (-1 when
+    a slot is empty), ratings and each kicker's rating as arrays.
+    """
+    DepthChartSpot = apps.get_model("teams.DepthChartSpot")
+
+    team_index = {team_id: i for i, team_id in enumerate(team_ids)}
+    player_ids = np.full((len(team_ids), len(LINEUP)), -1, dtype=np.int64)
+    ratings = np.full(
+        (len(team_ids), len(LINEUP), len(RATINGS)), DEFAULT_RATING, dtype=np.float64
+    )
+    kicking = np.full(len(team_ids), DEFAULT_RATING, dtype=np.float64)
+
+    spots = DepthChartSpot.objects.filter(
+        team_id__in=team_ids,
+        depth__lte=max(depth for position, depth in LINEUP),
+    ).values_list(
+        "team_id",
+        "position",
+        "depth",
+        "player_id",
+        f"player__{SPECIAL_OFF}",
+        *(f"player__{rating}" for rating in RATINGS),
+    )
+    for team_id, position, depth, player_id, special_off, *player_ratings in spots:
+        slot = SLOTS.get((position, depth))
+        if slot is not None:
+            team = team_index[team_id]
+            player_ids[team, slot] = player_id
+            ratings[team, slot] = player_ratings
+            if slot == K:
+                kicking[team] = special_off
+
+    return {
+        "team_index": team_index,
+        "player_ids": player_ids,
+        "ratings": ratings,
+        "kicking": kicking,
+    }
+
+
+def rate_units(ratings):
+    """
+    Rate each team's passing and rushing offense and defense from its
+    starters. `ratings` is a (teams, slots, ratings) array.
+    """
+
+    def mean(slots, *names):
+        return ratings[:, slots][:, :, [R[name] for name in names]].mean(axis=(1, 2))
+
+    return {
+        "pass_offense": 0.4 * ratings[:, QB, R["pass_off"]]
+        + 0.3 * mean(RECEIVERS[:4], "pass_off", "speed")
+        + 0.3 * mean(OFFENSIVE_LINE, "pass_off"),
+        "run_offense": 0.4 * mean([HB], "run_off", "speed")
+        + 0.6 * mean(OFFENSIVE_LINE, "run_off"),
+        "pass_defense": 0.5 * mean(COVERAGE, "pass_def", "speed")
+        + 0.5 * mean(PASS_RUSHERS, "pass_def"),
+        "run_defense": mean(DEFENDERS[:7], "run_def", "strength"),
+    }
+
+
+def simulate_games(lineups, home, away, is_postseason, rng):
+    """
+    Simulate games drive by drive. `home` and `away` are arrays of team
+    row indexes into `lineups`. Every drive of every game is one element
+    of a (games, offense side, drives) array, side 0 being the home team.
+    Returns the home and away scores and the box score of every lineup
+    slot as a (games, side, slots, fields) array.
+    """
+    num_games = len(home)
+    shape = (num_games, 2, MAX_DRIVES)
+    offense = np.stack([home, away], axis=1)
+    defense = offense[:, ::-1]
+
+    units = rate_units(lineups["ratings"])
+    home_edge = np.array([HOME_EDGE, -HOME_EDGE])
+    edge_pass = (units["pass_offense"][offense] - units["pass_defense"][defense]) / 100
+    edge_run = (units["run_offense"][offense] - units["run_defense"][defense]) / 100
+    edge_pass = (edge_pass + home_edge)[:, :, None]
+    edge_run = (edge_run + home_edge)[:, :, None]
+    edge = (edge_pass + edge_run) / 2
+
+    drives = rng.integers(MIN_DRIVES, MAX_DRIVES, size=(num_games, 1, 1), endpoint=True)
+    active = np.arange(MAX_DRIVES) < drives
+
+    # Drive outcomes by the Gumbel-max trick over shifted log odds
+    shifts = np.stack(
+        [
+            np.broadcast_to(shift, shape)
+            for shift in (
+                6 * edge,
+                2 * edge,
+                -2 * edge,
+                -4 * edge_pass,
+                -3 * edge_run,
+                -edge,
+            )
+        ],
+        axis=-1,
+    )
+    logits = np.log(OUTCOME_RATES) + shifts
+    outcome = np.argmax(logits + rng.gumbel(size=logits.shape), axis=-1)
+    outcome = np.where(active, outcome, -1)
+    is_td, is_fg, is_punt = outcome == TD, outcome == FG, outcome == PUNT
+    is_int = (outcome == INT).astype(np.int64)
+    is_fumble = (outcome == FUMBLE).astype(np.int64)
+
+    # Yards gained from the starting field position
+    to_goal = 100 - rng.integers(15, 36, size=shape)
+    fg_spot = rng.integers(5, 36, size=shape)
+    yards = np.select(
+        [is_td, is_fg, is_punt, (is_int | is_fumble) > 0, outcome == DOWNS],
+        [
+            to_goal,
+            to_goal - fg_spot,
+            np.minimum(rng.integers(-5, 26, size=shape), to_goal - 45),
+            np.minimum(rng.integers(-5, 41, size=shape), to_goal - 1),
+            np.minimum(rng.integers(10, 61, size=shape), to_goal - 1),
+        ],
+        0,
+    )
+
+    # Scoring
+    kicking = lineups["kicking"][offense][:, :, None]
+    fg_distance = np.where(is_fg, fg_spot + 17, 0)
+    fg_chance = np.clip(
+        0.98 - 0.012 * (fg_distance - 20) + (kicking - 60) / 400, 0.3, 0.99
+    )
+    fg_made = is_fg & (rng.random(shape) < fg_chance)
+    xp_made = is_td & (rng.random(shape) < 0.94)
+    points = 6 * is_td + xp_made + 3 * fg_made
+
+    # Plays, split into dropbacks and rushes
+    plays = np.where(
+        is_punt,
+        3 + rng.poisson(0.6, shape),
+        np.maximum(yards, 0) // 9 + 1 + rng.poisson(1, shape),
+    )
+    plays = np.where(active, np.minimum(plays, 18), 0)
+    pass_rate = np.clip(0.57 + 0.8 * (edge_pass - edge_run), 0.4, 0.75)
+    dropbacks = rng.binomial(plays, pass_rate)
+    sacks = rng.binomial(dropbacks, np.clip(0.065 - 0.25 * edge_pass, 0.02, 0.14))
+    attempts = np.maximum(dropbacks - sacks, is_int)
+    rushes = np.maximum(plays - dropbacks, is_fumble)
+    comp_rate = np.clip(0.66 + 0.6 * edge_pass, 0.45, 0.82)
+    comps = rng.binomial(attempts - is_int, comp_rate)
+
+    pass_td = is_td & (rng.random(shape) < pass_rate)
+    rush_td = is_td & ~pass_td
+    comps = np.maximum(comps, pass_td)
+    attempts = np.maximum(attempts, comps + is_int)
+    rushes = np.maximum(rushes, rush_td)
+
+    # Yards are shared out by completions and rushes
+    sack_yds = sacks * rng.integers(4, 9, size=shape)
+    gross_yds = yards + sack_yds
+    rushes += (comps + rushes == 0) & (gross_yds != 0)
+    pass_weight, rush_weight = comps * 11.0, rushes * 4.3
+    pass_share = pass_weight / np.maximum(pass_weight + rush_weight, 1e-9)
+    pass_yds = np.rint(gross_yds * pass_share).astype(np.int64)
+    rush_yds = gross_yds - pass_yds
+
+    box = np.zeros((num_games, 2, len(LINEUP), len(FIELDS)), dtype=np.int64)
+
+    def add(slots, field, values, side="offense"):
+        """Add per-drive values, summed over drives, to slot totals."""
+        values = values.sum(axis=2)
+        if side == "defense":
+            values = values[:, ::-1]
+        box[:, :, slots, F[field]] += values
+
+    # Passing
+    add(QB, "passing_comps", comps)
+    add(QB, "passing_atts", attempts)
+    add(QB, "passing_yds", pass_yds)
+    add(QB, "passing_tds", pass_td)
+    add(QB, "passing_ints", is_int)
+    add(QB, "passing_fds", rng.binomial(comps, 0.55))
+    add(QB, "times_sacked", sacks)
+
+    # Receiving, with yards split by catches and any rounding to the
+    # receiver with the most catches
+    receptions = rng.multinomial(comps, RECEIVER_SHARES)
+    targets = receptions + rng.multinomial(attempts - comps, RECEIVER_SHARES)
+    receiving_yds = pass_yds[..., None] * receptions // np.maximum(comps, 1)[..., None]
+    top_receiver = np.argmax(receptions, axis=-1)[..., None]
+    remainder = pass_yds - receiving_yds.sum(axis=-1)
+    np.put_along_axis(
+        receiving_yds,
+        top_receiver,
+        np.take_along_axis(receiving_yds, top_receiver, -1) + remainder[..., None],
+        -1,
+    )
+    td_catch = rng.random(shape) * comps
+    td_receiver = np.argmax(np.cumsum(receptions, axis=-1) > td_catch[..., None], -1)
+    receiving_tds = (np.arange(len(RECEIVERS)) == td_receiver[..., None]) & pass_td[
+        ..., None
+    ]
+    add(RECEIVERS, "receptions", receptions)
+    add(RECEIVERS, "receiving_targets", targets)
+    add(RECEIVERS, "receiving_yds", receiving_yds)
+    add(RECEIVERS, "receiving_tds", receiving_tds)
+
+    # Rushing, the HB carries touchdowns and fumbles, the QB scrambles
+    must_carry = np.maximum(rush_td, is_fumble)
+    qb_rushes = np.minimum(rng.binomial(rushes, 0.1), rushes - must_carry)
+    hb_rushes = rushes - qb_rushes
+    qb_rush_yds = rush_yds * qb_rushes // np.maximum(rushes, 1)
+    for slot, carries, carry_yds in (
+        (QB, qb_rushes, qb_rush_yds),
+        (HB, hb_rushes, rush_yds - qb_rush_yds),
+    ):
+        add(slot, "rushing_atts", carries)
+        add(slot, "rushing_yds", carry_yds)
+        add(slot, "rushing_fds", rng.binomial(carries, 0.22))
+    add(HB, "rushing_tds", rush_td)
+    add(HB, "fumbles_lost", is_fumble)
+
+    # Defense
+    tackled = np.maximum(comps + rushes - is_td, 0)
+    add(DEFENDERS, "tackles", rng.multinomial(tackled, TACKLE_SHARES), "defense")
+    add(
+        DEFENDERS,
+        "tackles_for_loss",
+        rng.multinomial(rng.binomial(rushes, 0.08), TACKLE_SHARES),
+        "defense",
+    )
+    defender_sacks = rng.multinomial(sacks, PASS_RUSH_SHARES)
+    hits = rng.multinomial(rng.binomial(attempts, 0.07), PASS_RUSH_SHARES)
+    add(DEFENDERS, "sacks", defender_sacks, "defense")
+    add(DEFENDERS, "qb_hits", defender_sacks + hits, "defense")
+    add(DEFENDERS, "def_ints", rng.multinomial(is_int, COVERAGE_SHARES), "defense")
+    add(
+        DEFENDERS,
+        "forced_fumbles",
+        rng.multinomial(is_fumble, TACKLE_SHARES),
+        "defense",
+    )
+
+    # Kicking, with an opening kickoff per team
+    kickoffs = (is_td | fg_made).astype(np.int64)
+    kickoffs[:, :, 0] += 1
+    add(K, "field_goals", fg_made)
+    add(K, "field_goal_atts", is_fg)
+    add(K, "extra_points", xp_made)
+    add(K, "extra_point_atts", is_td)
+    add(K, "kickoffs", kickoffs)
+    add(K, "kickoff_yds", kickoffs * rng.integers(55, 71, size=shape))
+    add(K, "touchbacks", rng.binomial(kickoffs, 0.6))
+    box[:, :, K, F["field_goal_long"]] = (fg_distance * fg_made).max(axis=2)
+
+    punt_yds = np.where(is_punt, np.clip(rng.normal(45, 8, shape), 20, 70), 0)
+    punt_yds = np.rint(punt_yds).astype(np.int64)
+    add(P, "punts", is_punt)
+    add(P, "punt_yds", punt_yds)
+    box[:, :, P, F["punt_long"]] = punt_yds.max(axis=2)
+
+    # Postseason games can't end tied, a random side kicks an overtime FG
+    scores = points.sum(axis=2)
+    ties = np.asarray(is_postseason, dtype=bool) & (scores[:, 0] == scores[:, 1])
+    ot_winner = rng.integers(0, 2, size=num_games)
+    ot_games = np.flatnonzero(ties)
+    scores[ot_games, ot_winner[ot_games]] += 3
+    for field in ("field_goals", "field_goal_atts"):
+        box[ot_games, ot_winner[ot_games], K, F[field]] += 1
+
+    return scores[:, 0], scores[:, 1], box
+
+
+def build_box_scores(matchups, lineups, box):
+    """
+    Turn the engine's box score array into unsaved PlayerMatchStat rows,
+    one per filled lineup slot of each team in each matchup.
+    """
+    PlayerMatchStat = apps.get_model("matchups.PlayerMatchStat")
+
+    player_ids = lineups["player_ids"]
+    team_index = lineups["team_index"]
+    box_scores = []
+    for game, matchup in enumerate(matchups):
+        for side, team_id in enumerate((matchup.home_team_id, matchup.away_team_id)):
+            team_players = player_ids[team_index[team_id]].tolist()
+            for player_id, stats in zip(team_players, box[game, side].tolist()):
+                if player_id >= 0:
+                    box_scores.append(
+                        PlayerMatchStat(
+                            player_id=player_id,
+                            matchup=matchup,
+                            **dict(zip(FIELDS, stats)),
+                        )
+                    )
+    return box_scores
@@ -0,0 +1,165 @@
+import logging
+import os
+from functools import lru_cache
+
+import numpy as np
+from django.conf import settings
+
+from .engine import DEFAULT_RATING, LINEUP, RATINGS, simulate_games
+from .simulation import break_ties
+
+logger = logging.getLogger(__name__)
+
+# Bump when the table layout or the engine's scoring changes so stale
+# tables are never read, rebuild them with refresh_score_tables
+SCORE_TABLES_VERSION = 1
+# Samples per bucket pair of the small in-memory tables used while
+# refresh_score_tables hasn't built the current version's tables yet
+FALLBACK_SAMPLES = 16
+# Team overall ratings are bucketed, ratings outside the range are
+# clipped into the first or last bucket
+MIN_OVERALL, MAX_OVERALL, BUCKET_SIZE = 40, 90, 2
+NUM_BUCKETS = (MAX_OVERALL - MIN_OVERALL) // BUCKET_SIZE
+MAX_TABLE_SCORE = np.iinfo(np.uint8).max
+
+
+def get_buckets(overall_ratings):
+    """Map team overall ratings to their score table bucket."""
+    buckets = (np.asarray(overall_ratings) - MIN_OVERALL) // BUCKET_SIZE
+    return np.clip(buckets, 0, NUM_BUCKETS - 1)
+
+
+def get_score_tables_path():
+    """Return the path of the current version's tables in SCORE_TABLES_DIR."""
+    return os.path.join(
+        settings.SCORE_TABLES_DIR, f"score-tables-v{SCORE_TABLES_VERSION}.npy"
+    )
+
+
+def build_score_tables(lineups, overall_ratings, samples, rng=None):
+    """
+    Simulate `samples` regular season games with the game engine for
+    every (home bucket, away bucket) pair. Each bucket's lineup is the
+    average of the given teams' starters, shifted by how much their
+    ratings rise with team overall times the distance of the bucket's mid
+    rating from their average overall. Returns the scorelines as a
+    (home bucket, away bucket, sample, side) array.
+    """
+    rng = rng or np.random.default_rng()
+    overall_ratings = np.asarray(overall_ratings, dtype=np.float64)
+    starter_ratings = lineups["ratings"].mean(axis=(1, 2))
+    overall_var = overall_ratings.var()
+    slope = (
+        np.cov(overall_ratings, starter_ratings, bias=True)[0, 1] / overall_var
+        if overall_var
+        else 1.0
+    )
+    mids = MIN_OVERALL + BUCKET_SIZE * np.arange(NUM_BUCKETS) + BUCKET_SIZE / 2
+    shifts = slope * (mids - overall_ratings.mean())
+    bucket_lineups = {
+        "ratings": np.clip(
+            lineups["ratings"].mean(axis=0) + shifts[:, None, None], 1, 99
+        ),
+        "kicking": np.clip(lineups["kicking"].mean() + shifts, 1, 99),
+    }
+
+    tables = np.zeros((NUM_BUCKETS, NUM_BUCKETS, samples, 2), dtype=np.uint8)
+    away = np.repeat(np.arange(NUM_BUCKETS), samples)
+    is_postseason = np.zeros(len(away), dtype=bool)
+    for home_bucket in range(NUM_BUCKETS):
+        home = np.full(len(away), home_bucket)
+        home_scores, away_scores, _ = simulate_games(
+            bucket_lineups, home, away, is_postseason, rng
+        )
+        scores = np.stack([home_scores, away_scores], axis=-1)
+        tables[home_bucket] = np.minimum(scores, MAX_TABLE_SCORE).reshape(
+            NUM_BUCKETS, samples, 2
+        )
+    return tables
+
+
+def build_default_score_tables(samples, rng=None):
+    """
+    Build score tables without a league, from a lineup of average
+    starters whose ratings move one for one with the team overall.
+    """
+    lineups = {
+        "ratings": np.full((1, len(LINEUP), len(RATINGS)), float(DEFAULT_RATING)),
+        "kicking": np.full(1, float(DEFAULT_RATING)),
+    }
+    return build_score_tables(lineups, [DEFAULT_RATING], samples, rng)
+
+
+def save_score_tables(tables):
+    """
+    Replace the current version's tables. The file is swapped in whole
+    so processes still mapping the old tables keep reading them intact.
+    """
+    path = get_score_tables_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as tables_file:
+        np.save(tables_file, tables)
+    os.replace(temp_path, path)
+
+
+def read_score_tables(path):
+    """
+    Memory-map the score tables at `path` read-only. Returns None if
+    there are no tables of the current layout there.
+    """
+    try:
+        tables = np.load(path, mmap_mode="r")
+    except FileNotFoundError:
+        return None
+    if tables.shape[:2] != (NUM_BUCKETS, NUM_BUCKETS):
+        return None
+    return tables
+
+
+def load_score_tables():
+    """
+    Memory-map the current version's score tables, so every process
+    shares one copy through the page cache. Tables rewritten by
+    refresh_score_tables are picked up on the next call.
+    """
+    path = get_score_tables_path()
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return _load_score_tables(path, None)
+    return _load_score_tables(path, (stat.st_ino, stat.st_mtime_ns))
+
+
+@lru_cache(maxsize=1)
+def _load_score_tables(path, file_id):
+    """
+    Load the tables at `path` once per version of the file. Falls back
+    to small tables built from default lineups and kept in memory when
+    there are none of the current layout, rather than saving them from
+    a request.
+    """
+    tables = read_score_tables(path) if file_id is not None else None
+    if tables is None:
+        logger.warning(
+            "No score tables at %s, run the refresh_score_tables command", path
+        )
+        tables = build_default_score_tables(FALLBACK_SAMPLES)
+    return tables
+
+
+def draw_scorelines(home_overall, away_overall, is_postseason=None, rng=None):
+    """
+    Draw home and away scores for a batch of games from the score tables
+    by the teams' overall ratings, one table lookup per game. Postseason
+    ties are broken with break_ties().
+    """
+    rng = rng or np.random.default_rng()
+    tables = load_score_tables()
+    samples = rng.integers(tables.shape[2], size=len(home_overall))
+    scores = tables[get_buckets(home_overall), get_buckets(away_overall), samples]
+    home_scores = scores[:, 0].astype(np.int64)
+    away_scores = scores[:, 1].astype(np.int64)
+    if is_postseason is not None:
+        break_ties(home_scores, away_scores, is_postseason, rng)
+    return home_scores, away_scores
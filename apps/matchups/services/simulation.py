@@ -0,0 +1,57 @@
+import numpy as np
+
+from ..exceptions import MatchFinalizedError
+from .engine import build_box_scores, load_lineups, simulate_games
+
+POSTSEASON_START_WEEK = 19
+TIEBREAK_POINTS = (3, 7)  # Field goal or TD
+RESULT_FIELDS = ("home_score", "away_score", "is_final")
+
+
+def break_ties(home_scores, away_scores, is_postseason, rng):
+    """Break postseason ties in place with a tiebreaker roll."""
+    ties = np.asarray(is_postseason, dtype=bool) & (home_scores == away_scores)
+    num_ties = np.count_nonzero(ties)
+    if num_ties:
+        home_wins = rng.random(num_ties) < 0.5
+        points = rng.choice(TIEBREAK_POINTS, size=num_ties)
+        home_scores[ties] += np.where(home_wins, points, 0)
+        away_scores[ties] += np.where(home_wins, 0, points)
+
+
+def simulate_matchups(matchups, rng=None):
+    """
+    Simulate a batch of matchups drive by drive with the game engine in
+    apps.matchups.services.engine, from the ratings of each team's
+    starters. Results are set on each matchup but not saved. Returns
+    the box scores as unsaved PlayerMatchStat instances.
+    """
+    if any(matchup.is_final for matchup in matchups):
+        raise MatchFinalizedError("Unable to simulate match. Match has been finalized.")
+    if not matchups:
+        return []
+
+    rng = rng or np.random.default_rng()
+    team_ids = sorted(
+        {m.home_team_id for m in matchups} | {m.away_team_id for m in matchups}
+    )
+    lineups = load_lineups(team_ids)
+    team_index = lineups["team_index"]
+    home = np.array([team_index[matchup.home_team_id] for matchup in matchups])
+    away = np.array([team_index[matchup.away_team_id] for matchup in matchups])
+    is_postseason = [
+        matchup.week_number >= POSTSEASON_START_WEEK for matchup in matchups
+    ]
+
+    home_scores, away_scores, box = simulate_games(
+        lineups, home, away, is_postseason, rng
+    )
+
+    for matchup, home_score, away_score in zip(
+        matchups, home_scores.tolist(), away_scores.tolist()
+    ):
+        matchup.home_score = home_score
+        matchup.away_score = away_score
+        matchup.is_final = True
+
+    return build_box_scores(matchups, lineups, box)
@@ -0,0 +1,226 @@
+from collections import defaultdict
+
+from django.apps import apps
+from django.db import connection
+
+from apps.core.bulk import copy_bulk_create
+
+# Counters rolled up with the season's best instead of its total
+LONG_FIELDS = ("field_goal_long", "punt_long", "punt_return_long", "kick_return_long")
+
+
+def get_stat_fields():
+    """Names of the per-game counters shared by box scores and rollups."""
+    PlayerMatchStat = apps.get_model("matchups.PlayerMatchStat")
+    return [
+        field.name
+        for field in PlayerMatchStat._meta.concrete_fields
+        if not field.is_relation and not field.primary_key
+    ]
+
+
+def rollup_sql(rollup_model, key_columns, key_selects, contract_join, extra_updates):
+    """
+    Build an INSERT ... SELECT ... ON CONFLICT statement that adds the box
+    scores of a list of matchups (its only param) to a rollup table. Rows
+    are grouped by the first two `key_selects`, which must match the
+    table's unique constraint. Players' box scores are joined to their
+    team through their active contract as `c`.
+    """
+    PlayerMatchStat = apps.get_model("matchups.PlayerMatchStat")
+    Matchup = apps.get_model("matchups.Matchup")
+    Contract = apps.get_model("personnel.Contract")
+    quote_name = connection.ops.quote_name
+
+    key_columns = [quote_name(column) for column in key_columns]
+    columns = [*key_columns, quote_name("games_played")]
+    aggregates = ["count(DISTINCT s.matchup_id)"]
+    updates = [
+        *extra_updates,
+        "games_played = rollup.games_played + EXCLUDED.games_played",
+    ]
+    for name in get_stat_fields():
+        field = quote_name(name)
+        columns.append(field)
+        if name in LONG_FIELDS:
+            aggregates.append(f"max(s.{field})")
+            updates.append(f"{field} = greatest(rollup.{field}, EXCLUDED.{field})")
+        else:
+            aggregates.append(f"sum(s.{field})")
+            updates.append(f"{field} = rollup.{field} + EXCLUDED.{field}")
+
+    return f"""
+        INSERT INTO {quote_name(rollup_model._meta.db_table)} AS rollup
+            ({", ".join(columns)})
+        SELECT {", ".join([*key_selects, *aggregates])}
+        FROM {quote_name(PlayerMatchStat._meta.db_table)} s
+        JOIN {quote_name(Matchup._meta.db_table)} m ON m.id = s.matchup_id
+        {contract_join} {quote_name(Contract._meta.db_table)} c
+            ON c.player_id = s.player_id AND c.is_active
+            AND c.team_id IN (m.home_team_id, m.away_team_id)
+        WHERE s.matchup_id = ANY(%s)
+        GROUP BY {", ".join(key_selects[:2])}
+        ON CONFLICT ({", ".join(key_columns[:2])})
+        DO UPDATE SET {", ".join(updates)}
+        """  # nosec B608
+
+
+def merge_rollups(rollup_model, key_names, totals):
+    """
+    Add per-key totals to a rollup table's rows, creating missing rows.
+    `totals` maps (key, season_id) to the extra field values, the set of
+    matchup ids played and the stat values in get_stat_fields() order.
+    """
+    stat_fields = get_stat_fields()
+    existing = {
+        (getattr(row, key_names[0]), row.season_id): row
+        for row in rollup_model.objects.filter(
+            **{f"{key_names[0]}__in": {key for key, season_id in totals}},
+            season_id__in={season_id for key, season_id in totals},
+        )
+    }
+
+    new_rows, changed_rows = [], []
+    for (key, season_id), (extra, matchup_ids, values) in totals.items():
+        row = existing.get((key, season_id))
+        if row is None:
+            row = rollup_model(
+                **{key_names[0]: key}, season_id=season_id, games_played=0
+            )
+            new_rows.append(row)
+        else:
+            changed_rows.append(row)
+        row.games_played += len(matchup_ids)
+        for name, value in extra.items():
+            if value is not None:
+                setattr(row, name, value)
+        for name, value in zip(stat_fields, values):
+            current = getattr(row, name) or 0
+            if name in LONG_FIELDS:
+                setattr(row, name, max(current, value))
+            else:
+                setattr(row, name, current + value)
+
+    rollup_model.objects.bulk_create(new_rows)
+    rollup_model.objects.bulk_update(
+        changed_rows, ["games_played", *key_names[1:], *stat_fields]
+    )
+
+
+def rollup_match_stats_in_python(matchups):
+    """
+    Portable version of rollup_match_stats() for database backends
+    without upserts: box scores are totaled in Python and merged with
+    bulk_create and bulk_update.
+    """
+    PlayerMatchStat = apps.get_model("matchups.PlayerMatchStat")
+    PlayerSeasonStat = apps.get_model("matchups.PlayerSeasonStat")
+    TeamSeasonStat = apps.get_model("matchups.TeamSeasonStat")
+    Contract = apps.get_model("personnel.Contract")
+
+    stat_fields = get_stat_fields()
+    matchups = {matchup.pk: matchup for matchup in matchups}
+    box_scores = list(
+        PlayerMatchStat.objects.filter(matchup_id__in=matchups).values_list(
+            "player_id", "matchup_id", *stat_fields
+        )
+    )
+    player_teams = defaultdict(set)
+    for player_id, team_id in Contract.objects.filter(
+        player_id__in={player_id for player_id, *rest in box_scores}, is_active=True
+    ).values_list("player_id", "team_id"):
+        player_teams[player_id].add(team_id)
+
+    def add(totals, key, extra, matchup_id, values):
+        if key not in totals:
+            totals[key] = (extra, set(), [0] * len(stat_fields))
+        totals[key][1].add(matchup_id)
+        current = totals[key][2]
+        for i, (name, value) in enumerate(zip(stat_fields, values)):
+            if name in LONG_FIELDS:
+                current[i] = max(current[i], value)
+            else:
+                current[i] += value
+
+    # Players are credited to the team they're contracted to in the matchup
+    player_totals, team_totals = {}, {}
+    for player_id, matchup_id, *values in box_scores:
+        matchup = matchups[matchup_id]
+        team_ids = player_teams[player_id] & {
+            matchup.home_team_id,
+            matchup.away_team_id,
+        }
+        team_id = max(team_ids, default=None)
+        key = (player_id, matchup.season_id)
+        add(player_totals, key, {"team_id": None}, matchup_id, values)
+        if team_id is not None:
+            extra = player_totals[key][0]
+            extra["team_id"] = max(extra["team_id"] or team_id, team_id)
+        for team_id in team_ids:
+            add(team_totals, (team_id, matchup.season_id), {}, matchup_id, values)
+
+    merge_rollups(PlayerSeasonStat, ["player_id", "team_id"], player_totals)
+    merge_rollups(TeamSeasonStat, ["team_id"], team_totals)
+
+
+def rollup_match_stats(matchups):
+    """
+    Add the box scores of newly finalized matchups to their players' and
+    teams' season totals, with one grouped upsert per rollup table. Each
+    matchup must only be rolled up once, when it's finalized. Falls back
+    to rollup_match_stats_in_python() on other database backends.
+    """
+    PlayerSeasonStat = apps.get_model("matchups.PlayerSeasonStat")
+    TeamSeasonStat = apps.get_model("matchups.TeamSeasonStat")
+
+    matchup_ids = [matchup.pk for matchup in matchups]
+    if not matchup_ids:
+        return
+    if connection.vendor != "postgresql":
+        return rollup_match_stats_in_python(matchups)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            rollup_sql(
+                PlayerSeasonStat,
+                ["player_id", "season_id", "team_id"],
+                ["s.player_id", "m.season_id", "max(c.team_id)"],
+                "LEFT JOIN",
+                ["team_id = coalesce(EXCLUDED.team_id, rollup.team_id)"],
+            ),
+            [matchup_ids],
+        )
+        cursor.execute(
+            rollup_sql(
+                TeamSeasonStat,
+                ["team_id", "season_id"],
+                ["c.team_id", "m.season_id"],
+                "JOIN",
+                [],
+            ),
+            [matchup_ids],
+        )
+
+
+def save_box_scores(matchups, box_scores):
+    """
+    Save the box scores of newly finalized matchups with one COPY load
+    and add them to the season stat rollups.
+    """
+    copy_bulk_create(apps.get_model("matchups.PlayerMatchStat"), box_scores)
+    rollup_match_stats(matchups)
+
+
+def get_leaders(season, stat, entity="player", limit=10):
+    """
+    Return the season's leaders in `stat` from the player or team rollups,
+    best first. Players are read through their (season, -stat) index.
+    """
+    if entity == "team":
+        model = apps.get_model("matchups.TeamSeasonStat")
+        queryset = model.objects.select_related("team")
+    else:
+        model = apps.get_model("matchups.PlayerSeasonStat")
+        queryset = model.objects.select_related("player", "team")
+    queryset = queryset.filter(season=season, **{f"{stat}__gt": 0})
+    return list(queryset.order_by(f"-{stat}")[:limit])
@@ -0,0 +1,460 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock, skipUnless
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, Max, Sum
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.leagues.models import League
+from apps.seasons.models import TeamStanding
+from apps.teams.services.depth_chart import get_depth_chart
+
+from .exceptions import MatchFinalizedError
+from .models import Matchup, PlayerMatchStat, PlayerSeasonStat, TeamSeasonStat
+from .services.engine import (
+    DEFENDERS,
+    HB,
+    LINEUP,
+    QB,
+    RATINGS,
+    RECEIVERS,
+    F,
+    K,
+    simulate_games,
+)
+from .services.score_tables import (
+    BUCKET_SIZE,
+    MIN_OVERALL,
+    NUM_BUCKETS,
+    build_default_score_tables,
+    build_score_tables,
+    draw_scorelines,
+    get_buckets,
+    get_score_tables_path,
+    load_score_tables,
+    save_score_tables,
+)
+from .services.simulation import TIEBREAK_POINTS, break_ties
+from .services.stats import rollup_match_stats_in_python
+
+
+class SimulateMatchupTest(SimpleTestCase):
+    """Test the rules shared by every simulated matchup."""
+
+    def test_postseason_ties_are_broken(self):
+        home = np.array([10, 10, 10, 14])
+        away = np.array([10, 10, 7, 14])
+        is_postseason = np.array([True, False, True, True])
+        break_ties(home, away, is_postseason, np.random.default_rng(1))
+        self.assertEqual((home == away).tolist(), [False, True, False, False])
+        self.assertEqual(home[2], 10)
+        for diff in np.abs(home - away)[[0, 3]]:
+            self.assertIn(diff, TIEBREAK_POINTS)
+
+    def test_simulate_finalized_matchup_raises(self):
+        matchup = Matchup(is_final=True)
+        with self.assertRaises(MatchFinalizedError):
+            matchup.simulate(commit=False)
+
+
+class SimulateAllTest(TestCase):
+    """Test simulating a week of matchups as one batch."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="matchupuser@example.com", password="testpass123", is_active=True
+        )
+        league = League.objects.create(
+            name="Matchup League", user=user, gm_name="Test GM"
+        )
+        cls.season = league.current_season
+
+    def test_simulate_all_finalizes_week(self):
+        week = Matchup.objects.filter(season=self.season, week_number=1)
+        with CaptureQueriesContext(connection) as queries:
+            matchups = week.simulate_all()
+        self.assertEqual(len(matchups), week.count())
+        self.assertFalse(week.filter(is_final=False).exists())
+        # Lineups, results, box scores and one upsert per rollup table.
+        # Without COPY and upserts, box scores and rollups are written in
+        # batches of a few hundred rows
+        self.assertLessEqual(
+            len(queries), 7 if connection.vendor == "postgresql" else 95
+        )
+        self.assertEqual(
+            PlayerMatchStat.objects.filter(matchup__in=matchups).count(),
+            len(matchups) * 2 * len(LINEUP),
+        )
+
+    def test_simulate_all_rejects_finalized_matchups(self):
+        week = Matchup.objects.filter(season=self.season, week_number=2)
+        week.simulate_all()
+        box_scores = PlayerMatchStat.objects.filter(matchup__in=week).count()
+        with self.assertRaises(MatchFinalizedError):
+            week.simulate_all()
+        self.assertEqual(
+            PlayerMatchStat.objects.filter(matchup__in=week).count(), box_scores
+        )
+
+    def test_benchmark_engine_rolls_back(self):
+        week = Matchup.objects.filter(season=self.season, week_number=3)
+        call_command("benchmark_engine", week=3, runs=1, stdout=StringIO())
+        self.assertFalse(week.filter(is_final=True).exists())
+        self.assertFalse(PlayerMatchStat.objects.filter(matchup__in=week).exists())
+
+
+class TeamRecordTest(TestCase):
+    """Test annotating team records instead of looking them up per team."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="recorduser@example.com", password="testpass123", is_active=True
+        )
+        cls.league = League.objects.create(
+            name="Record League", user=cls.user, gm_name="Test GM"
+        )
+        cls.season = cls.league.current_season
+        TeamStanding.objects.filter(season=cls.season).update(wins=3, losses=2, ties=1)
+
+    def test_matchups_are_annotated_with_records(self):
+        matchup = Matchup.objects.with_records().filter(season=self.season).first()
+        self.assertEqual(matchup.home_record, matchup.home_team.current_record)
+        self.assertEqual(matchup.away_record, "(3-2-1)")
+
+    def test_byes_are_annotated_with_records(self):
+        bye_teams = self.season.get_byes(6)
+        self.assertTrue(bye_teams)
+        for team in bye_teams:
+            self.assertEqual(team.record, team.current_record)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    def test_weekly_matchups_page_runs_constant_queries(self):
+        self.client.login(email="recorduser@example.com", password="testpass123")
+        url = reverse("matchups:weekly_matchups", args=[self.league.slug])
+        self.client.get(url)
+
+        query_counts = []
+        for week in (1, 6):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, {"week": week})
+            self.assertContains(response, "(3-2-1)")
+            query_counts.append(len(queries))
+        # Week 6 adds a single query for its bye teams
+        self.assertEqual(query_counts[1], query_counts[0] + 1)
+        self.assertLessEqual(query_counts[1], 15)
+
+
+class SeasonStatsTest(TestCase):
+    """Test rolling box scores up into season stats and leaderboards."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="statsuser@example.com", password="testpass123", is_active=True
+        )
+        cls.league = League.objects.create(
+            name="Stats League", user=cls.user, gm_name="Test GM"
+        )
+        cls.season = cls.league.current_season
+
+    def setUp(self):
+        cache.clear()
+
+    def play_week(self, week_number):
+        week = Matchup.objects.filter(season=self.season, week_number=week_number)
+        return week.simulate_all(np.random.default_rng(week_number))
+
+    def assertRollupsMatchBoxScores(self, rollup_model, key):
+        fields = [
+            "passing_yds",
+            "rushing_tds",
+            "receptions",
+            "tackles",
+            "sacks",
+            "field_goals",
+        ]
+        box_scores = PlayerMatchStat.objects.filter(matchup__season=self.season)
+        if key == "team":
+            box_scores = box_scores.filter(player__contracts__is_active=True)
+            key_field = "player__contracts__team"
+        else:
+            key_field = "player"
+        totals = {
+            row[key_field]: row
+            for row in box_scores.values(key_field).annotate(
+                games=Count("matchup", distinct=True),
+                **{field: Sum(field) for field in fields},
+                punt_long=Max("punt_long"),
+            )
+        }
+        rollups = rollup_model.objects.filter(season=self.season)
+        self.assertEqual(rollups.count(), len(totals))
+        for rollup in rollups:
+            total = totals[getattr(rollup, f"{key}_id")]
+            self.assertEqual(rollup.games_played, total["games"])
+            self.assertEqual(rollup.punt_long, total["punt_long"])
+            for field in fields:
+                self.assertEqual(getattr(rollup, field), total[field])
+
+    def test_rollups_are_incremental(self):
+        self.play_week(1)
+        self.assertRollupsMatchBoxScores(PlayerSeasonStat, "player")
+        self.assertRollupsMatchBoxScores(TeamSeasonStat, "team")
+
+        matchups = self.play_week(2)
+        self.assertRollupsMatchBoxScores(PlayerSeasonStat, "player")
+        self.assertRollupsMatchBoxScores(TeamSeasonStat, "team")
+
+        home_team = matchups[0].home_team
+        starter_id = get_depth_chart(home_team)["QB"][0]
+        stat = PlayerSeasonStat.objects.get(player_id=starter_id, season=self.season)
+        self.assertEqual(stat.team, home_team)
+
+    @skipUnless(connection.vendor == "postgresql", "Upserts only run on PostgreSQL")
+    def test_python_rollups_match_upserts(self):
+        # Both rollup paths total the same weeks identically
+        self.play_week(1)
+        self.play_week(2)
+
+        def snapshot():
+            return {
+                model: sorted(
+                    model.objects.filter(season=self.season).values_list(
+                        *(
+                            field.attname
+                            for field in model._meta.concrete_fields
+                            if not field.primary_key
+                        )
+                    )
+                )
+                for model in (PlayerSeasonStat, TeamSeasonStat)
+            }
+
+        upserted = snapshot()
+        PlayerSeasonStat.objects.all().delete()
+        TeamSeasonStat.objects.all().delete()
+        for week_number in (1, 2):
+            rollup_match_stats_in_python(
+                list(
+                    Matchup.objects.filter(season=self.season, week_number=week_number)
+                )
+            )
+        self.assertEqual(snapshot(), upserted)
+
+    def test_leaders_api(self):
+        self.play_week(1)
+        self.client.login(email="statsuser@example.com", password="testpass123")
+        url = reverse("matchups:leaders_api", args=[self.league.slug])
+        response = self.client.get(url, {"stat": "passing_yds", "entity": "player"})
+        data = response.json()
+        self.assertEqual(data["stat"], "passing_yds")
+        self.assertEqual(len(data["leaders"]), 10)
+        values = [leader["value"] for leader in data["leaders"]]
+        self.assertEqual(values, sorted(values, reverse=True))
+        best = PlayerSeasonStat.objects.filter(season=self.season).aggregate(
+            best=Max("passing_yds")
+        )
+        self.assertEqual(values[0], best["best"])
+
+        response = self.client.get(url, {"stat": "passing_tds", "entity": "team"})
+        for leader in response.json()["leaders"]:
+            self.assertEqual(leader["games_played"], 1)
+
+        response = self.client.get(url, {"stat": "punt_long"})
+        self.assertEqual(response.status_code, 404)
+
+        get_user_model().objects.create_user(
+            email="otherstatsuser@example.com", password="testpass123", is_active=True
+        )
+        self.client.login(email="otherstatsuser@example.com", password="testpass123")
+        response = self.client.get(url, {"stat": "passing_yds"})
+        self.assertEqual(response.status_code, 403)
+
+    def test_leaders_page(self):
+        self.play_week(1)
+        self.client.login(email="statsuser@example.com", password="testpass123")
+        url = reverse("matchups:leaders", args=[self.league.slug])
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"stat": "passing_yds"})
+        self.assertContains(response, "Passing Yards leaders")
+        self.assertEqual(len(response.context["leaders"]), 10)
+        leader_queries = [
+            captured["sql"]
+            for captured in queries
+            if "matchups_playerseasonstat" in captured["sql"]
+        ]
+        self.assertEqual(len(leader_queries), 1)
+
+
+class GameEngineTest(SimpleTestCase):
+    """Test simulating games drive by drive from lineup arrays."""
+
+    def setUp(self):
+        num_teams = 4
+        self.lineups = {
+            "team_index": {team_id: team_id for team_id in range(num_teams)},
+            "player_ids": np.arange(num_teams * len(LINEUP)).reshape(num_teams, -1),
+            "ratings": np.full((num_teams, len(LINEUP), len(RATINGS)), 60.0),
+            "kicking": np.full(num_teams, 60.0),
+        }
+        self.home = np.zeros(500, dtype=np.int64)
+        self.away = np.ones(500, dtype=np.int64)
+
+    def simulate(self, is_postseason=False, seed=1):
+        return simulate_games(
+            self.lineups,
+            self.home,
+            self.away,
+            np.full(len(self.home), is_postseason),
+            np.random.default_rng(seed),
+        )
+
+    def test_scores_match_box_scores(self):
+        home_scores, away_scores, box = self.simulate()
+        kicker = box[:, :, K]
+        touchdowns = box[:, :, QB, F["passing_tds"]] + box[:, :, HB, F["rushing_tds"]]
+        self.assertEqual(
+            (
+                6 * touchdowns
+                + kicker[..., F["extra_points"]]
+                + 3 * kicker[..., F["field_goals"]]
+            ).tolist(),
+            np.stack([home_scores, away_scores], axis=1).tolist(),
+        )
+        self.assertTrue(16 <= home_scores.mean() <= 30)
+
+    def test_passing_adds_up(self):
+        home_scores, away_scores, box = self.simulate()
+        for field, receiving_field in (
+            ("passing_comps", "receptions"),
+            ("passing_yds", "receiving_yds"),
+            ("passing_tds", "receiving_tds"),
+        ):
+            self.assertEqual(
+                box[:, :, QB, F[field]].tolist(),
+                box[:, :, RECEIVERS, F[receiving_field]].sum(axis=-1).tolist(),
+            )
+        attempts = box[:, :, QB, F["passing_atts"]]
+        self.assertTrue((box[:, :, QB, F["passing_comps"]] <= attempts).all())
+        # Defensive stats are credited to the other team
+        self.assertEqual(
+            box[:, :, QB, F["times_sacked"]].tolist(),
+            box[:, ::-1][:, :, DEFENDERS, F["sacks"]].sum(axis=-1).tolist(),
+        )
+
+    def test_postseason_games_never_tie(self):
+        home_scores, away_scores, box = self.simulate(is_postseason=True)
+        self.assertFalse((home_scores == away_scores).any())
+
+    def test_better_rated_team_wins_more(self):
+        self.lineups["ratings"][0] = 80
+        home_scores, away_scores, box = self.simulate()
+        self.assertGreater((home_scores > away_scores).mean(), 0.75)
+        self.lineups["ratings"][0] = 40
+        home_scores, away_scores, box = self.simulate()
+        self.assertLess((home_scores > away_scores).mean(), 0.25)
+
+
+class ScoreTablesTest(SimpleTestCase):
+    """Test drawing scorelines from the score tables by team rating."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tables_dir = tempfile.TemporaryDirectory()
+        cls.enterClassContext(override_settings(SCORE_TABLES_DIR=cls.tables_dir.name))
+        cls.addClassCleanup(cls.tables_dir.cleanup)
+        save_score_tables(build_default_score_tables(64, np.random.default_rng(1)))
+
+    def test_tables_are_memory_mapped(self):
+        tables = load_score_tables()
+        self.assertIsInstance(tables, np.memmap)
+        self.assertEqual(tables.shape[:2], (NUM_BUCKETS, NUM_BUCKETS))
+        self.assertFalse(tables.flags.writeable)
+
+    def test_ratings_are_bucketed(self):
+        self.assertEqual(
+            get_buckets([1, MIN_OVERALL, MIN_OVERALL + BUCKET_SIZE, 99]).tolist(),
+            [0, 0, 1, NUM_BUCKETS - 1],
+        )
+
+    def test_better_rated_team_wins_more(self):
+        rng = np.random.default_rng(1)
+        home_scores, away_scores = draw_scorelines(
+            np.full(2000, 75), np.full(2000, 60), rng=rng
+        )
+        self.assertGreater((home_scores > away_scores).mean(), 0.75)
+        home_scores, away_scores = draw_scorelines(
+            np.full(2000, 60), np.full(2000, 75), np.ones(2000, dtype=bool), rng
+        )
+        self.assertLess((home_scores > away_scores).mean(), 0.25)
+        self.assertFalse((home_scores == away_scores).any())
+
+    @mock.patch("apps.matchups.services.score_tables.FALLBACK_SAMPLES", 8)
+    def test_missing_tables_fall_back_to_default_tables(self):
+        with (
+            tempfile.TemporaryDirectory() as tables_dir,
+            override_settings(SCORE_TABLES_DIR=tables_dir),
+        ):
+            home_scores, away_scores = draw_scorelines(
+                np.full(500, 80), np.full(500, 50), np.ones(500, dtype=bool)
+            )
+            tables = load_score_tables()
+            self.assertIs(load_score_tables(), tables)
+            self.assertFalse(os.path.exists(get_score_tables_path()))
+        self.assertNotIsInstance(tables, np.memmap)
+        self.assertEqual(tables.shape, (NUM_BUCKETS, NUM_BUCKETS, 8, 2))
+        self.assertGreater((home_scores > away_scores).mean(), 0.75)
+        self.assertFalse((home_scores == away_scores).any())
+
+    def test_rewritten_tables_are_reloaded(self):
+        rng = np.random.default_rng(1)
+        with (
+            tempfile.TemporaryDirectory() as tables_dir,
+            override_settings(SCORE_TABLES_DIR=tables_dir),
+        ):
+            save_score_tables(build_default_score_tables(4, rng))
+            self.assertEqual(load_score_tables().shape[2], 4)
+            save_score_tables(build_default_score_tables(6, rng))
+            self.assertEqual(load_score_tables().shape[2], 6)
+
+    def test_refresh_command_builds_missing_tables(self):
+        with (
+            tempfile.TemporaryDirectory() as tables_dir,
+            override_settings(SCORE_TABLES_DIR=tables_dir),
+        ):
+            options = {"samples": 4, "seed": 1, "if_missing": True}
+            call_command(
+                "refresh_score_tables", default=True, stdout=StringIO(), **options
+            )
+            self.assertEqual(load_score_tables().shape[2], 4)
+            call_command(
+                "refresh_score_tables", samples=6, if_missing=True, stdout=StringIO()
+            )
+            self.assertEqual(load_score_tables().shape[2], 4)
+
+    def test_built_tables_cover_every_bucket_pair(self):
+        lineups = {
+            "ratings": np.full((2, len(LINEUP), len(RATINGS)), 65.0),
+            "kicking": np.full(2, 65.0),
+        }
+        lineups["ratings"][1] += 4
+        tables = build_score_tables(lineups, [64, 68], 20, np.random.default_rng(1))
+        self.assertEqual(tables.shape, (NUM_BUCKETS, NUM_BUCKETS, 20, 2))
+        strong, weak = get_buckets([80, 50])
+        self.assertGreater(
+            tables[strong, weak, :, 0].mean(), tables[weak, strong, :, 0].mean()
+        )
@@ -13,4 +13,8 @@ urlpatterns = [
          views.TeamScheduleView.as_view(), name='team_schedule'),
     path('<slug:league>/playoffs/',
          views.PlayoffsView.as_view(), name='playoffs'),
+    path('<slug:league>/leaders/',
+         views.LeadersView.as_view(), name='leaders'),
+    path('<slug:league>/leaders/api/',
+         views.LeadersApiView.as_view(), name='leaders_api'),
 ]
@@ -2,13 +2,22 @@ import copy
 
 from django.http import Http404
 from django.shortcuts import get_object_or_404
-from django.views.generic import DetailView, ListView
-
-from apps.leagues.mixins import LeagueContextMixin
-from apps.leagues.permissions import IsLeagueOwner
+from django.views.generic import DetailView, ListView, TemplateView
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated
+
+from apps.leagues.mixins import (
+    LeagueCacheMixin,
+    LeagueConditionalMixin,
+    LeagueContextMixin,
+)
+from apps.leagues.permissions import IsLeagueOwner, IsLeagueOwnerUser
+from apps.seasons.models import TeamSchedule
 from apps.teams.models import Team
 
+from .mixins import LeadersMixin
 from .models import Matchup
+from .serializers import LeadersSerializer
 
 WEEK_ROUNDS = {
     19: "Wildcard Weekend",
@@ -18,7 +27,13 @@ WEEK_ROUNDS = {
 }
 
 
-class WeeklyMatchupsView(IsLeagueOwner, LeagueContextMixin, ListView):
+class WeeklyMatchupsView(
+    IsLeagueOwner,
+    LeagueConditionalMixin,
+    LeagueCacheMixin,
+    LeagueContextMixin,
+    ListView,
+):
     """
     View weekly matchups for the active league and its current season.
     """
@@ -29,9 +44,13 @@ class WeeklyMatchupsView(IsLeagueOwner, LeagueContextMixin, ListView):
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        season = super().get_context_data(object_list=queryset)["season"]
+        season = self.get_season()
         week_number = self._process_week_param(season)
-        return queryset.with_cases().filter(season=season, week_number=week_number)
+        return (
+            queryset.with_cases()
+            .with_records()
+            .filter(season=season, week_number=week_number)
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -57,7 +76,9 @@ class WeeklyMatchupsView(IsLeagueOwner, LeagueContextMixin, ListView):
         return season.week_number_from_param(week_kw)
 
 
-class MatchupDetailView(IsLeagueOwner, LeagueContextMixin, DetailView):
+class MatchupDetailView(
+    IsLeagueOwner, LeagueConditionalMixin, LeagueContextMixin, DetailView
+):
     """
     View additional details related to an individual matchup.
     """
@@ -70,11 +91,17 @@ class MatchupDetailView(IsLeagueOwner, LeagueContextMixin, DetailView):
         queryset = super().get_queryset()
         league_slug = self.kwargs.get("league")
         if league_slug is not None:
-            return queryset.with_cases().filter(season__league__slug=league_slug)
+            return (
+                queryset.with_cases()
+                .with_records()
+                .filter(season__league__slug=league_slug)
+            )
         return queryset
 
 
-class TeamScheduleView(IsLeagueOwner, LeagueContextMixin, ListView):
+class TeamScheduleView(
+    IsLeagueOwner, LeagueConditionalMixin, LeagueContextMixin, ListView
+):
     """
     View the schedule of matchups for an individual team's current season.
     """
@@ -88,13 +115,13 @@ class TeamScheduleView(IsLeagueOwner, LeagueContextMixin, ListView):
         queryset = super().get_queryset()
 
         # From LeagueContextMixin
-        context = super().get_context_data(object_list=queryset)
-        league = context["league"]
-        season = context["season"]
+        league = self.get_league()
+        season = self.get_season()
 
         team_slug = self.kwargs.get("team")
         if team_slug is not None:
             team = get_object_or_404(Team, league=league, slug=team_slug)
+            team.league = league
             self.team = team
         else:
             raise Http404("No team specified for schedule.")
@@ -107,13 +134,23 @@ class TeamScheduleView(IsLeagueOwner, LeagueContextMixin, ListView):
         context = super().get_context_data(**kwargs)
 
         context["team"] = self.team
-        context["bye_week"] = self.team.bye_week
+        context["bye_week"] = (
+            TeamSchedule.objects.filter(team=self.team, season=context["season"])
+            .values_list("bye_week", flat=True)
+            .first()
+        )
         context["teams"] = context["league"].teams.all()
 
         return context
 
 
-class PlayoffsView(IsLeagueOwner, LeagueContextMixin, ListView):
+class PlayoffsView(
+    IsLeagueOwner,
+    LeagueConditionalMixin,
+    LeagueCacheMixin,
+    LeagueContextMixin,
+    ListView,
+):
     """
     View playoff matchups / bracket for the current season
     """
@@ -124,9 +161,10 @@ class PlayoffsView(IsLeagueOwner, LeagueContextMixin, ListView):
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        season = super().get_context_data(object_list=queryset)["season"]
+        season = self.get_season()
         return (
             queryset.with_cases()
+            .with_records()
             .filter(season=season, week_number__gte=19)
             .order_by("week_number")
         )
@@ -135,3 +173,48 @@ class PlayoffsView(IsLeagueOwner, LeagueContextMixin, ListView):
         context = super().get_context_data(**kwargs)
         context["week_to_round"] = copy.copy(WEEK_ROUNDS)
         return context
+
+
+class LeadersView(
+    IsLeagueOwner,
+    LeagueConditionalMixin,
+    LeagueCacheMixin,
+    LeadersMixin,
+    TemplateView,
+):
+    """
+    View the current season's player or team leaders in a stat.
+    """
+
+    template_name = "matchups/leaders.html"
+
+
+class LeadersApiView(LeagueConditionalMixin, LeadersMixin, generics.RetrieveAPIView):
+    """
+    Report the current season's player or team leaders in a stat.
+    """
+
+    permission_classes = (IsAuthenticated, IsLeagueOwnerUser)
+    serializer_class = LeadersSerializer
+
+    def get_object(self):
+        context = self.get_context_data()
+        leaders = []
+        for rank, (leader, value) in enumerate(context["leaders"], 1):
+            entity = getattr(leader, context["entity"])
+            leaders.append(
+                {
+                    "rank": rank,
+                    "id": entity.pk,
+                    "name": str(entity),
+                    "team": leader.team.abbreviation if leader.team else None,
+                    "games_played": leader.games_played,
+                    "value": value,
+                }
+            )
+        return {
+            "season": context["season"].season_number,
+            "stat": context["active_stat"],
+            "entity": context["entity"],
+            "leaders": leaders,
+        }
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('personnel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='is_retired',
+            field=models.BooleanField(default=False),
+        ),
+    ]
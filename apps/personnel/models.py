@@ -18,6 +18,7 @@ class Person(models.Model):
     confidence = models.PositiveSmallIntegerField()
     iq = models.PositiveSmallIntegerField()
     is_free_agent = models.BooleanField(default=False)
+    is_retired = models.BooleanField(default=False)
 
     class Meta:
         abstract = True
@@ -0,0 +1,189 @@
+from collections import defaultdict
+
+import numpy as np
+from django.apps import apps
+from django.db.models import Avg, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Floor
+
+from apps.core.bulk import unnest_bulk_update
+from apps.teams.services.depth_chart import refresh_depth_charts
+
+from ..models import Contract, Player
+from .setup import (
+    ATTRIBUTES,
+    build_players,
+    create_players,
+    read_player_names_from_csv,
+)
+
+# Ratings developed each offseason, the attributes after potential,
+# confidence and iq, and how quickly each declines with age
+RATINGS = ATTRIBUTES[3:]
+DECLINE_WEIGHTS = np.array(
+    [
+        1.5,  # speed
+        1.0,  # strength
+        1.5,  # agility
+        0.25,  # awareness
+        1.25,  # stamina
+        1.0,  # injury
+        0.75,  # run_off
+        0.75,  # pass_off
+        0.5,  # special_off
+        0.75,  # run_def
+        0.75,  # pass_def
+        0.5,  # special_def
+    ]
+)
+PEAK_AGE, DECLINE_AGE = 26, 30
+# Share of the gap to potential closed each season before the peak age,
+# higher for players in their first few seasons
+GROWTH_RATE, EARLY_GROWTH_RATE, EARLY_YEARS = 0.15, 0.25, 3
+DECLINE_PER_YEAR = 1.5
+RATING_NOISE = 1.5
+# Odds of retiring rise with age past the decline age and fall with
+# overall rating, no one plays past the max age
+RETIREMENT_AGE, MAX_AGE = 36, 40
+# Retirees are replaced on their team's roster by rookies of these ages
+MIN_ROOKIE_AGE, MAX_ROOKIE_AGE = 21, 23
+LOAD_FIELDS = ("id", "age", "experience", *ATTRIBUTES)
+
+
+def load_player_arrays(league):
+    """
+    Load a league's active players' ids, ages, experience and attributes
+    as one (players, fields) array with one query, columns in the order
+    of LOAD_FIELDS.
+    """
+    rows = Player.objects.filter(league=league, is_retired=False).values_list(
+        *LOAD_FIELDS
+    )
+    return np.array(list(rows), dtype=np.int64).reshape(-1, len(LOAD_FIELDS))
+
+
+def progress_ratings(age, experience, potential, ratings, rng):
+    """
+    Age players by a season. Players younger than the peak age close
+    part of the gap between each rating and their potential, players
+    past the decline age lose physical ratings first. `ratings` is a
+    (players, RATINGS) array. Returns the new ratings and potential.
+    """
+    age = age[:, None]
+    growth_rate = np.where(experience < EARLY_YEARS, EARLY_GROWTH_RATE, GROWTH_RATE)
+    gap = np.maximum(potential[:, None] - ratings, 0)
+    growth = np.where(
+        age <= PEAK_AGE, growth_rate[:, None] * gap * rng.random(ratings.shape), 0
+    )
+    years_past = np.maximum(age - DECLINE_AGE, 0)
+    decline = (
+        years_past * DECLINE_PER_YEAR * DECLINE_WEIGHTS * rng.random(ratings.shape) * 2
+    )
+    noise = rng.normal(0, RATING_NOISE, ratings.shape)
+
+    new_ratings = np.clip(np.rint(ratings + growth - decline + noise), 0, 99)
+    new_potential = np.clip(potential - years_past[:, 0] * DECLINE_PER_YEAR, 0, 99)
+    return new_ratings.astype(np.int64), np.rint(new_potential).astype(np.int64)
+
+
+def retiring_players(age, overall_ratings, rng):
+    """Return a mask of the players who retire at the given ages."""
+    log_odds = 0.8 * (age - RETIREMENT_AGE) - (overall_ratings - 60) / 10
+    chance = 1 / (1 + np.exp(-log_odds))
+    return (age >= MAX_AGE) | ((age > DECLINE_AGE) & (rng.random(len(age)) < chance))
+
+
+def replace_retirees(league, retired_ids, rng):
+    """
+    End the contracts of retired players and sign a rookie at each of
+    their roster spots. Returns the number of rookies signed.
+    """
+    Team = apps.get_model("teams.Team")
+
+    contracts = Contract.objects.filter(player_id__in=retired_ids, is_active=True)
+    spots = list(contracts.values_list("team_id", "player__position"))
+    contracts.update(is_active=False)
+    if not spots:
+        return 0
+
+    rookies = build_players(
+        league,
+        read_player_names_from_csv(len(spots)),
+        positions=[position for team_id, position in spots],
+    )
+    ages = rng.integers(MIN_ROOKIE_AGE, MAX_ROOKIE_AGE, len(rookies), endpoint=True)
+    for rookie, age in zip(rookies, ages.tolist()):
+        rookie.age, rookie.experience = age, 0
+
+    rosters = defaultdict(list)
+    for (team_id, position), rookie in zip(spots, rookies):
+        rosters[team_id].append(rookie)
+    create_players(
+        [(Team(pk=team_id), players) for team_id, players in rosters.items()]
+    )
+    return len(rookies)
+
+
+def progress_players(league, rng=None):
+    """
+    Run a league's offseason player progression on arrays of all its
+    active players: age them, develop or decline their ratings and retire
+    some, then save them with one bulk update. Retirees are replaced by
+    rookies, and every team's overall rating and depth chart is
+    refreshed. Returns the number of players who retired.
+    """
+    Team = apps.get_model("teams.Team")
+
+    rng = rng or np.random.default_rng()
+    data = load_player_arrays(league)
+    column = {field: i for i, field in enumerate(LOAD_FIELDS)}
+    rating_columns = [column[rating] for rating in RATINGS]
+
+    age = data[:, column["age"]] + 1
+    experience = data[:, column["experience"]] + 1
+    ratings, potential = progress_ratings(
+        age,
+        data[:, column["experience"]],
+        data[:, column["potential"]],
+        data[:, rating_columns],
+        rng,
+    )
+    data[:, column["age"]] = age
+    data[:, column["experience"]] = experience
+    data[:, column["potential"]] = potential
+    data[:, rating_columns] = ratings
+    attributes = data[:, [column[attribute] for attribute in ATTRIBUTES]]
+    overall_ratings = (attributes.sum(axis=1) / len(ATTRIBUTES)).astype(np.int64)
+    retired = retiring_players(age, overall_ratings, rng)
+
+    update_fields = ["age", "experience", "potential", *RATINGS]
+    players = [
+        Player(
+            pk=row[column["id"]],
+            overall_rating=overall_rating,
+            is_retired=is_retired,
+            **{field: row[column[field]] for field in update_fields},
+        )
+        for row, overall_rating, is_retired in zip(
+            data.tolist(), overall_ratings.tolist(), retired.tolist()
+        )
+    ]
+    unnest_bulk_update(
+        Player, players, [*update_fields, "overall_rating", "is_retired"]
+    )
+
+    retired_ids = data[retired, column["id"]].tolist()
+    replace_retirees(league, retired_ids, rng)
+
+    # Every team's rating from its active roster in one grouped update,
+    # truncated like Team.update_team_overall()
+    team_overall = (
+        Contract.objects.filter(team=OuterRef("pk"), is_active=True)
+        .values("team")
+        .annotate(overall=Floor(Avg("player__overall_rating")))
+        .values("overall")
+    )
+    teams = Team.objects.filter(league=league)
+    teams.update(overall_rating=Coalesce(Subquery(team_overall), F("overall_rating")))
+    refresh_depth_charts(list(teams))
+
+    return len(retired_ids)
@@ -1,20 +1,55 @@
-import copy
 import csv
 import os
 import random
+import sys
+from functools import lru_cache
 
+import numpy as np
 from django.utils.text import slugify
 
+from apps.core.bulk import copy_bulk_create
 from apps.core.utils import random_string_generator as random_string
 
 from ..models import Player
 from .distributions import ATTR_DIST, POSITION_DIST
 
-
-def read_player_names_from_csv():
+# Rated attributes in the order of the ATTR_DIST weights
+ATTRIBUTES = (
+    "potential",
+    "confidence",
+    "iq",
+    "speed",
+    "strength",
+    "agility",
+    "awareness",
+    "stamina",
+    "injury",
+    "run_off",
+    "pass_off",
+    "special_off",
+    "run_def",
+    "pass_def",
+    "special_def",
+)
+# Position of every spot on a 53 man roster
+ROSTER_POSITIONS = tuple(
+    pos for pos, (filled, limit) in POSITION_DIST.items() for _ in range(limit)
+)
+# Flattened (position, prototype) pairs and their attribute weights, with
+# each roster spot's first prototype index and number of prototypes
+PROTOTYPES = tuple((pos, proto) for pos in ATTR_DIST for proto in ATTR_DIST[pos])
+PROTOTYPE_WEIGHTS = np.array([ATTR_DIST[pos][proto] for pos, proto in PROTOTYPES])
+PROTOTYPE_OFFSETS = np.array(
+    [[pos for pos, proto in PROTOTYPES].index(pos) for pos in ROSTER_POSITIONS]
+)
+PROTOTYPE_COUNTS = np.array([len(ATTR_DIST[pos]) for pos in ROSTER_POSITIONS])
+
+
+@lru_cache(maxsize=None)
+def load_player_name_catalog():
     """
-    Read names of retired NFL players from CSV and shuffle them randomly.
-    Returns a list of tuple pairs containing first and last names.
+    Read names of retired NFL players from CSV once per process.
+    Returns a pair of tuples with interned first and last names.
     """
     with open(
         os.path.join(os.path.dirname(__file__), "../data/retired-players.csv"), "r"
@@ -22,136 +57,121 @@ def read_player_names_from_csv():
         name_reader = csv.reader(player_name_file, delimiter=",")
         next(name_reader)  # Skip headings
 
-        player_names = [
-            [row[1], row[2]]
-            for row in name_reader
+        first_names, last_names = [], []
+        for row in name_reader:
             # Skip last names that are only middle initials (CSV format issue)
-            if "." not in row[2]
-        ]
+            if "." not in row[2]:
+                first_names.append(sys.intern(row[1]))
+                last_names.append(sys.intern(row[2]))
 
-        # Randomize first and last names
-        first_names = [names[0] for names in player_names]
-        last_names = [names[1] for names in player_names]
-        for names in (first_names, last_names):
-            random.shuffle(names)
+    return tuple(first_names), tuple(last_names)
 
-        player_limit = 1696  # 32 teams * 53 players = 1696 names
-        player_names = list(zip(first_names, last_names))[:player_limit]
 
-    return player_names
+def read_player_names_from_csv(player_limit=1696):
+    """
+    Pick random first and last names of retired NFL players, without
+    replacement, from the cached catalog. By default enough names for
+    32 teams * 53 players = 1696 names.
+    Returns a list of tuple pairs containing first and last names.
+    """
+    first_names, last_names = load_player_name_catalog()
+    return list(
+        zip(
+            random.sample(first_names, player_limit),
+            random.sample(last_names, player_limit),
+        )
+    )
 
 
-def generate_player_attributes(player_names):
+def generate_player_attributes(player_names, num_teams=1, rng=None, positions=None):
     """
-    Return a list of 53 dicts with player attributes
-    that map to Player model fields.
+    Return a list of dicts with player attributes that map to Player
+    model fields, for `num_teams` full rosters (53 players each), or
+    one player per position in `positions` if given.
+    Ratings for every player are drawn at once as a 2-D array.
     """
-
-    position_dist = copy.deepcopy(POSITION_DIST)
-    attr_dist = copy.deepcopy(ATTR_DIST)
-    team_player_limit = 53
-    num_players = 0
-    player_list = []
-
-    while num_players < team_player_limit:
-        player = {}
-
-        # Set player names from parsed CSV data
-        player_name = player_names.pop()
-        player["first_name"], player["last_name"] = player_name
-
-        # Only assign player a position that isn't filled on the roster
-        for pos, dist in position_dist.items():
-            filled, limit = dist
-            if filled < limit:
-                player["position"] = pos
-                # Pick a random prototype based on position
-                player["prototype"] = random.choice(tuple(attr_dist[pos]))
-                dist[0] += 1  # Fill roster spot
-                break
-
-        # Assign player ages based on normal distribution
-        player["age"] = int(random.gauss(1, 0.1) * random.randint(25, 35))
-        default_rookie_age = 22
-        if player["age"] < default_rookie_age:
-            player["experience"] = 0
-        else:
-            player["experience"] = player["age"] - default_rookie_age
-
-        # Generate ratings based on weights and normal distribution
-        base_rating = int(random.gauss(70, 20))
-        position, prototype = player["position"], player["prototype"]
-        pos_weights = attr_dist[position][prototype]
-        # Apply position and prototype weights
-        after_pos_weights = []
-        for pw in range(len(pos_weights)):
-            after_pos_weights.append(pos_weights[pw] + base_rating)
-        # Sigmas for standard deviation by attribute
-        sigmas = (20, 20, 20, 20, 20, 20, 20, 20, 20, 20, 20, 20, 20, 20, 20)
-        final_ratings = list(map(random.gauss, after_pos_weights, sigmas))
-
-        calc_overall = []
-        # Assign final ratings to player key
-        for i, attribute in enumerate(
-            (
-                "potential",
-                "confidence",
-                "iq",
-                "speed",
-                "strength",
-                "agility",
-                "awareness",
-                "stamina",
-                "injury",
-                "run_off",
-                "pass_off",
-                "special_off",
-                "run_def",
-                "pass_def",
-                "special_def",
-            )
-        ):
-            rating = int(final_ratings[i])
-            if rating > 99:
-                rating = 99
-            elif rating < 0:
-                rating = 0
-            player[attribute] = rating
-
-            calc_overall.append(rating)
-
-        # Calculate overall rating and add player to list
-        player["overall_rating"] = int(sum(calc_overall) / len(calc_overall))
-        player_list.append(player)
-
-        num_players += 1
+    rng = np.random.default_rng() if rng is None else rng
+
+    # Fill every roster spot, then pick a random prototype per position
+    if positions is None:
+        slots = np.tile(np.arange(len(ROSTER_POSITIONS)), num_teams)
+    else:
+        slots = np.array(
+            [ROSTER_POSITIONS.index(pos) for pos in positions], dtype=np.int64
+        )
+    num_players = len(slots)
+    num_prototypes = PROTOTYPE_COUNTS[slots]
+    prototypes = PROTOTYPE_OFFSETS[slots] + (
+        rng.random(num_players) * num_prototypes
+    ).astype(int)
+
+    # Assign player ages based on normal distribution
+    ages = rng.normal(1, 0.1, num_players) * rng.integers(25, 36, num_players)
+    ages = ages.astype(int)
+    default_rookie_age = 22
+    experience = np.maximum(ages - default_rookie_age, 0)
+
+    # Generate ratings based on position and prototype weights
+    # and a normal distribution around each player's base rating
+    base_ratings = rng.normal(70, 20, num_players).astype(int)
+    means = PROTOTYPE_WEIGHTS[prototypes] + base_ratings[:, np.newaxis]
+    ratings = np.clip(rng.normal(means, 20).astype(int), 0, 99)
+    overall_ratings = (ratings.sum(axis=1) / len(ATTRIBUTES)).astype(int)
+
+    columns = {
+        "position": [ROSTER_POSITIONS[slot] for slot in slots],
+        "prototype": [PROTOTYPES[proto][1] for proto in prototypes],
+        "age": ages.tolist(),
+        "experience": experience.tolist(),
+        "overall_rating": overall_ratings.tolist(),
+        **dict(zip(ATTRIBUTES, ratings.T.tolist())),
+    }
+    player_list = [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    # Set player names from parsed CSV data
+    for player in player_list:
+        player["first_name"], player["last_name"] = player_names.pop()
 
     return player_list
 
 
-def create_team_players(league, team, player_names):
+def build_players(league, player_names, num_teams=1, positions=None):
     """
-    Creates players and generates their starting attributes on a per-team basis.
+    Builds the players of `num_teams` rosters with starting attributes
+    without saving them, in roster order team by team, or one player per
+    position in `positions` if given.
     Called during Team creation in apps.teams.services.setup.create_teams.
     """
-
-    players = generate_player_attributes(player_names)
-    player_objs = Player.objects.bulk_create(
-        [
-            Player(
-                league=league,
-                slug=slugify(
-                    f'{player["first_name"]}-{player["last_name"]}\
-                -{random_string()}'
-                ),
-                **player,
-            )
-            for player in players
-        ]
+    return [
+        Player(
+            league=league,
+            slug=slugify(
+                f'{player["first_name"]}-{player["last_name"]}\
+            -{random_string()}'
+            ),
+            **player,
+        )
+        for player in generate_player_attributes(
+            player_names, num_teams, positions=positions
+        )
+    ]
+
+
+def create_players(rosters):
+    """
+    Saves the players and contracts of every team with two COPY loads.
+    `rosters` is a list of (saved team, unsaved players) pairs.
+    """
+    copy_bulk_create(
+        Player, [player for team, players in rosters for player in players]
     )
 
     Contract = Player.team.through
-    Contract.objects.bulk_create(
-        [Contract(team=team, player=player) for player in player_objs]
+    copy_bulk_create(
+        Contract,
+        [
+            Contract(team=team, player=player)
+            for team, players in rosters
+            for player in players
+        ],
     )
-    team.update_team_overall()
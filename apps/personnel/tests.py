@@ -0,0 +1,195 @@
+from collections import Counter
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Avg
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.leagues.models import League
+from apps.teams.services.depth_chart import get_depth_chart
+
+from .models import Contract, Player
+from .services.distributions import ATTR_DIST, POSITION_DIST
+from .services.progression import (
+    DECLINE_AGE,
+    MAX_AGE,
+    PEAK_AGE,
+    RATINGS,
+    progress_players,
+    progress_ratings,
+    retiring_players,
+)
+from .services.setup import (
+    ATTRIBUTES,
+    generate_player_attributes,
+    load_player_name_catalog,
+    read_player_names_from_csv,
+)
+
+
+class GeneratePlayerAttributesTest(SimpleTestCase):
+    """Test batch generation of player attributes."""
+
+    def setUp(self):
+        player_names = [("First", f"Last{i}") for i in range(53 * 4)]
+        self.players = generate_player_attributes(
+            player_names, num_teams=4, rng=np.random.default_rng(1)
+        )
+
+    def test_rosters_fill_position_quotas(self):
+        self.assertEqual(len(self.players), 53 * 4)
+        for team in range(4):
+            roster = self.players[team * 53 : (team + 1) * 53]
+            positions = Counter(player["position"] for player in roster)
+            self.assertEqual(
+                positions, {pos: limit for pos, (_, limit) in POSITION_DIST.items()}
+            )
+
+    def test_prototypes_match_positions(self):
+        for player in self.players:
+            self.assertIn(player["prototype"], ATTR_DIST[player["position"]])
+
+    def test_ratings_are_clipped_and_averaged(self):
+        for player in self.players:
+            ratings = [player[attribute] for attribute in ATTRIBUTES]
+            self.assertTrue(all(0 <= rating <= 99 for rating in ratings))
+            self.assertEqual(player["overall_rating"], int(sum(ratings) / 15))
+            self.assertEqual(player["experience"], max(player["age"] - 22, 0))
+
+
+class PlayerNameCatalogTest(SimpleTestCase):
+    """Test sampling player names from the cached name catalog."""
+
+    def test_catalog_is_read_once(self):
+        load_player_name_catalog.cache_clear()
+        read_player_names_from_csv()
+        read_player_names_from_csv()
+        self.assertEqual(load_player_name_catalog.cache_info().misses, 1)
+
+    def test_names_are_sampled_without_replacement(self):
+        first_names, last_names = load_player_name_catalog()
+        player_names = read_player_names_from_csv()
+        self.assertEqual(len(player_names), 1696)
+
+        picked_first = Counter(first for first, last in player_names)
+        available_first = Counter(first_names)
+        for name, count in picked_first.items():
+            self.assertLessEqual(count, available_first[name])
+        self.assertLessEqual({last for first, last in player_names}, set(last_names))
+
+
+class ProgressRatingsTest(SimpleTestCase):
+    """Test aging player ratings as arrays."""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(1)
+        self.ratings = np.full((1000, len(RATINGS)), 60)
+
+    def progress(self, age, potential=80, experience=5):
+        return progress_ratings(
+            np.full(1000, age),
+            np.full(1000, experience),
+            np.full(1000, potential),
+            self.ratings,
+            self.rng,
+        )
+
+    def test_young_players_grow_toward_potential(self):
+        ratings, potential = self.progress(PEAK_AGE - 3)
+        self.assertGreater(ratings.mean(), 61)
+        self.assertEqual(potential.tolist(), [80] * 1000)
+        rookie_ratings, potential = self.progress(PEAK_AGE - 3, experience=0)
+        self.assertGreater(rookie_ratings.mean(), ratings.mean())
+
+    def test_old_players_decline(self):
+        ratings, potential = self.progress(DECLINE_AGE + 5)
+        self.assertLess(ratings.mean(), 55)
+        self.assertTrue((potential < 80).all())
+        speed, awareness = RATINGS.index("speed"), RATINGS.index("awareness")
+        self.assertLess(ratings[:, speed].mean(), ratings[:, awareness].mean())
+
+    def test_ratings_stay_in_range(self):
+        self.ratings[:] = 99
+        ratings, potential = self.progress(PEAK_AGE - 3, potential=99)
+        self.assertLessEqual(ratings.max(), 99)
+        self.ratings[:] = 0
+        ratings, potential = self.progress(MAX_AGE, potential=0)
+        self.assertGreaterEqual(ratings.min(), 0)
+
+    def test_retirement_depends_on_age(self):
+        overall_ratings = np.full(1000, 60)
+        self.assertFalse(
+            retiring_players(
+                np.full(1000, DECLINE_AGE), overall_ratings, self.rng
+            ).any()
+        )
+        self.assertTrue(
+            retiring_players(np.full(1000, MAX_AGE), overall_ratings, self.rng).all()
+        )
+
+
+class ProgressPlayersTest(TestCase):
+    """Test a league's offseason player progression."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="progressuser@example.com", password="testpass123", is_active=True
+        )
+        cls.league = League.objects.create(
+            name="Progress League", user=user, gm_name="Test GM"
+        )
+
+    def test_players_age_and_retire(self):
+        ages = dict(self.league.players.values_list("id", "age"))
+        with CaptureQueriesContext(connection) as queries:
+            retired = progress_players(self.league, np.random.default_rng(1))
+        # Load, bulk update, contracts, rookies, team ratings and depth
+        # charts. Without unnest() and COPY, players and depth chart spots
+        # are written in batches of a few hundred rows
+        self.assertLessEqual(
+            len(queries), 16 if connection.vendor == "postgresql" else 60
+        )
+
+        players = self.league.players.filter(pk__in=ages)
+        self.assertTrue(all(player.age == ages[player.pk] + 1 for player in players))
+        retirees = players.filter(is_retired=True)
+        self.assertEqual(retirees.count(), retired)
+        self.assertGreater(retired, 0)
+        self.assertFalse(
+            Contract.objects.filter(player__in=retirees, is_active=True).exists()
+        )
+        self.assertFalse(
+            self.league.teams.first()
+            .depth_chart_spots.filter(player__is_retired=True)
+            .exists()
+        )
+
+        # Every retiree's roster spot goes to a rookie at their position
+        rookies = self.league.players.exclude(pk__in=ages)
+        self.assertEqual(rookies.count(), retired)
+        self.assertTrue(all(rookie.experience == 0 for rookie in rookies))
+        self.assertEqual(
+            sorted(rookies.values_list("position", flat=True)),
+            sorted(retirees.values_list("position", flat=True)),
+        )
+
+        progress_players(self.league, np.random.default_rng(2))
+        for player in retirees:
+            self.assertEqual(Player.objects.get(pk=player.pk).age, player.age)
+
+    def test_team_ratings_follow_active_rosters(self):
+        progress_players(self.league, np.random.default_rng(1))
+        for team in self.league.teams.all():
+            overall = team.contracts.filter(is_active=True).aggregate(
+                Avg("player__overall_rating")
+            )["player__overall_rating__avg"]
+            self.assertEqual(team.overall_rating, int(overall))
+            self.assertEqual(team.contracts.filter(is_active=True).count(), 53)
+            depth_chart = get_depth_chart(team)
+            self.assertEqual(
+                sum(map(len, depth_chart.values())),
+                team.contracts.filter(is_active=True).count(),
+            )
@@ -1,9 +1,11 @@
 from django.views.generic import DetailView
 
+from apps.leagues.mixins import LeagueConditionalMixin
+
 from .models import Player
 
 
-class PlayerDetailView(DetailView):
+class PlayerDetailView(LeagueConditionalMixin, DetailView):
     """
     View additional details about an individual player in a league.
     """
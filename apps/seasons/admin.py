@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Season, TeamStanding
+from .models import AdvanceSeasonJob, Season, TeamSchedule, TeamStanding
 
 
 class SeasonAdmin(admin.ModelAdmin):
@@ -35,5 +35,27 @@ class TeamStandingAdmin(admin.ModelAdmin):
     )
 
 
+class AdvanceSeasonJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "__str__",
+        "season",
+        "user",
+        "weeks",
+        "status",
+        "weeks_done",
+        "weeks_total",
+        "is_delivered",
+        "created_at",
+        "updated_at",
+    )
+    list_filter = ("status",)
+
+
+class TeamScheduleAdmin(admin.ModelAdmin):
+    list_display = ("team", "season", "bye_week")
+
+
 admin.site.register(Season, SeasonAdmin)
 admin.site.register(TeamStanding, TeamStandingAdmin)
+admin.site.register(TeamSchedule, TeamScheduleAdmin)
+admin.site.register(AdvanceSeasonJob, AdvanceSeasonJobAdmin)
@@ -1,10 +1,31 @@
 from .forms import AdvanceSeasonForm
+from .models import AdvanceSeasonJob
+from .services.jobs import deliver_job_messages
 
 
 def advance_season_form(request):
     """
     Custom context processor (added to config/settings.py).
     Makes AdvanceSeasonForm available in leagues/_league_base.html
-    as {{ advance_season_form }}.
+    as {{ advance_season_form }}, along with the league's active
+    advance job as {{ advance_job }} while the season is advancing.
+    Delivers the messages of jobs that finished since the last page.
     """
-    return {"advance_season_form": AdvanceSeasonForm()}
+    context = {"advance_season_form": AdvanceSeasonForm()}
+
+    resolver_match = getattr(request, "resolver_match", None)
+    league_slug = resolver_match.kwargs.get("league") if resolver_match else None
+    user = getattr(request, "user", None)
+    if league_slug is None or user is None or not user.is_authenticated:
+        return context
+
+    # Active jobs are never delivered, so one query finds both
+    jobs = list(
+        AdvanceSeasonJob.objects.filter(
+            season__league__slug=league_slug, user=user, is_delivered=False
+        )
+    )
+    deliver_job_messages(request, jobs)
+    context["advance_job"] = next((job for job in jobs if job.is_active), None)
+
+    return context
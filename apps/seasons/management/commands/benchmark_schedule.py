@@ -0,0 +1,61 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.leagues.models import League
+from apps.seasons.services.schedule import (
+    build_schedule,
+    fetch_league_structure,
+    generate_matchups,
+    is_valid_schedule,
+    set_schedule,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the constructive schedule builder with the AlgorithmX "
+        "search on a league's matchups."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--league",
+            help="Slug of the league to schedule. Defaults to the first league.",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Number of matchup sets to schedule with each builder.",
+        )
+
+    def handle(self, *args, **options):
+        leagues = League.objects.all()
+        if options["league"]:
+            leagues = leagues.filter(slug=options["league"])
+        league = leagues.first()
+        if league is None:
+            raise CommandError("No league found to schedule.")
+
+        league_structure = fetch_league_structure(league)
+        builders = {"constructive": build_schedule, "algorithm_x": set_schedule}
+        timings = {name: [] for name in builders}
+        failures = {name: 0 for name in builders}
+
+        for _ in range(options["runs"]):
+            matchups = generate_matchups(league_structure)
+            for name, builder in builders.items():
+                start = time.perf_counter()
+                schedule = builder(matchups)
+                timings[name].append(time.perf_counter() - start)
+                if schedule is None or not is_valid_schedule(schedule, matchups):
+                    failures[name] += 1
+
+        for name, times in timings.items():
+            self.stdout.write(
+                f"{name:>12}: mean {statistics.mean(times):.4f}s "
+                f"min {min(times):.4f}s max {max(times):.4f}s "
+                f"failures {failures[name]}/{options['runs']}"
+            )
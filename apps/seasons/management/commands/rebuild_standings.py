@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.seasons.models import Season
+from apps.seasons.services.standings import rebuild_standings
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculate standings, including home/away, division, conference "
+        "and last 5 records, from each season's finalized matchups."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--league",
+            help="Slug of the league whose seasons to rebuild. Defaults to "
+            "every league.",
+        )
+        parser.add_argument(
+            "--all-seasons",
+            action="store_true",
+            help="Rebuild past seasons too, not just current ones.",
+        )
+
+    def handle(self, *args, **options):
+        seasons = Season.objects.select_related("league")
+        if options["league"]:
+            seasons = seasons.filter(league__slug=options["league"])
+            if not seasons.exists():
+                raise CommandError("No league found with that slug.")
+        if not options["all_seasons"]:
+            seasons = seasons.filter(is_current=True)
+
+        for season in seasons:
+            rebuild_standings(season)
+            self.stdout.write(f"Rebuilt standings for {season}.")
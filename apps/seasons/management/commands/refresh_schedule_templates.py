@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.leagues.models import League
+from apps.seasons.services.schedule import (
+    build_schedule,
+    fetch_league_structure,
+    generate_matchups,
+    is_valid_schedule,
+    set_schedule,
+)
+from apps.seasons.services.schedule_templates import (
+    get_structure_key,
+    get_team_slots,
+    save_schedule_templates,
+    schedule_to_template,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Solve schedules for a league's shape and store them in the "
+        "schedule template library used when creating seasons."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--league",
+            help="Slug of the league whose shape to solve. Defaults to the "
+            "first league.",
+        )
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=10,
+            help="Number of templates to store for the shape.",
+        )
+
+    def handle(self, *args, **options):
+        leagues = League.objects.all()
+        if options["league"]:
+            leagues = leagues.filter(slug=options["league"])
+        league = leagues.first()
+        if league is None:
+            raise CommandError("No league found to take the shape from.")
+
+        league_structure = fetch_league_structure(league)
+        team_slots = get_team_slots(league_structure)
+        structure_key = get_structure_key(team_slots)
+        if structure_key is None:
+            raise CommandError("League conferences or divisions differ in size.")
+
+        templates = []
+        while len(templates) < options["count"]:
+            matchups = generate_matchups(league_structure)
+            schedule = build_schedule(matchups) or set_schedule(matchups)
+            if is_valid_schedule(schedule, matchups):
+                templates.append(schedule_to_template(schedule, team_slots))
+
+        save_schedule_templates(structure_key, templates)
+        self.stdout.write(
+            f"Saved {len(templates)} schedule templates for shape {structure_key}."
+        )
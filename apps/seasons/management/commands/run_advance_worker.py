@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.seasons.services.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = "Run a worker that processes queued season advance jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait before polling an empty queue again.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Waiting for season advance jobs...")
+        run_worker(interval=options["interval"], once=options["once"])
@@ -1,6 +1,27 @@
+from django.apps import apps
 from django.db import models
-from django.db.models import Case, Count, F, FloatField, Q, When
-from django.db.models.functions import Cast
+from django.db.models import Case, CharField, F, FloatField, Subquery, Value, When
+from django.db.models.functions import Cast, Concat
+
+
+def team_record_subquery(team, season):
+    """
+    Subquery for a team's "(W-L-T)" record in a season, as shown by
+    Team.current_record. `team` and `season` may be outer references.
+    """
+    TeamStanding = apps.get_model("seasons.TeamStanding")
+    record = Concat(
+        Value("("),
+        Cast("wins", CharField()),
+        Value("-"),
+        Cast("losses", CharField()),
+        Value("-"),
+        Cast("ties", CharField()),
+        Value(")"),
+        output_field=CharField(),
+    )
+    standings = TeamStanding.objects.filter(team=team, season=season).order_by()
+    return Subquery(standings.annotate(record=record).values("record")[:1])
 
 
 class TeamStandingManager(models.Manager):
@@ -25,88 +46,3 @@ class TeamStandingQuerySet(models.QuerySet):
             ),
             games_played=F("wins") + F("losses") + F("ties"),
         )
-
-    def with_wlt(self):
-        finalized_reg_season = Q(
-            season__matchups__season=F("season"),
-            season__matchups__is_final=True,
-            season__matchups__week_number__lte=18,
-        )
-        home_team = Q(season__matchups__home_team=F("team"))
-        away_team = Q(season__matchups__away_team=F("team"))
-        match_participant = home_team | away_team
-        home_won_match = Q(
-            season__matchups__home_score__gt=F("season__matchups__away_score")
-        )
-        away_won_match = Q(
-            season__matchups__away_score__gt=F("season__matchups__home_score")
-        )
-        home_win = home_team & home_won_match
-        away_win = away_team & away_won_match
-        home_loss = home_team & away_won_match
-        away_loss = away_team & home_won_match
-        win = home_win | away_win
-        loss = home_loss | away_loss
-        tie = Q(season__matchups__home_score=F("season__matchups__away_score"))
-        is_divisional = Q(
-            season__matchups__home_team__division=F(
-                "season__matchups__away_team__division"
-            )
-        )
-        is_conference = Q(
-            season__matchups__home_team__conference=F(
-                "season__matchups__away_team__conference"
-            )
-        )
-        last_5 = Q(season__matchups__week_number__gte=F("season__week_number") - 5)
-
-        return self.filter(finalized_reg_season).annotate(
-            home_wins=Count("season__matchups", filter=(home_team & home_won_match)),
-            home_losses=Count("season__matchups", filter=(home_team & ~home_won_match)),
-            home_ties=Count("season__matchups", filter=(home_team & tie)),
-            away_wins=Count("season__matchups", filter=(away_team & away_won_match)),
-            away_losses=Count("season__matchups", filter=(away_team & ~away_won_match)),
-            away_ties=Count("season__matchups", filter=(away_team & tie)),
-            div_wins=Count(
-                "season__matchups", filter=(match_participant & is_divisional & win)
-            ),
-            div_losses=Count(
-                "season__matchups", filter=(match_participant & is_divisional & loss)
-            ),
-            div_ties=Count(
-                "season__matchups", filter=(match_participant & is_divisional & tie)
-            ),
-            conf_wins=Count(
-                "season__matchups",
-                filter=(match_participant & is_conference & ~is_divisional & win),
-            ),
-            conf_losses=Count(
-                "season__matchups",
-                filter=(match_participant & is_conference & ~is_divisional & loss),
-            ),
-            conf_ties=Count(
-                "season__matchups",
-                filter=(match_participant & is_conference & ~is_divisional & tie),
-            ),
-            non_conf_wins=Count(
-                "season__matchups",
-                filter=(match_participant & ~is_conference & ~is_divisional & win),
-            ),
-            non_conf_losses=Count(
-                "season__matchups",
-                filter=(match_participant & ~is_conference & ~is_divisional & loss),
-            ),
-            non_conf_ties=Count(
-                "season__matchups",
-                filter=(match_participant & ~is_conference & ~is_divisional & tie),
-            ),
-            last_5_wins=Count(
-                "season__matchups", filter=(match_participant & last_5 & win)
-            ),
-            last_5_losses=Count(
-                "season__matchups", filter=(match_participant & last_5 & loss)
-            ),
-            last_5_ties=Count(
-                "season__matchups", filter=(match_participant & last_5 & tie)
-            ),
-        )
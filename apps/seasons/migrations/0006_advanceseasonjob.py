@@ -0,0 +1,40 @@
+# Generated by Django 4.2.3 on 2026-10-18 09:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('seasons', '0005_remove_teamstanding_away_losses_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdvanceSeasonJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('weeks', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='QUEUED', max_length=7)),
+                ('weeks_done', models.PositiveSmallIntegerField(default=0)),
+                ('weeks_total', models.PositiveSmallIntegerField(default=0)),
+                ('message', models.CharField(blank=True, max_length=255)),
+                ('message_level', models.PositiveSmallIntegerField(default=25)),
+                ('is_delivered', models.BooleanField(default=False)),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='advance_jobs', to='seasons.season')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='advance_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='advanceseasonjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ('QUEUED', 'RUNNING'))), fields=('season',), name='unique_active_advance_job_for_season'),
+        ),
+    ]
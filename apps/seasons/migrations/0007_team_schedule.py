@@ -0,0 +1,63 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+WEEKS = 18
+
+
+def create_team_schedules(apps, schema_editor):
+    """Save the bye week of every team in existing seasons."""
+    Season = apps.get_model("seasons", "Season")
+    Matchup = apps.get_model("matchups", "Matchup")
+    TeamSchedule = apps.get_model("seasons", "TeamSchedule")
+
+    for season in Season.objects.all():
+        games = Matchup.objects.filter(
+            season=season, week_number__lte=WEEKS
+        ).values_list("week_number", "home_team_id", "away_team_id")
+        weeks_played = {}
+        for week_num, home_id, away_id in games:
+            weeks_played.setdefault(home_id, set()).add(week_num)
+            weeks_played.setdefault(away_id, set()).add(week_num)
+        schedules = []
+        for team_id, weeks in weeks_played.items():
+            byes = [week for week in range(1, WEEKS + 1) if week not in weeks]
+            schedules.append(
+                TeamSchedule(
+                    team_id=team_id,
+                    season=season,
+                    bye_week=byes[0] if byes else None,
+                )
+            )
+        TeamSchedule.objects.bulk_create(schedules)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0001_initial'),
+        ('seasons', '0006_advanceseasonjob'),
+        ('matchups', '0004_matchup_away_score_matchup_away_timeouts_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bye_week', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_schedules', to='seasons.season')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedules', to='teams.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['season', 'bye_week'], name='seasons_tea_season__326d7c_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='teamschedule',
+            constraint=models.UniqueConstraint(fields=('team', 'season'), name='unique_team_schedule_for_season'),
+        ),
+        migrations.RunPython(create_team_schedules, migrations.RunPython.noop),
+    ]
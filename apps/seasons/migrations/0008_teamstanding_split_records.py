@@ -0,0 +1,93 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seasons', '0007_team_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teamstanding',
+            name='away_losses',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='away_ties',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='away_wins',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='conf_losses',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='conf_ties',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='conf_wins',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='div_losses',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='div_ties',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='div_wins',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='home_losses',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='home_ties',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='home_wins',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='last_5',
+            field=models.CharField(blank=True, default='', max_length=5),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='non_conf_losses',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='non_conf_ties',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='non_conf_wins',
+            field=models.SmallIntegerField(default=0),
+        ),
+    ]
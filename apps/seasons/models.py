@@ -1,10 +1,18 @@
 from datetime import date
 
+from django.conf import settings
+from django.contrib import messages
 from django.db import models
+from django.db.models import OuterRef
 from django.http import Http404
 from django.utils.functional import cached_property
 
-from apps.seasons.managers import TeamStandingManager, TeamStandingQuerySet
+from apps.core.models import BaseModel
+from apps.seasons.managers import (
+    TeamStandingManager,
+    TeamStandingQuerySet,
+    team_record_subquery,
+)
 
 from .services.setup import create_season_details
 
@@ -43,16 +51,17 @@ class Season(models.Model):
             create_season_details(self)
 
     def get_byes(self, week_num=False):
-        """Obtain teams with a bye week on the current week"""
+        """
+        Obtain teams with a regular season bye week on the current week,
+        annotated with their season record as `record`
+        """
         week_number = self.week_number if not week_num else week_num
-        matchups = self.matchups.filter(week_number=week_number)
-
-        home_team_ids = matchups.values_list("home_team", flat=True)
-        away_team_ids = matchups.values_list("away_team", flat=True)
-        team_ids = home_team_ids.union(away_team_ids)
-
-        teams_with_bye = self.league.teams.exclude(id__in=team_ids)
-        return teams_with_bye
+        teams_with_bye = self.league.teams.filter(
+            schedules__season=self, schedules__bye_week=week_number
+        )
+        return teams_with_bye.annotate(
+            record=team_record_subquery(OuterRef("pk"), self.pk)
+        )
 
     def week_number_from_param(self, week_kw: int) -> int:
         """Return week number based on kwargs passed from view"""
@@ -98,6 +107,24 @@ class TeamStanding(models.Model):
     points_for = models.SmallIntegerField(default=0)
     points_against = models.SmallIntegerField(default=0)
     streak = models.SmallIntegerField(default=0)
+    # Split records, tallied as each regular season game is finalized
+    home_wins = models.SmallIntegerField(default=0)
+    home_losses = models.SmallIntegerField(default=0)
+    home_ties = models.SmallIntegerField(default=0)
+    away_wins = models.SmallIntegerField(default=0)
+    away_losses = models.SmallIntegerField(default=0)
+    away_ties = models.SmallIntegerField(default=0)
+    div_wins = models.SmallIntegerField(default=0)
+    div_losses = models.SmallIntegerField(default=0)
+    div_ties = models.SmallIntegerField(default=0)
+    conf_wins = models.SmallIntegerField(default=0)
+    conf_losses = models.SmallIntegerField(default=0)
+    conf_ties = models.SmallIntegerField(default=0)
+    non_conf_wins = models.SmallIntegerField(default=0)
+    non_conf_losses = models.SmallIntegerField(default=0)
+    non_conf_ties = models.SmallIntegerField(default=0)
+    # Results of the last 5 games, oldest first, e.g. "WWLTW"
+    last_5 = models.CharField(max_length=5, blank=True, default="")
     division_ranking = models.PositiveSmallIntegerField(default=1)
     conference_ranking = models.PositiveSmallIntegerField(default=1)
     power_ranking = models.PositiveSmallIntegerField(default=1)
@@ -123,6 +150,18 @@ class TeamStanding(models.Model):
     def league(self):
         return self.season.league
 
+    @property
+    def last_5_wins(self) -> int:
+        return self.last_5.count("W")
+
+    @property
+    def last_5_losses(self) -> int:
+        return self.last_5.count("L")
+
+    @property
+    def last_5_ties(self) -> int:
+        return self.last_5.count("T")
+
     @cached_property
     def team_division(self):
         return self.team.division
@@ -130,3 +169,84 @@ class TeamStanding(models.Model):
     @cached_property
     def team_conference(self):
         return self.team.conference
+
+
+class TeamSchedule(models.Model):
+    """
+    A team's regular season bye week, written once when the season's
+    matchups are created so it never has to be derived from them again.
+    """
+
+    team = models.ForeignKey(
+        "teams.Team",
+        on_delete=models.CASCADE,
+        related_name="schedules",
+    )
+    season = models.ForeignKey(
+        Season,
+        on_delete=models.CASCADE,
+        related_name="team_schedules",
+    )
+    bye_week = models.PositiveSmallIntegerField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["team", "season"], name="unique_team_schedule_for_season"
+            ),
+        ]
+        indexes = [models.Index(fields=["season", "bye_week"])]
+
+    def __str__(self):
+        return f"{self.team.abbreviation} schedule - {self.season}"
+
+
+class AdvanceSeasonJob(BaseModel):
+    """
+    A queued request to advance a season, run by the
+    run_advance_worker management command.
+    """
+
+    STATUSES = (
+        ("QUEUED", "Queued"),
+        ("RUNNING", "Running"),
+        ("DONE", "Done"),
+        ("FAILED", "Failed"),
+    )
+    ACTIVE_STATUSES = ("QUEUED", "RUNNING")
+
+    season = models.ForeignKey(
+        Season,
+        on_delete=models.CASCADE,
+        related_name="advance_jobs",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="advance_jobs",
+    )
+    # Null advances to the end of the current phase
+    weeks = models.PositiveSmallIntegerField(blank=True, null=True)
+    status = models.CharField(max_length=7, choices=STATUSES, default="QUEUED")
+    weeks_done = models.PositiveSmallIntegerField(default=0)
+    weeks_total = models.PositiveSmallIntegerField(default=0)
+    message = models.CharField(max_length=255, blank=True)
+    message_level = models.PositiveSmallIntegerField(default=messages.SUCCESS)
+    is_delivered = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ["created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["season"],
+                condition=models.Q(status__in=("QUEUED", "RUNNING")),
+                name="unique_active_advance_job_for_season",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Advance job {self.pk} ({self.get_status_display()}) - {self.season}"
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in self.ACTIVE_STATUSES
@@ -0,0 +1,151 @@
+import datetime
+import logging
+import time
+
+from django.conf import settings
+from django.contrib import messages
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.leagues.cache import bump_league_version
+
+from ..models import AdvanceSeasonJob
+from .season import advance_season
+
+logger = logging.getLogger(__name__)
+
+
+def fail_stale_jobs(jobs=None):
+    """
+    Mark running jobs that haven't reported progress within
+    ADVANCE_JOB_TIMEOUT seconds as failed, so a worker that died
+    mid-advance doesn't block the season's later advances. Jobs record
+    progress after every week. Returns the number of jobs failed.
+    """
+    if jobs is None:
+        jobs = AdvanceSeasonJob.objects.all()
+    cutoff = timezone.now() - datetime.timedelta(seconds=settings.ADVANCE_JOB_TIMEOUT)
+    stale = jobs.filter(status="RUNNING", updated_at__lt=cutoff)
+    league_ids = set(stale.values_list("season__league_id", flat=True))
+    if not league_ids:
+        return 0
+
+    failed = stale.update(
+        status="FAILED",
+        message_level=messages.ERROR,
+        message="The season stopped advancing unexpectedly. Please try again.",
+        updated_at=timezone.now(),
+    )
+    for league_id in league_ids:
+        bump_league_version(league_id)
+    return failed
+
+
+def enqueue_advance_job(season, user, weeks=False):
+    """
+    Queue a job to advance the season by X number of weeks.
+    Returns the season's active job and whether it was created.
+    """
+    fail_stale_jobs(AdvanceSeasonJob.objects.filter(season=season))
+    try:
+        with transaction.atomic():
+            job = AdvanceSeasonJob.objects.create(
+                season=season, user=user, weeks=weeks or None
+            )
+        # Cached pages don't show the job's progress yet
+        bump_league_version(season.league_id)
+        return job, True
+    except IntegrityError:
+        # Only one active job per season is allowed
+        job = AdvanceSeasonJob.objects.get(
+            season=season, status__in=AdvanceSeasonJob.ACTIVE_STATUSES
+        )
+        return job, False
+
+
+def claim_next_job():
+    """
+    Mark the oldest queued job as running and return it.
+    Jobs locked by another worker are skipped and abandoned running
+    jobs are failed first.
+    """
+    fail_stale_jobs()
+    with transaction.atomic():
+        job = (
+            AdvanceSeasonJob.objects.select_for_update(skip_locked=True)
+            .filter(status="QUEUED")
+            .first()
+        )
+        if job is not None:
+            job.status = "RUNNING"
+            job.save(update_fields=["status", "updated_at"])
+    return job
+
+
+def run_job(job):
+    """Advance the job's season and record the outcome on the job."""
+
+    def on_progress(weeks_done, weeks_total):
+        # Also the job's heartbeat, see fail_stale_jobs()
+        AdvanceSeasonJob.objects.filter(pk=job.pk).update(
+            weeks_done=weeks_done, weeks_total=weeks_total, updated_at=timezone.now()
+        )
+
+    # Load a fresh season in case it advanced since the job was queued
+    season = job.season
+    season.refresh_from_db()
+
+    try:
+        message_level, message = advance_season(season, job.weeks or False, on_progress)
+        status = "DONE"
+    except Exception:
+        logger.exception("Advance job %s failed", job.pk)
+        message_level = messages.ERROR
+        message = "Something went wrong while advancing the season."
+        status = "FAILED"
+
+    # Don't overwrite a job failed by fail_stale_jobs() in the meantime
+    finished = AdvanceSeasonJob.objects.filter(pk=job.pk, status="RUNNING").update(
+        status=status,
+        message=message,
+        message_level=message_level,
+        updated_at=timezone.now(),
+    )
+    if not finished:
+        logger.warning("Advance job %s was failed while running", job.pk)
+    job.refresh_from_db()
+    # Cached pages still show the job as running
+    bump_league_version(season.league_id)
+    return job
+
+
+def run_worker(interval=1.0, once=False):
+    """
+    Process queued jobs until stopped, sleeping `interval` seconds
+    whenever the queue is empty. Returns when the queue is empty
+    if `once` is True.
+    """
+    while True:
+        job = claim_next_job()
+        if job is not None:
+            run_job(job)
+        elif once:
+            return
+        else:
+            time.sleep(interval)
+
+
+def deliver_job_messages(request, jobs):
+    """
+    Add the messages of finished, undelivered jobs to the request
+    and mark them as delivered.
+    """
+    finished = [job for job in jobs if not job.is_active and not job.is_delivered]
+    for job in finished:
+        messages.add_message(request, job.message_level, job.message)
+        job.is_delivered = True
+
+    if finished:
+        AdvanceSeasonJob.objects.filter(pk__in=[job.pk for job in finished]).update(
+            is_delivered=True
+        )
@@ -0,0 +1,241 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.matchups.services.score_tables import draw_scorelines
+
+from ..models import TeamStanding
+
+ODDS_TYPES = ("division", "bye", "berth", "title")
+CACHE_TIMEOUT = 60 * 60 * 24
+# Bounds used to pack the ranking tie-breaks (W, L, PF, PA, location)
+# into a single sortable integer, see apps.seasons.services.rankings
+MAX_GAMES = 17
+MAX_POINTS = 1024
+MAX_TEAMS = 32
+
+
+def load_odds_inputs(season):
+    """
+    Load a season's standings, team overall ratings and remaining
+    regular season matchups into compact arrays. Teams are indexed in
+    order of location, the final ranking tie-break.
+    """
+    Matchup = apps.get_model("matchups.Matchup")
+
+    standings = sorted(
+        TeamStanding.objects.filter(season=season),
+        key=lambda standing: standing.team.location,
+    )
+    team_index = {standing.team_id: i for i, standing in enumerate(standings)}
+    # Conferences are ordered by name, as in playoff matchup generation
+    conference_names = sorted({s.team.conference.name for s in standings})
+
+    remaining = Matchup.objects.filter(
+        season=season, week_number__lte=18, is_final=False
+    ).values_list("home_team_id", "away_team_id")
+    games = np.array(
+        [(team_index[home], team_index[away]) for home, away in remaining],
+        dtype=np.int64,
+    ).reshape(-1, 2)
+
+    def team_array(values):
+        return np.array(list(values), dtype=np.int64)
+
+    return {
+        "team_ids": [standing.team_id for standing in standings],
+        "conference": team_array(
+            conference_names.index(s.team.conference.name) for s in standings
+        ),
+        "division": team_array(s.team.division_id for s in standings),
+        "wins": team_array(s.wins for s in standings),
+        "losses": team_array(s.losses for s in standings),
+        "points_for": team_array(s.points_for for s in standings),
+        "points_against": team_array(s.points_against for s in standings),
+        "overall": team_array(s.team.overall_rating for s in standings),
+        "games": games,
+    }
+
+
+def ranking_keys(wins, losses, points_for, points_against):
+    """
+    Pack the ranking tie-breaks into one integer per team where
+    higher is better. Teams must be indexed in order of location.
+    """
+    location = np.arange(wins.shape[-1])
+    points_for = np.minimum(points_for, MAX_POINTS - 1)
+    points_against = np.minimum(points_against, MAX_POINTS - 1)
+    key = wins * (MAX_GAMES + 1) + (MAX_GAMES - losses)
+    key = key * MAX_POINTS + points_for
+    key = key * MAX_POINTS + (MAX_POINTS - 1 - points_against)
+    return key * MAX_TEAMS + (MAX_TEAMS - 1 - location)
+
+
+def play_playoff_games(seeds, home_pos, away_pos, overall, rng):
+    """
+    Play a playoff game in every trial between the teams at the given
+    seed positions. Returns the seed position of each winner.
+    """
+    trials = np.arange(len(seeds))
+    home_scores, away_scores = draw_scorelines(
+        overall[seeds[trials, home_pos]],
+        overall[seeds[trials, away_pos]],
+        np.ones(len(seeds), dtype=bool),
+        rng,
+    )
+    return np.where(home_scores > away_scores, home_pos, away_pos)
+
+
+def play_conference_bracket(seeds, overall, rng):
+    """
+    Play a conference's playoff bracket in every trial, given each
+    trial's 7 seeded team indexes. Returns each trial's champion.
+    """
+    trials = len(seeds)
+
+    def pos(seed):
+        return np.full(trials, seed)
+
+    # Wildcard: (2 @ 7) (3 @ 6) (4 @ 5), seed 1 has a bye
+    wildcard_winners = np.stack(
+        [
+            play_playoff_games(seeds, pos(home), pos(away), overall, rng)
+            for home, away in ((1, 6), (2, 5), (3, 4))
+        ],
+        axis=1,
+    )
+    # Divisional: (1 @ lowest seed) (2nd highest @ 3rd highest)
+    remaining = np.sort(np.column_stack([pos(0), wildcard_winners]), axis=1)
+    divisional_winners = np.stack(
+        [
+            play_playoff_games(seeds, remaining[:, 0], remaining[:, 3], overall, rng),
+            play_playoff_games(seeds, remaining[:, 1], remaining[:, 2], overall, rng),
+        ],
+        axis=1,
+    )
+    # Conference final: highest remaining seed hosts
+    remaining = np.sort(divisional_winners, axis=1)
+    champion_pos = play_playoff_games(
+        seeds, remaining[:, 0], remaining[:, 1], overall, rng
+    )
+    return seeds[np.arange(trials), champion_pos]
+
+
+def simulate_odds(inputs, trials, seed=None):
+    """
+    Simulate the rest of the regular season and the playoffs `trials`
+    times, drawing scores from the score tables by team overall rating.
+    Returns how often each team won its division, earned a bye, earned
+    a playoff berth and won the title, as a (4, teams) array.
+    """
+    rng = np.random.default_rng(seed)
+    num_teams = len(inputs["wins"])
+    games = inputs["games"]
+    num_games = len(games)
+
+    # Remaining regular season scores, one row per trial
+    overall = inputs["overall"]
+    home_scores, away_scores = draw_scorelines(
+        np.tile(overall[games[:, 0]], trials),
+        np.tile(overall[games[:, 1]], trials),
+        rng=rng,
+    )
+    home_scores = home_scores.reshape(trials, num_games)
+    away_scores = away_scores.reshape(trials, num_games)
+
+    # One-hot game -> team matrices to tally results per team
+    home_teams = np.zeros((num_games, num_teams), dtype=np.int64)
+    away_teams = np.zeros((num_games, num_teams), dtype=np.int64)
+    home_teams[np.arange(num_games), games[:, 0]] = 1
+    away_teams[np.arange(num_games), games[:, 1]] = 1
+
+    home_wins = (home_scores > away_scores).astype(np.int64)
+    away_wins = (away_scores > home_scores).astype(np.int64)
+    wins = inputs["wins"] + home_wins @ home_teams + away_wins @ away_teams
+    losses = inputs["losses"] + away_wins @ home_teams + home_wins @ away_teams
+    points_for = (
+        inputs["points_for"] + home_scores @ home_teams + away_scores @ away_teams
+    )
+    points_against = (
+        inputs["points_against"] + away_scores @ home_teams + home_scores @ away_teams
+    )
+    keys = ranking_keys(wins, losses, points_for, points_against)
+
+    rows = np.arange(trials)
+    counts = np.zeros((len(ODDS_TYPES), num_teams), dtype=np.int64)
+
+    # Division winners
+    is_leader = np.zeros((trials, num_teams), dtype=bool)
+    for division in np.unique(inputs["division"]):
+        members = np.flatnonzero(inputs["division"] == division)
+        leaders = members[np.argmax(keys[:, members], axis=1)]
+        is_leader[rows, leaders] = True
+    counts[0] = is_leader.sum(axis=0)
+
+    # Seeds 1-4 are division leaders, 5-7 the best remaining teams
+    champions = []
+    for conference in np.unique(inputs["conference"]):
+        members = np.flatnonzero(inputs["conference"] == conference)
+        conf_keys = keys[:, members]
+        conf_leaders = is_leader[:, members]
+        leader_order = np.argsort(np.where(conf_leaders, -conf_keys, 1), axis=1)
+        wildcard_order = np.argsort(np.where(conf_leaders, 1, -conf_keys), axis=1)
+        seeds = members[np.concatenate([leader_order[:, :4], wildcard_order[:, :3]], 1)]
+
+        counts[1] += np.bincount(seeds[:, 0], minlength=num_teams)
+        counts[2] += np.bincount(seeds.ravel(), minlength=num_teams)
+        champions.append(play_conference_bracket(seeds, overall, rng))
+
+    # Championship: first conference's champion hosts
+    home_scores, away_scores = draw_scorelines(
+        overall[champions[0]], overall[champions[1]], np.ones(trials, dtype=bool), rng
+    )
+    title_winners = np.where(home_scores > away_scores, champions[0], champions[1])
+    counts[3] = np.bincount(title_winners, minlength=num_teams)
+
+    return counts
+
+
+def run_odds_simulation(inputs, trials, workers=1, seed=None):
+    """
+    Split `trials` across a process pool of `workers` and return the
+    probability of each outcome per team as a (4, teams) array.
+    """
+    workers = max(1, min(workers, trials))
+    chunk_sizes = [len(chunk) for chunk in np.array_split(np.arange(trials), workers)]
+    chunk_seeds = np.random.SeedSequence(seed).spawn(workers)
+
+    if workers == 1:
+        counts = simulate_odds(inputs, trials, chunk_seeds[0])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            counts = sum(
+                executor.map(simulate_odds, repeat(inputs), chunk_sizes, chunk_seeds)
+            )
+
+    return counts / trials
+
+
+def get_playoff_odds(season):
+    """
+    Return each team's odds of winning its division, earning a bye,
+    earning a playoff berth and winning the title, keyed by team id.
+    Cached per season and week so each week is only simulated once.
+    """
+    cache_key = f"playoff_odds:{season.pk}:{season.week_number}"
+    odds = cache.get(cache_key)
+    if odds is None:
+        inputs = load_odds_inputs(season)
+        probabilities = run_odds_simulation(
+            inputs, settings.PLAYOFF_ODDS_TRIALS, settings.PLAYOFF_ODDS_WORKERS
+        )
+        odds = {
+            team_id: dict(zip(ODDS_TYPES, probabilities[:, i].tolist()))
+            for i, team_id in enumerate(inputs["team_ids"])
+        }
+        cache.set(cache_key, odds, CACHE_TIMEOUT)
+    return odds
@@ -1,16 +1,24 @@
+import math
+
 from django.apps import apps
 from django.db.models import Q
 from django.utils.text import slugify
 
 from ..models import TeamStanding
 
+REGULAR_SEASON_GAMES = 17
+# Running clinches from lowest to highest
+CLINCH_PRECEDENCE = ("BTH", "DIV", "BYE")
+
 
 def update_final_playoff_clinches(season):
     """
     Update final playoff clinches based on div and conf ranking
     at the end of the season.
     """
-    league_standings = TeamStanding.objects.filter(season=season)
+    league_standings = list(
+        TeamStanding.objects.filter(season=season).select_related(None)
+    )
 
     for standing in league_standings:
         if standing.conference_ranking == 1:
@@ -22,116 +30,111 @@ def update_final_playoff_clinches(season):
         else:
             standing.clinched = "OUT"
 
-        standing.save()
-
-
-def update_div_and_conf_clinches(standings, div=False, conf=False):
-    """
-    Update div and conf clinches mid-season based on
-    how many games back the second ranking team is.
-    """
-    if div:
-        lead_ranking = Q(division_ranking=1)
-        already_clinched = Q(clinched="DIV")
-        next_ranking = Q(division_ranking=2)
-    elif conf:
-        lead_ranking = Q(conference_ranking=1)
-        already_clinched = Q(clinched="BYE")
-        next_ranking = Q(conference_ranking=2)
-
-    # Div or conf rank 1's who haven't clinched div or conf yet
-    lead_standings = standings.filter(lead_ranking).exclude(already_clinched)
-
-    for rank_1 in lead_standings:
-        if div:
-            match_entity = Q(team__division=rank_1.team.division)
-        elif conf:
-            match_entity = Q(team__conference=rank_1.team.conference)
-
-        # Div rank 2's in same div as div rank 1's
-        rank_2 = standings.get(next_ranking, match_entity)
+    TeamStanding.objects.bulk_update(league_standings, ["clinched"])
 
-        rank_1_wins = rank_1.wins + 0.5 * rank_1.ties
 
-        rank_2_gp = rank_2.wins + rank_2.losses + rank_2.ties
-        rank_2_gl = 17 - rank_2_gp
-        rank_2_wins = rank_2.wins + 0.5 * rank_2.ties
-        rank_2_gb = rank_1_wins - rank_2_wins
+def win_points(standing):
+    """Wins so far, with ties counting as half a win."""
+    return standing.wins + 0.5 * standing.ties
 
-        # Rank 1 clinches div (rank 2 is too many games behind)
-        if rank_2_gb > rank_2_gl:
-            if div:
-                rank_1.clinched = "DIV"
-            elif conf:
-                rank_1.clinched = "BYE"
 
-            rank_1.save()
+def max_win_points(standing):
+    """Most win points a team can finish the regular season with."""
+    games_played = standing.wins + standing.losses + standing.ties
+    return win_points(standing) + (REGULAR_SEASON_GAMES - games_played)
 
 
-def update_berths_and_eliminations(standings):
+def magic_number(leader, chaser):
     """
-    Update playoff berths and eliminations mid-season based on
-    how many games back the eighth ranking and below teams are.
+    Combined leader wins and chaser losses needed until the chaser
+    can no longer catch the leader. Zero means the leader has clinched.
     """
-    # Top and bottom standings who haven't clinched a berth or aren't out yet
-    top_7_standings = standings.filter(conference_ranking__lte=7).exclude(
-        clinched="BTH"
-    )
+    return max(math.floor(max_win_points(chaser) - win_points(leader)) + 1, 0)
 
-    bottom_8_standings = standings.filter(conference_ranking__gte=8).exclude(
-        clinched="OUT"
-    )
 
-    for top_7 in top_7_standings:
-        rank_8 = standings.get(
-            conference_ranking=8,
-            team__conference=top_7.team.conference,
-        )
-
-        top_7_wins = top_7.wins + 0.5 * top_7.ties
-
-        rank_8_gp = rank_8.wins + rank_8.losses + rank_8.ties
-        rank_8_gl = 17 - rank_8_gp
-        rank_8_wins = rank_8.wins + 0.5 * rank_8.ties
-        rank_8_gb = top_7_wins - rank_8_wins
-
-        # Rank 1 clinches div (rank 2 is too many games behind)
-        if rank_8_gb > rank_8_gl:
-            top_7.clinched = "BTH"
-            top_7.save()
-
-    for bottom_8 in bottom_8_standings:
-        rank_7 = standings.get(
-            conference_ranking=7,
-            team__conference=bottom_8.team.conference,
-        )
-
-        rank_7_wins = rank_7.wins + 0.5 * rank_7.ties
-
-        bottom_8_gp = bottom_8.wins + bottom_8.losses + bottom_8.ties
-        bottom_8_gl = 17 - bottom_8_gp
-        bottom_8_wins = bottom_8.wins + 0.5 * bottom_8.ties
-        bottom_8_gb = rank_7_wins - bottom_8_wins
+def compute_magic_numbers(standings):
+    """
+    Compute division, bye, berth and elimination magic numbers in memory
+    for a season's standings and set them on each standing.
+    Numbers that don't apply to a team are None.
+    """
+    conf_ranks = {}
+    div_ranks = {}
+    for standing in standings:
+        team = standing.team
+        conf_ranks[(team.conference_id, standing.conference_ranking)] = standing
+        div_ranks[(team.division_id, standing.division_ranking)] = standing
+
+    for standing in standings:
+        conf_id = standing.team.conference_id
+        div_id = standing.team.division_id
+        div_rival = div_ranks.get((div_id, 2))
+        bye_rival = conf_ranks.get((conf_id, 2))
+        berth_rival = conf_ranks.get((conf_id, 8))
+        last_seed = conf_ranks.get((conf_id, 7))
+
+        standing.div_magic = None
+        standing.bye_magic = None
+        standing.berth_magic = None
+        standing.elimination_number = None
+
+        if standing.division_ranking == 1 and div_rival:
+            standing.div_magic = magic_number(standing, div_rival)
+        if standing.conference_ranking == 1 and bye_rival:
+            standing.bye_magic = magic_number(standing, bye_rival)
+        if standing.conference_ranking <= 7 and berth_rival:
+            standing.berth_magic = magic_number(standing, berth_rival)
+        elif standing.conference_ranking > 7 and last_seed:
+            standing.elimination_number = magic_number(last_seed, standing)
+
+    return standings
+
+
+def get_running_clinch(standing):
+    """
+    Return the clinch a standing has secured based on its magic numbers,
+    keeping any higher clinch that was secured in a previous week.
+    """
+    if standing.bye_magic == 0:
+        clinch = "BYE"
+    elif standing.div_magic == 0:
+        clinch = "DIV"
+    elif standing.berth_magic == 0:
+        clinch = "BTH"
+    elif standing.elimination_number == 0:
+        clinch = "OUT"
+    else:
+        clinch = None
 
-        # Rank 1 clinches div (rank 2 is too many games behind)
-        if bottom_8_gb > bottom_8_gl:
-            bottom_8.clinched = "OUT"
-            bottom_8.save()
+    current = standing.clinched
+    if current is None:
+        return clinch
+    if clinch in CLINCH_PRECEDENCE and current in CLINCH_PRECEDENCE:
+        return max(current, clinch, key=CLINCH_PRECEDENCE.index)
+    return current
 
 
 def update_running_playoff_clinches(season):
     """
-    Helper function to update the clinches and playoff
-    births for each clinch type in week 8 or later.
+    Update the clinches and playoff berths for each clinch type
+    in week 8 or later. All standings are loaded once and only
+    changed clinches are written back.
     """
     # Only check in week 8 or later
     # (No team can clinch or be eliminated with 8 or less games)
     if season.week_number >= 8:
-        standings = TeamStanding.objects.filter(season=season)
+        standings = list(TeamStanding.objects.filter(season=season))
+        compute_magic_numbers(standings)
+
+        changed = []
+        for standing in standings:
+            clinch = get_running_clinch(standing)
+            if clinch != standing.clinched:
+                standing.clinched = clinch
+                changed.append(standing)
 
-        update_div_and_conf_clinches(standings, div=True)
-        update_div_and_conf_clinches(standings, conf=True)
-        update_berths_and_eliminations(standings)
+        if changed:
+            TeamStanding.objects.bulk_update(changed, ["clinched"])
 
 
 def update_playoff_rankings(season, round_type, winner):
@@ -258,12 +261,12 @@ def sim_round_matchups(season, round_type):
 
     else:
         # Get winner and update their ranking
-        matchups = Matchup.objects.filter(season=season, week_number=current_week)
+        matchups = Matchup.objects.filter(
+            season=season, week_number=current_week
+        ).simulate_all()
 
         winners = []
         for matchup in matchups:
-            matchup.simulate()
-            matchup.get_score()
             winner = matchup.get_winning_team()
             winners.append(winner)
 
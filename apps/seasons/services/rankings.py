@@ -1,120 +1,95 @@
-from django.apps import apps
-from django.db.models import F, Window
+from django.db.models import Case, F, When, Window
 from django.db.models.functions import Rank
 
 from ..models import TeamStanding
 
+# Tie-break rules for each ranking type, in order of precedence
+DIVISION_RANKING_ORDER = (
+    F("wins").desc(),
+    F("losses"),
+    F("points_for").desc(),
+    F("points_against"),
+    F("team__location"),
+)
+CONFERENCE_RANKING_ORDER = DIVISION_RANKING_ORDER
+POWER_RANKING_ORDER = (
+    F("wins").desc(),
+    F("losses"),
+    F("team__overall_rating"),
+    F("streak").desc(),
+    F("points_for").desc(),
+    F("points_against"),
+    F("team__location"),
+)
 
-def generate_division_rankings(season):
+
+def rank_standings(season, order_by, partition_by=None):
     """
-    Generate division rankings based on new standings for next week.
+    Return a season's standings annotated with their rank within
+    each partition, computed by the database in a single query.
     """
-    Division = apps.get_model("leagues.Division")
-    divisions = Division.objects.filter(conference__league=season.league)
-    division_rankings = {}
-    for division in divisions:
-        division_rank_qs = TeamStanding.objects.filter(
-            season=season,
-            team__division__exact=division,
-        ).annotate(
+    return (
+        TeamStanding.objects.filter(season=season)
+        .select_related(None)
+        .annotate(
             rank=Window(
                 expression=Rank(),
-                order_by=[
-                    F("wins").desc(),
-                    F("losses"),
-                    F("points_for").desc(),
-                    F("points_against"),
-                    F("team__location"),
-                ],
+                partition_by=partition_by,
+                order_by=list(order_by),
             )
         )
-        division_rankings[division] = division_rank_qs
-        for team in division.teams.all():
-            for standing in division_rankings[division]:
-                if standing.team == team:
-                    standing.division_ranking = standing.rank
-                    standing.save()
+    )
 
 
-def generate_conference_rankings(season):
+def generate_division_rankings(season):
     """
-    Generate conference rankings based on new standings for next week.
+    Generate division rankings based on new standings for next week.
     """
-    Conference = apps.get_model("leagues.Conference")
-    conferences = Conference.objects.filter(league=season.league)
-    for conference in conferences:
-        top_4_conference = TeamStanding.objects.filter(
-            season=season,
-            team__conference=conference,
-            division_ranking=1,
-        ).annotate(
-            rank=Window(
-                expression=Rank(),
-                order_by=[
-                    F("wins").desc(),
-                    F("losses"),
-                    F("points_for").desc(),
-                    F("points_against"),
-                    F("team__location"),
-                ],
-            )
+    standings = list(
+        rank_standings(
+            season,
+            DIVISION_RANKING_ORDER,
+            partition_by=[F("team__division")],
         )
+    )
+    for standing in standings:
+        standing.division_ranking = standing.rank
 
-        bottom_12_conference = (
-            TeamStanding.objects.filter(
-                season=season,
-                team__conference=conference,
-            )
-            .exclude(division_ranking=1)
-            .annotate(
-                rank=Window(
-                    expression=Rank(),
-                    order_by=[
-                        F("wins").desc(),
-                        F("losses"),
-                        F("points_for").desc(),
-                        F("points_against"),
-                        F("team__location"),
-                    ],
-                )
-            )
-        )
+    TeamStanding.objects.bulk_update(standings, ["division_ranking"])
 
-        for standing in top_4_conference:
-            standing.conference_ranking = standing.rank
-            standing.save()
 
-        for standing in bottom_12_conference:
+def generate_conference_rankings(season):
+    """
+    Generate conference rankings based on new standings for next week.
+    Division leaders take the top 4 spots in their conference.
+    Requires division rankings to be up to date.
+    """
+    is_division_leader = Case(When(division_ranking=1, then=True), default=False)
+    standings = list(
+        rank_standings(
+            season,
+            CONFERENCE_RANKING_ORDER,
+            partition_by=[F("team__conference"), is_division_leader],
+        )
+    )
+    for standing in standings:
+        if standing.division_ranking == 1:
+            standing.conference_ranking = standing.rank
+        else:
             standing.conference_ranking = standing.rank + 4
-            standing.save()
+
+    TeamStanding.objects.bulk_update(standings, ["conference_ranking"])
 
 
 def generate_league_rankings(season):
     """
     Generate league rankings based on new standings for next week.
     """
-    league_rankings = TeamStanding.objects.filter(
-        season=season,
-    ).annotate(
-        rank=Window(
-            expression=Rank(),
-            order_by=[
-                F("wins").desc(),
-                F("losses"),
-                F("team__overall_rating"),
-                F("streak").desc(),
-                F("points_for").desc(),
-                F("points_against"),
-                F("team__location"),
-            ],
-        )
-    )
+    standings = list(rank_standings(season, POWER_RANKING_ORDER))
+    for standing in standings:
+        standing.power_ranking = standing.rank
 
-    for team in season.league.teams.all():
-        for standing in league_rankings:
-            if standing.team == team:
-                standing.power_ranking = standing.rank
-                standing.save()
+    TeamStanding.objects.bulk_update(standings, ["power_ranking"])
 
 
 def update_rankings(season):
@@ -1,7 +1,17 @@
 import random
+from collections import Counter, defaultdict
 
 from algorithm_x import AlgorithmX
 
+from .schedule_templates import schedule_from_template
+
+WEEKS = 18
+# Bye weeks (0-indexed) and the number of teams on bye in each of them
+BYE_WEEKS = range(5, 13)
+BYES_PER_WEEK = 4
+# Search nodes allowed when splitting a group of games into rounds
+FACTORIZE_LIMIT = 10000
+
 
 def fetch_league_structure(league):
     teams = league.teams.all().prefetch_related("division__teams")
@@ -171,6 +181,206 @@ def generate_matchups(league_structure):
     return matchups
 
 
+class _SearchLimitReached(Exception):
+    pass
+
+
+def factorize(edges, limit=FACTORIZE_LIMIT):
+    """
+    Split a regular multigraph into perfect matchings, i.e. rounds in
+    which every vertex appears exactly once. `edges` are pairs of
+    sortable vertices. Returns a list of rounds of edge indexes, or
+    None if the graph isn't regular or no split was found in `limit`
+    search nodes.
+    """
+    degrees = Counter(v for edge in edges for v in edge)
+    if len(set(degrees.values())) > 1:
+        return None
+
+    # Parallel edges are interchangeable, so search over vertex pairs
+    pairs = defaultdict(list)
+    for i, (u, v) in enumerate(edges):
+        pairs[(min(u, v), max(u, v))].append(i)
+    neighbours = defaultdict(set)
+    for u, v in pairs:
+        neighbours[u].add(v)
+        neighbours[v].add(u)
+    vertices = sorted(degrees)
+    rounds = []
+    nodes = 0
+
+    def fill_round(round_pairs, covered):
+        nonlocal nodes
+        nodes += 1
+        if nodes > limit:
+            raise _SearchLimitReached
+
+        vertex = next((v for v in vertices if v not in covered), None)
+        if vertex is None:
+            rounds.append([pairs[pair].pop() for pair in round_pairs])
+            if solve():
+                return True
+            for pair, i in zip(round_pairs, rounds.pop()):
+                pairs[pair].append(i)
+            return False
+
+        for other in sorted(neighbours[vertex]):
+            pair = (min(vertex, other), max(vertex, other))
+            if other in covered or not pairs[pair]:
+                continue
+            round_pairs.append(pair)
+            covered |= {vertex, other}
+            if fill_round(round_pairs, covered):
+                return True
+            round_pairs.pop()
+            covered -= {vertex, other}
+        return False
+
+    def solve():
+        if not any(pairs.values()):
+            return True
+        return fill_round([], set())
+
+    try:
+        return rounds if solve() else None
+    except _SearchLimitReached:
+        return None
+
+
+def is_valid_schedule(schedule, matchups):
+    """
+    Check that a schedule plays every matchup once, that no team plays
+    twice in a week and that each team has one bye in a bye week.
+    """
+    if len(schedule) != WEEKS:
+        return False
+    scheduled = Counter(tuple(matchup) for week in schedule for matchup in week)
+    if scheduled != Counter(tuple(matchup) for matchup in matchups):
+        return False
+
+    teams = {team for matchup in matchups for team in matchup}
+    byes = Counter()
+    for week_number, week in enumerate(schedule):
+        playing = [team for matchup in week for team in matchup]
+        if len(playing) != len(set(playing)):
+            return False
+        week_byes = teams - set(playing)
+        if week_byes and (
+            week_number not in BYE_WEEKS or len(week_byes) != BYES_PER_WEEK
+        ):
+            return False
+        byes.update(week_byes)
+    return all(byes[team] == 1 for team in teams)
+
+
+def build_schedule(matchups, rng=random):
+    """
+    Build an 18 week schedule from `generate_matchups` output without
+    searching, in time bounded by the number of matchups.
+
+    Each division pairing (and each division's own games) is split into
+    rounds, and those rounds are combined into league-wide rounds in
+    which every team plays once. Division pairs that share a round form
+    groups of teams whose games can be moved between weeks together,
+    which is used to spread byes over the bye weeks. `rng` only shuffles
+    the order of the weeks.
+
+    Returns None if the matchups don't fit this structure.
+    """
+    teams = list(dict.fromkeys(team for matchup in matchups for team in matchup))
+    team_index = {team: i for i, team in enumerate(teams)}
+    edges = [(team_index[home], team_index[away]) for home, away in matchups]
+    division_of = [team.division_id for team in teams]
+
+    # Games grouped by the (sorted) divisions of the two teams
+    pieces = defaultdict(list)
+    for i, (u, v) in enumerate(edges):
+        key = tuple(sorted((division_of[u], division_of[v])))
+        pieces[key].append(i)
+
+    # Rounds within each division or division pair
+    piece_rounds = {}
+    for key, game_idxs in pieces.items():
+        rounds = factorize([edges[i] for i in game_idxs])
+        if rounds is None:
+            return None
+        piece_rounds[key] = [[game_idxs[i] for i in r] for r in rounds]
+
+    # Games within a division can be played in the same league round
+    intra_rounds = [piece_rounds[key] for key in piece_rounds if key[0] == key[1]]
+    if len({len(rounds) for rounds in intra_rounds}) != 1:
+        return None
+    league_rounds = [sum(rounds, []) for rounds in zip(*intra_rounds)]
+    local_rounds = list(league_rounds)
+
+    # Pair up divisions for the rest of the league rounds
+    cross_keys = [key for key in piece_rounds if key[0] != key[1]]
+    division_edges = [key for key in cross_keys for _ in piece_rounds[key]]
+    division_rounds = factorize(division_edges)
+    if division_rounds is None:
+        return None
+    division_rounds = [
+        tuple(sorted(division_edges[i] for i in r)) for r in division_rounds
+    ]
+
+    # The most common division pairing defines groups of teams that
+    # only play each other in the local rounds
+    grouping = Counter(division_rounds).most_common(1)[0][0]
+    cross_rounds = []
+    for division_round in division_rounds:
+        games = sum((piece_rounds[key].pop() for key in division_round), [])
+        if division_round == grouping:
+            local_rounds.append(games)
+        else:
+            cross_rounds.append(games)
+
+    groups = [
+        {i for i, division in enumerate(division_of) if division in pair}
+        for pair in grouping
+    ]
+    bye_weeks = list(BYE_WEEKS)
+    if (
+        len(groups) * 2 != len(bye_weeks)
+        or any(len(group) != 2 * BYES_PER_WEEK for group in groups)
+        or len(local_rounds) < len(bye_weeks) - 1
+    ):
+        return None
+
+    # Bye weeks: each group plays half of one local round in each of its
+    # two bye weeks and a full local round in the other groups' bye weeks
+    rng.shuffle(local_rounds)
+    rng.shuffle(bye_weeks)
+    weeks = {week: [] for week in range(WEEKS)}
+    for group_number, group in enumerate(groups):
+        group_rounds = [
+            [i for i in games if edges[i][0] in group]
+            for games in local_rounds[: len(bye_weeks) - 1]
+        ]
+        split_round = group_rounds.pop()
+        half = len(split_round) // 2
+        own_weeks = bye_weeks[group_number * 2 : group_number * 2 + 2]
+        other_weeks = [week for week in bye_weeks if week not in own_weeks]
+
+        weeks[own_weeks[0]] += split_round[:half]
+        weeks[own_weeks[1]] += split_round[half:]
+        for week, games in zip(other_weeks, group_rounds):
+            weeks[week] += games
+
+    # Every other week is a full league round
+    full_rounds = cross_rounds + local_rounds[len(bye_weeks) - 1 :]
+    full_weeks = [week for week in range(WEEKS) if week not in BYE_WEEKS]
+    if len(full_rounds) != len(full_weeks):
+        return None
+    rng.shuffle(full_rounds)
+    for week, games in zip(full_weeks, full_rounds):
+        weeks[week] = games
+
+    schedule = [[matchups[i] for i in weeks[week]] for week in range(WEEKS)]
+    if not is_valid_schedule(schedule, matchups):
+        return None
+    return schedule
+
+
 def set_schedule(matchups, limit=500):
     # `limit` is a computation limit passed on to the AlgorithmX solver. If
     # it's too small then no solutions will be found. If it's too big then it
@@ -270,7 +480,17 @@ def set_schedule(matchups, limit=500):
 
 def create_schedule(season):
     league_structure = fetch_league_structure(season.league)
+
+    # Use a pre-solved template if there's one for the league's shape
+    schedule = schedule_from_template(league_structure)
+    if schedule is not None:
+        return schedule
+
     matchups = generate_matchups(league_structure)
-    schedule = set_schedule(matchups)
+
+    # Fall back to searching for a schedule if it can't be constructed
+    schedule = build_schedule(matchups)
+    if schedule is None:
+        schedule = set_schedule(matchups)
 
     return schedule
@@ -0,0 +1,103 @@
+import json
+import os
+import random
+from collections import Counter
+from functools import lru_cache
+
+TEMPLATES_PATH = os.path.join(
+    os.path.dirname(__file__), "../data/schedule-templates.json"
+)
+
+
+def get_team_slots(league_structure):
+    """
+    Map each (conference, division, seat) slot to a team. Conferences
+    and divisions are ordered by name and teams by creation order.
+    """
+    slots = {}
+    for conf_num, conference in enumerate(league_structure["conferences"]):
+        divisions = sorted(conference.divisions.all(), key=lambda div: div.name)
+        for div_num, division in enumerate(divisions):
+            teams = sorted(division.teams.all(), key=lambda team: team.pk)
+            for seat, team in enumerate(teams):
+                slots[(conf_num, div_num, seat)] = team
+    return slots
+
+
+def get_structure_key(team_slots):
+    """
+    Describe a league's shape as "conferences-divisions-teams",
+    e.g. "2-4-4". Returns None if conferences or divisions differ in size.
+    """
+    divs_per_conf = Counter(conf for conf, div in {s[:2] for s in team_slots})
+    teams_per_div = Counter(slot[:2] for slot in team_slots)
+    if len(set(divs_per_conf.values())) != 1 or len(set(teams_per_div.values())) != 1:
+        return None
+    return "-".join(
+        str(num)
+        for num in (
+            len(divs_per_conf),
+            next(iter(divs_per_conf.values())),
+            next(iter(teams_per_div.values())),
+        )
+    )
+
+
+def shuffled(items, rng):
+    return rng.sample(items, len(items))
+
+
+@lru_cache(maxsize=None)
+def load_schedule_templates():
+    """Read the schedule template library, keyed by structure key."""
+    try:
+        with open(TEMPLATES_PATH, "r") as templates_file:
+            return json.load(templates_file)
+    except FileNotFoundError:
+        return {}
+
+
+def schedule_from_template(league_structure, rng=random):
+    """
+    Build a schedule by mapping a random pre-solved template onto the
+    league's teams. Conferences, divisions and seats are shuffled first;
+    the schedule rules don't depend on their order, so the result stays
+    valid. Returns None if there's no template for the league's shape.
+    """
+    team_slots = get_team_slots(league_structure)
+    templates = load_schedule_templates().get(get_structure_key(team_slots))
+    if not templates:
+        return None
+
+    slot_teams = {}
+    conferences = sorted({conf for conf, div, seat in team_slots})
+    for conf, to_conf in zip(conferences, shuffled(conferences, rng)):
+        divisions = sorted({d for c, d, s in team_slots if c == conf})
+        for div, to_div in zip(divisions, shuffled(divisions, rng)):
+            seats = sorted({s for c, d, s in team_slots if (c, d) == (conf, div)})
+            for seat, to_seat in zip(seats, shuffled(seats, rng)):
+                slot_teams[(conf, div, seat)] = team_slots[(to_conf, to_div, to_seat)]
+
+    template = rng.choice(templates)
+    return [
+        [[slot_teams[tuple(home)], slot_teams[tuple(away)]] for home, away in week]
+        for week in template
+    ]
+
+
+def schedule_to_template(schedule, team_slots):
+    """Express a schedule's teams as (conference, division, seat) slots."""
+    team_to_slot = {team: list(slot) for slot, team in team_slots.items()}
+    return [
+        [[team_to_slot[home], team_to_slot[away]] for home, away in week]
+        for week in schedule
+    ]
+
+
+def save_schedule_templates(structure_key, templates):
+    """Replace the templates for a league shape in the library."""
+    library = dict(load_schedule_templates())
+    library[structure_key] = templates
+    with open(TEMPLATES_PATH, "w") as templates_file:
+        json.dump(library, templates_file, separators=(",", ":"))
+    load_schedule_templates.cache_clear()
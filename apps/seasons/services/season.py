@@ -2,6 +2,10 @@ import datetime
 
 from django.apps import apps
 from django.contrib import messages
+from django.db import transaction
+
+from apps.leagues.cache import bump_league_version
+from apps.personnel.services.progression import progress_players
 
 from ..models import Season
 from .playoffs import advance_playoff_round, update_running_playoff_clinches
@@ -9,8 +13,14 @@ from .rankings import update_rankings
 from .standings import update_standings
 
 
-def advance_season_by_weeks(request, season, weeks=False):
-    """Advance the season by X number of weeks."""
+def advance_season(season, weeks=False, on_progress=None):
+    """
+    Advance the season by X number of weeks.
+
+    Each week is committed in its own transaction. `on_progress` is
+    called with (weeks_done, weeks_total) after each week.
+    Returns the message level and message to report to the user.
+    """
     current_week = season.week_number
     current_phase = season.get_phase_display()
     message_type = messages.SUCCESS
@@ -29,20 +39,31 @@ def advance_season_by_weeks(request, season, weeks=False):
     # Simulate based on selected or limited number of weeks
     for week_num in range(current_week, current_week + weeks):
         try:
-            adv_func = round_limits_and_funcs[current_phase][1]
-            if current_phase == "Offseason":
-                new_message = adv_func(season)
-            else:
-                new_message = adv_func(season, weeks, week_num)
+            with transaction.atomic():
+                adv_func = round_limits_and_funcs[current_phase][1]
+                if current_phase == "Offseason":
+                    new_message = adv_func(season)
+                else:
+                    new_message = adv_func(season, weeks, week_num)
+
+                season.current_date += datetime.timedelta(days=7)
+                season.week_number += 1
+                season.save()
+                bump_league_version(season.league_id)
         except KeyError:
             new_message = "Sorry, we aren't in the right part of the season for that!"
             message_type = messages.WARNING
             break
 
-        season.current_date += datetime.timedelta(days=7)
-        season.week_number += 1
-        season.save()
+        if on_progress is not None:
+            on_progress(week_num - current_week + 1, weeks)
 
+    return message_type, new_message
+
+
+def advance_season_by_weeks(request, season, weeks=False):
+    """Advance the season by X number of weeks and notify the user."""
+    message_type, new_message = advance_season(season, weeks)
     messages.add_message(request, message_type, new_message)
 
 
@@ -85,8 +106,12 @@ def advance_playoffs(season, weeks, week_num):
 
 
 def advance_to_next_season(season):
-    """End the current season and create a new one."""
-    success_message = "A new season has begun."
+    """
+    End the current season, age and develop the league's players and
+    create a new season.
+    """
+    retired = progress_players(season.league)
+    success_message = f"A new season has begun. {retired} player(s) retired."
     season.is_current = False
     season.save()
 
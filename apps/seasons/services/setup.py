@@ -3,9 +3,10 @@ import datetime
 from django.apps import apps
 from django.utils.text import slugify
 
+from apps.core.bulk import copy_bulk_create
 from apps.matchups.models import Matchup
 
-from .schedule import create_schedule
+from .schedule import WEEKS, create_schedule
 
 
 def create_first_season(league):
@@ -29,7 +30,8 @@ def create_season_details(season):
     matchups = create_schedule(season)
 
     # Bulk create Matchups based on schedule
-    Matchup.objects.bulk_create(
+    copy_bulk_create(
+        Matchup,
         [
             Matchup(
                 home_team=matchup[0],
@@ -44,10 +46,52 @@ def create_season_details(season):
             )
             for week_num in range(1, len(matchups) + 1)
             for matchup in matchups[week_num - 1]
-        ]
+        ],
     )
 
     # Bulk create TeamStanding for each team
-    TeamStanding.objects.bulk_create(
-        [TeamStanding(team=team, season=season) for team in season.league.teams.all()]
+    teams = list(season.league.teams.all())
+    copy_bulk_create(
+        TeamStanding, [TeamStanding(team=team, season=season) for team in teams]
     )
+
+    create_team_schedules(
+        season,
+        [team.pk for team in teams],
+        [
+            (week_num, home.pk, away.pk)
+            for week_num, week in enumerate(matchups[:WEEKS], 1)
+            for home, away in week
+        ],
+    )
+
+
+def create_team_schedules(season, team_ids=None, games=None):
+    """
+    Save each team's bye week for the season. `games` are (week number,
+    home team id, away team id) tuples, read from the season's regular
+    season matchups if not given.
+    """
+    TeamSchedule = apps.get_model("seasons.TeamSchedule")
+
+    if team_ids is None:
+        team_ids = season.league.teams.values_list("pk", flat=True)
+    if games is None:
+        games = Matchup.objects.filter(
+            season=season, week_number__lte=WEEKS
+        ).values_list("week_number", "home_team_id", "away_team_id")
+
+    weeks_played = {team_id: set() for team_id in team_ids}
+    for week_num, home_id, away_id in games:
+        weeks_played[home_id].add(week_num)
+        weeks_played[away_id].add(week_num)
+
+    schedules = []
+    for team_id, weeks in weeks_played.items():
+        byes = [week for week in range(1, WEEKS + 1) if week not in weeks]
+        schedules.append(
+            TeamSchedule(
+                team_id=team_id, season=season, bye_week=byes[0] if byes else None
+            )
+        )
+    copy_bulk_create(TeamSchedule, schedules)
@@ -1,45 +1,129 @@
+from django.apps import apps
+from django.db import transaction
+
 from ..models import TeamStanding
 
+SPLITS = ("home", "away", "div", "conf", "non_conf")
+RESULTS = {"W": "wins", "L": "losses", "T": "ties"}
+SPLIT_FIELDS = tuple(
+    f"{split}_{result}" for split in SPLITS for result in RESULTS.values()
+) + ("last_5",)
+STANDING_RESULT_FIELDS = (
+    "wins",
+    "losses",
+    "ties",
+    "points_for",
+    "points_against",
+    "streak",
+) + SPLIT_FIELDS
+
+
+def tally_result(standing, points_for, points_against):
+    """
+    Apply a single game result to a team's standing in memory.
+    Nothing is saved; the caller is responsible for persisting it.
+    """
+    # Update results and streaks
+    if points_for == points_against:
+        standing.ties += 1
+        standing.streak = 0
+    elif points_for > points_against:
+        standing.wins += 1
+        standing.streak = standing.streak + 1 if standing.streak > 0 else 1
+    else:
+        standing.losses += 1
+        standing.streak = standing.streak - 1 if standing.streak < 0 else -1
+
+    # Update PF and PA
+    standing.points_for += points_for
+    standing.points_against += points_against
+
+
+def get_matchup_split(matchup):
+    """Return whether a matchup is a "div", "conf" or "non_conf" game."""
+    home_team, away_team = matchup.home_team, matchup.away_team
+    if home_team.division_id == away_team.division_id:
+        return "div"
+    if home_team.conference_id == away_team.conference_id:
+        return "conf"
+    return "non_conf"
+
+
+def tally_splits(standing, points_for, points_against, is_home, split):
+    """
+    Apply a single game result to a team's split records in memory:
+    home/away, division/conference/non-conference and the last 5 games.
+    """
+    if points_for == points_against:
+        result = "T"
+    elif points_for > points_against:
+        result = "W"
+    else:
+        result = "L"
+
+    for prefix in ("home" if is_home else "away", split):
+        field = f"{prefix}_{RESULTS[result]}"
+        setattr(standing, field, getattr(standing, field) + 1)
+    standing.last_5 = (standing.last_5 + result)[-5:]
+
+
+def tally_matchups(standings, matchups):
+    """
+    Tally finalized matchups into standings keyed by team id.
+    Returns the standings that changed, in no particular order.
+    """
+    updated_standings = {}
+    for matchup in matchups:
+        split = get_matchup_split(matchup)
+        home_standing = standings[matchup.home_team_id]
+        away_standing = standings[matchup.away_team_id]
+        tally_result(home_standing, matchup.home_score, matchup.away_score)
+        tally_result(away_standing, matchup.away_score, matchup.home_score)
+        tally_splits(home_standing, matchup.home_score, matchup.away_score, True, split)
+        tally_splits(
+            away_standing, matchup.away_score, matchup.home_score, False, split
+        )
+        updated_standings[home_standing.pk] = home_standing
+        updated_standings[away_standing.pk] = away_standing
+    return list(updated_standings.values())
+
 
 def update_standings(season, matchups):
     """
     Generate scores and results for the current week, update standings.
+
+    The season's standings and the week's matchups are loaded once,
+    simulated as a batch and tallied in memory, then written back with
+    one bulk update per model inside a single transaction.
     """
-    for matchup in matchups:
-        matchup.simulate()
-        scores = matchup.get_score()
-        result = matchup.get_winning_team()
-
-        for team in (matchup.home_team, matchup.away_team):
-            standing = TeamStanding.objects.get(team=team, season=season)
-
-            # Update results and streaks
-            if result is None:
-                standing.ties += 1
-                if not standing.streak == 0:
-                    standing.streak = 0
-            elif result == team:
-                standing.wins += 1
-                if not standing.streak > 0:
-                    standing.streak = 1
-                else:
-                    standing.streak += 1
-            else:
-                standing.losses += 1
-                if not standing.streak < 0:
-                    standing.streak = -1
-                else:
-                    standing.streak -= 1
-
-            # Update PF and PA
-            home_score = scores["Home"]
-            away_score = scores["Away"]
-
-            if team == matchup.home_team:
-                standing.points_for += home_score
-                standing.points_against += away_score
-            else:
-                standing.points_for += away_score
-                standing.points_against += home_score
-
-            standing.save()
+    standings = {
+        standing.team_id: standing
+        for standing in TeamStanding.objects.filter(season=season).select_related(None)
+    }
+
+    with transaction.atomic():
+        matchups = matchups.simulate_all()
+        updated_standings = tally_matchups(standings, matchups)
+        TeamStanding.objects.bulk_update(updated_standings, STANDING_RESULT_FIELDS)
+
+
+def rebuild_standings(season):
+    """
+    Recalculate a season's records, including the split records, from
+    its finalized regular season matchups. For backfilling standings
+    created before a field was tallied; regular updates are incremental.
+    """
+    Matchup = apps.get_model("matchups.Matchup")
+
+    standings = {}
+    for standing in TeamStanding.objects.filter(season=season).select_related(None):
+        for field in STANDING_RESULT_FIELDS:
+            setattr(standing, field, standing._meta.get_field(field).get_default())
+        standings[standing.team_id] = standing
+
+    matchups = Matchup.objects.filter(
+        season=season, is_final=True, week_number__lte=18
+    ).order_by("week_number")
+    tally_matchups(standings, matchups)
+
+    TeamStanding.objects.bulk_update(standings.values(), STANDING_RESULT_FIELDS)
@@ -0,0 +1,636 @@
+import datetime
+import random
+from html.parser import HTMLParser
+from unittest import mock
+
+from django.contrib import messages
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.leagues.models import League
+from apps.matchups.models import Matchup
+from apps.teams.models import UserTeam
+
+from .models import AdvanceSeasonJob, TeamSchedule, TeamStanding
+from .services.jobs import claim_next_job, run_job, run_worker
+from .services.odds import load_odds_inputs, run_odds_simulation
+from .services.playoffs import get_running_clinch, magic_number
+from .services.rankings import update_rankings
+from .services.schedule import (
+    build_schedule,
+    factorize,
+    fetch_league_structure,
+    generate_matchups,
+    is_valid_schedule,
+    set_schedule,
+)
+from .services.schedule_templates import (
+    get_structure_key,
+    get_team_slots,
+    schedule_from_template,
+)
+from .services.standings import (
+    STANDING_RESULT_FIELDS,
+    rebuild_standings,
+    tally_result,
+    tally_splits,
+    update_standings,
+)
+
+
+class TallyResultTest(SimpleTestCase):
+    """Test in-memory tallying of a single game result."""
+
+    def setUp(self):
+        self.standing = TeamStanding(streak=0)
+
+    def test_win_extends_streak(self):
+        self.standing.streak = 2
+        tally_result(self.standing, 24, 17)
+        self.assertEqual(self.standing.wins, 1)
+        self.assertEqual(self.standing.streak, 3)
+        self.assertEqual(self.standing.points_for, 24)
+        self.assertEqual(self.standing.points_against, 17)
+
+    def test_loss_resets_winning_streak(self):
+        self.standing.streak = 2
+        tally_result(self.standing, 10, 17)
+        self.assertEqual(self.standing.losses, 1)
+        self.assertEqual(self.standing.streak, -1)
+
+    def test_tie_resets_streak(self):
+        self.standing.streak = -3
+        tally_result(self.standing, 20, 20)
+        self.assertEqual(self.standing.ties, 1)
+        self.assertEqual(self.standing.streak, 0)
+
+    def test_splits_are_tallied(self):
+        tally_splits(self.standing, 24, 17, True, "div")
+        tally_splits(self.standing, 10, 17, False, "non_conf")
+        tally_splits(self.standing, 20, 20, False, "conf")
+        self.assertEqual(
+            (
+                self.standing.home_wins,
+                self.standing.away_losses,
+                self.standing.away_ties,
+            ),
+            (1, 1, 1),
+        )
+        self.assertEqual(
+            (self.standing.div_wins, self.standing.non_conf_losses),
+            (1, 1),
+        )
+        self.assertEqual(self.standing.conf_ties, 1)
+        self.assertEqual(self.standing.last_5, "WLT")
+
+    def test_last_5_keeps_latest_results(self):
+        for points_for in (24, 24, 10, 10, 24, 10):
+            tally_splits(self.standing, points_for, 17, True, "div")
+        self.assertEqual(self.standing.last_5, "WLLWL")
+        self.assertEqual(
+            (
+                self.standing.last_5_wins,
+                self.standing.last_5_losses,
+                self.standing.last_5_ties,
+            ),
+            (2, 3, 0),
+        )
+
+
+class MagicNumberTest(SimpleTestCase):
+    """Test clinch magic numbers and the running clinch they produce."""
+
+    def test_magic_number_counts_remaining_games(self):
+        leader = TeamStanding(wins=8, losses=2, ties=0)
+        chaser = TeamStanding(wins=5, losses=5, ties=0)
+        # Chaser can reach 12 wins, leader needs 13
+        self.assertEqual(magic_number(leader, chaser), 5)
+
+    def test_magic_number_is_zero_when_chaser_cannot_catch_up(self):
+        leader = TeamStanding(wins=14, losses=1, ties=0)
+        chaser = TeamStanding(wins=2, losses=13, ties=0)
+        self.assertEqual(magic_number(leader, chaser), 0)
+
+    def test_ties_count_as_half_wins(self):
+        leader = TeamStanding(wins=10, losses=2, ties=1)
+        chaser = TeamStanding(wins=6, losses=6, ties=1)
+        # Chaser can reach 10.5, leader has 10.5
+        self.assertEqual(magic_number(leader, chaser), 1)
+
+    def test_running_clinch_prefers_highest_clinch(self):
+        standing = TeamStanding(clinched=None)
+        standing.bye_magic, standing.div_magic = 0, 0
+        standing.berth_magic, standing.elimination_number = 0, None
+        self.assertEqual(get_running_clinch(standing), "BYE")
+
+    def test_running_clinch_never_downgrades(self):
+        standing = TeamStanding(clinched="BYE")
+        standing.bye_magic, standing.div_magic = 1, 0
+        standing.berth_magic, standing.elimination_number = 0, None
+        self.assertEqual(get_running_clinch(standing), "BYE")
+
+
+class FactorizeTest(SimpleTestCase):
+    """Test splitting regular multigraphs into rounds."""
+
+    def test_double_round_robin(self):
+        edges = [(a, b) for a in range(4) for b in range(4) if a != b]
+        rounds = factorize(edges)
+        self.assertEqual(len(rounds), 6)
+        for games in rounds:
+            teams = [team for i in games for team in edges[i]]
+            self.assertEqual(sorted(teams), [0, 1, 2, 3])
+
+    def test_irregular_graph_is_rejected(self):
+        self.assertIsNone(factorize([(0, 1), (1, 2), (2, 3)]))
+
+
+class ScheduleTest(TestCase):
+    """Test building a season schedule from the generated matchups."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="scheduleuser@example.com", password="testpass123", is_active=True
+        )
+        cls.league = League.objects.create(
+            name="Schedule League", user=user, gm_name="Test GM"
+        )
+
+    def setUp(self):
+        # A few generated matchup sets can't be constructed (and fall back
+        # to set_schedule), so generate the same set every time
+        random.seed(0)
+        self.matchups = generate_matchups(fetch_league_structure(self.league))
+
+    def test_constructed_schedule_is_valid(self):
+        schedule = build_schedule(self.matchups, random.Random(1))
+        self.assertTrue(is_valid_schedule(schedule, self.matchups))
+
+    def test_constructed_schedule_is_deterministic(self):
+        self.assertEqual(
+            build_schedule(self.matchups, random.Random(1)),
+            build_schedule(self.matchups, random.Random(1)),
+        )
+
+    def test_unexpected_matchups_are_not_constructed(self):
+        self.assertIsNone(build_schedule(self.matchups[1:]))
+
+    def test_algorithm_x_schedule_is_valid(self):
+        schedule = set_schedule(self.matchups)
+        self.assertTrue(is_valid_schedule(schedule, self.matchups))
+
+    def test_template_schedule_is_valid(self):
+        league_structure = fetch_league_structure(self.league)
+        self.assertEqual(get_structure_key(get_team_slots(league_structure)), "2-4-4")
+
+        schedule = schedule_from_template(league_structure, random.Random(1))
+        matchups = [matchup for week in schedule for matchup in week]
+        self.assertTrue(is_valid_schedule(schedule, matchups))
+        for team in self.league.teams.all():
+            games = [matchup for matchup in matchups if team in matchup]
+            div_games = [m for m in games if m[0].division_id == m[1].division_id]
+            self.assertEqual(len(games), 17)
+            self.assertEqual(len(div_games), 6)
+
+    def test_template_schedule_query_count(self):
+        league_structure = fetch_league_structure(self.league)
+        with CaptureQueriesContext(connection) as queries:
+            schedule_from_template(league_structure)
+        self.assertLessEqual(len(queries), 3)
+
+    def test_invalid_schedule_is_detected(self):
+        schedule = build_schedule(self.matchups)
+        schedule[0], schedule[5] = schedule[5], schedule[0]
+        self.assertFalse(is_valid_schedule(schedule, self.matchups))
+
+
+class TeamScheduleTest(TestCase):
+    """Test the team schedules saved alongside a season's matchups."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="teamscheduleuser@example.com",
+            password="testpass123",
+            is_active=True,
+        )
+        cls.league = League.objects.create(
+            name="Team Schedule League", user=user, gm_name="Test GM"
+        )
+        cls.season = cls.league.current_season
+
+    def test_schedules_match_matchups(self):
+        schedules = TeamSchedule.objects.filter(season=self.season)
+        self.assertEqual(schedules.count(), 32)
+
+        for schedule in schedules:
+            matchups = Matchup.objects.filter_by_team(schedule.team).filter(
+                season=self.season, week_number__lte=18
+            )
+            weeks = set(matchups.values_list("week_number", flat=True))
+            self.assertEqual(len(weeks), 17)
+            self.assertEqual(set(range(1, 19)) - weeks, {schedule.bye_week})
+
+    def test_byes_are_read_from_schedules(self):
+        for week_number in range(6, 14):
+            with self.assertNumQueries(1):
+                bye_teams = list(self.season.get_byes(week_number))
+            self.assertEqual(len(bye_teams), 4)
+            for team in bye_teams:
+                self.assertEqual(team.bye_week, week_number)
+                self.assertFalse(
+                    Matchup.objects.filter_by_team(team)
+                    .filter(season=self.season, week_number=week_number)
+                    .exists()
+                )
+        self.assertFalse(self.season.get_byes(1).exists())
+
+
+class UpdateStandingsTest(TestCase):
+    """Test the week-level simulation and standings update."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="seasonuser@example.com", password="testpass123", is_active=True
+        )
+        cls.league = League.objects.create(
+            name="Season League", user=user, gm_name="Test GM"
+        )
+        cls.season = cls.league.current_season
+
+    def test_week_results_are_tallied(self):
+        matchups = Matchup.objects.filter(season=self.season, week_number=1)
+        update_standings(self.season, matchups)
+
+        self.assertFalse(matchups.filter(is_final=False).exists())
+
+        standings = TeamStanding.objects.filter(season=self.season)
+        games = sum(s.wins + s.losses + s.ties for s in standings)
+        self.assertEqual(games, 2 * matchups.count())
+        self.assertEqual(
+            sum(s.points_for for s in standings),
+            sum(s.points_against for s in standings),
+        )
+
+    def test_week_uses_constant_number_of_queries(self):
+        matchups = Matchup.objects.filter(season=self.season, week_number=1)
+        with CaptureQueriesContext(connection) as queries:
+            update_standings(self.season, matchups)
+        # Including the lineups, the box score load and one upsert per
+        # season stat rollup table, or batches of rows without them
+        self.assertLessEqual(
+            len(queries), 11 if connection.vendor == "postgresql" else 100
+        )
+
+    def test_split_records_add_up(self):
+        for week_number in range(1, 8):
+            matchups = Matchup.objects.filter(
+                season=self.season, week_number=week_number
+            )
+            update_standings(self.season, matchups)
+
+        for standing in TeamStanding.objects.filter(season=self.season):
+            for result in ("wins", "losses", "ties"):
+                total = getattr(standing, result)
+                location = [
+                    getattr(standing, f"{s}_{result}") for s in ("home", "away")
+                ]
+                kind = [
+                    getattr(standing, f"{s}_{result}")
+                    for s in ("div", "conf", "non_conf")
+                ]
+                self.assertEqual(sum(location), total)
+                self.assertEqual(sum(kind), total)
+            self.assertEqual(len(standing.last_5), 5)
+
+    def test_rebuild_matches_incremental_updates(self):
+        for week_number in range(1, 8):
+            matchups = Matchup.objects.filter(
+                season=self.season, week_number=week_number
+            )
+            update_standings(self.season, matchups)
+
+        def records():
+            return list(
+                TeamStanding.objects.filter(season=self.season)
+                .order_by("team_id")
+                .values_list(*STANDING_RESULT_FIELDS)
+            )
+
+        expected = records()
+        TeamStanding.objects.filter(season=self.season).update(
+            wins=0, home_wins=0, div_losses=0, last_5="", streak=0
+        )
+        rebuild_standings(self.season)
+        self.assertEqual(records(), expected)
+
+
+class UpdateRankingsTest(TestCase):
+    """Test division, conference and power ranking generation."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="rankinguser@example.com", password="testpass123", is_active=True
+        )
+        league = League.objects.create(
+            name="Ranking League", user=user, gm_name="Test GM"
+        )
+        cls.season = league.current_season
+        for week_number in (1, 2, 3):
+            matchups = Matchup.objects.filter(
+                season=cls.season, week_number=week_number
+            )
+            update_standings(cls.season, matchups)
+
+    def test_rankings_are_complete_per_entity(self):
+        update_rankings(self.season)
+        standings = TeamStanding.objects.filter(season=self.season)
+
+        for division_id in standings.values_list("team__division", flat=True):
+            ranks = standings.filter(team__division=division_id).values_list(
+                "division_ranking", flat=True
+            )
+            self.assertEqual(sorted(ranks), [1, 2, 3, 4])
+
+        for conference_id in standings.values_list("team__conference", flat=True):
+            conf_standings = standings.filter(team__conference=conference_id)
+            ranks = conf_standings.values_list("conference_ranking", flat=True)
+            self.assertEqual(sorted(ranks), list(range(1, 17)))
+            leader_ranks = conf_standings.filter(division_ranking=1).values_list(
+                "conference_ranking", flat=True
+            )
+            self.assertEqual(sorted(leader_ranks), [1, 2, 3, 4])
+
+        power_ranks = standings.values_list("power_ranking", flat=True)
+        self.assertEqual(sorted(power_ranks), list(range(1, 33)))
+
+    def test_division_rankings_follow_record(self):
+        update_rankings(self.season)
+        standings = TeamStanding.objects.filter(season=self.season).order_by(
+            "team__division", "division_ranking"
+        )
+        previous = None
+        for standing in standings:
+            if previous and previous.team.division_id == standing.team.division_id:
+                self.assertGreaterEqual(previous.wins, standing.wins)
+            previous = standing
+
+    def test_rankings_use_constant_number_of_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            update_rankings(self.season)
+        self.assertLessEqual(len(queries), 12)
+
+
+class TableRowParser(HTMLParser):
+    """Count the <th> and <td> cells of every row, table by table."""
+
+    def __init__(self):
+        super().__init__()
+        self.tables = []
+
+        self.in_table = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self.tables.append([])
+            self.in_table = True
+        elif self.in_table and tag == "tr":
+            self.tables[-1].append(0)
+        elif self.in_table and tag in ("th", "td"):
+            self.tables[-1][-1] += 1
+
+    def handle_endtag(self, tag):
+        if tag == "table":
+            self.in_table = False
+
+
+class LeagueStandingsViewTest(TestCase):
+    """Test standings pages render with their magic numbers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="standingsuser@example.com", password="testpass123", is_active=True
+        )
+        cls.league = League.objects.create(
+            name="Standings League", user=user, gm_name="Test GM"
+        )
+        season = cls.league.current_season
+        for week_number in range(1, 10):
+            matchups = Matchup.objects.filter(season=season, week_number=week_number)
+            update_standings(season, matchups)
+            update_rankings(season)
+
+    def setUp(self):
+        self.client.login(email="standingsuser@example.com", password="testpass123")
+
+    def test_division_standings_show_magic_numbers(self):
+        url = reverse("seasons:league_standings", args=[self.league.slug])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Div #")
+        for standing in response.context["standings"]:
+            if standing.division_ranking == 1:
+                self.assertIsNotNone(standing.div_magic)
+            else:
+                self.assertIsNone(standing.div_magic)
+
+    def test_conference_standings_show_magic_numbers(self):
+        url = reverse("seasons:league_standings", args=[self.league.slug])
+        response = self.client.get(url, {"entity": "conference"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Magic #")
+
+    def test_rows_match_their_headers(self):
+        url = reverse("seasons:league_standings", args=[self.league.slug])
+        for entity in ("division", "conference"):
+            response = self.client.get(url, {"entity": entity})
+            parser = TableRowParser()
+            parser.feed(response.content.decode())
+            self.assertTrue(parser.tables)
+            for header, *rows in parser.tables:
+                self.assertTrue(rows)
+                self.assertEqual(set(rows), {header}, entity)
+
+
+@override_settings(PLAYOFF_ODDS_TRIALS=200)
+class PlayoffOddsTest(TestCase):
+    """Test Monte Carlo playoff odds."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="oddsuser@example.com", password="testpass123", is_active=True
+        )
+        cls.league = League.objects.create(
+            name="Odds League", user=user, gm_name="Test GM"
+        )
+        cls.season = cls.league.current_season
+        for week_number in range(1, 5):
+            matchups = Matchup.objects.filter(
+                season=cls.season, week_number=week_number
+            )
+            update_standings(cls.season, matchups)
+        update_rankings(cls.season)
+
+    def test_odds_account_for_every_slot(self):
+        inputs = load_odds_inputs(self.season)
+        self.assertEqual(len(inputs["team_ids"]), 32)
+        self.assertEqual(
+            len(inputs["games"]),
+            Matchup.objects.filter(
+                season=self.season, week_number__lte=18, is_final=False
+            ).count(),
+        )
+
+        division, bye, berth, title = run_odds_simulation(inputs, 200, seed=1)
+        self.assertAlmostEqual(division.sum(), 8)
+        self.assertAlmostEqual(bye.sum(), 2)
+        self.assertAlmostEqual(berth.sum(), 14)
+        self.assertAlmostEqual(title.sum(), 1)
+        self.assertTrue((bye <= division).all() and (division <= berth).all())
+
+    def test_parallel_workers_match_trial_count(self):
+        inputs = load_odds_inputs(self.season)
+        division, bye, berth, title = run_odds_simulation(
+            inputs, 100, workers=2, seed=1
+        )
+        self.assertAlmostEqual(berth.sum(), 14)
+        self.assertAlmostEqual(title.sum(), 1)
+
+    def test_standings_show_odds(self):
+        self.client.login(email="oddsuser@example.com", password="testpass123")
+        url = reverse("seasons:league_standings", args=[self.league.slug])
+        response = self.client.get(url, {"entity": "odds"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Playoff Odds")
+        for standing in response.context["standings"]:
+            self.assertEqual(set(standing.odds), {"division", "bye", "berth", "title"})
+
+
+@override_settings(ADVANCE_SEASON_IN_BACKGROUND=True)
+class AdvanceSeasonJobTest(TestCase):
+    """Test queueing and running season advance jobs."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="jobuser@example.com", password="testpass123", is_active=True
+        )
+        cls.league = League.objects.create(
+            name="Job League", user=cls.user, gm_name="Test GM"
+        )
+        UserTeam.objects.create(league=cls.league, team=cls.league.teams.first())
+        cls.advance_url = reverse("seasons:advance_season", args=[cls.league.slug])
+        cls.status_url = reverse(
+            "seasons:advance_season_status", args=[cls.league.slug]
+        )
+
+    def setUp(self):
+        self.client.login(email="jobuser@example.com", password="testpass123")
+
+    def test_advance_is_queued_not_simulated(self):
+        response = self.client.post(self.advance_url, {"advance": "2"})
+        self.assertEqual(response.status_code, 302)
+
+        job = AdvanceSeasonJob.objects.get(season__league=self.league)
+        self.assertEqual(job.status, "QUEUED")
+        self.assertEqual(job.weeks, 2)
+        self.assertEqual(self.league.current_season.week_number, 1)
+
+    def test_only_one_active_job_per_season(self):
+        self.client.post(self.advance_url, {"advance": "1"})
+        self.client.post(self.advance_url, {"advance": "Next"})
+        self.assertEqual(
+            AdvanceSeasonJob.objects.filter(season__league=self.league).count(), 1
+        )
+
+    def test_worker_runs_job_and_reports_progress(self):
+        self.client.post(self.advance_url, {"advance": "2"})
+        run_worker(once=True)
+
+        job = AdvanceSeasonJob.objects.get(season__league=self.league)
+        self.assertEqual(job.status, "DONE")
+        self.assertEqual((job.weeks_done, job.weeks_total), (2, 2))
+        self.assertEqual(self.league.current_season.week_number, 3)
+
+        response = self.client.get(self.status_url)
+        self.assertEqual(response.json()["status"], "DONE")
+        self.assertIn("2 week(s)", response.json()["message"])
+        job.refresh_from_db()
+        self.assertTrue(job.is_delivered)
+
+    def test_stale_running_job_is_failed(self):
+        self.client.post(self.advance_url, {"advance": "1"})
+        job = claim_next_job()
+        AdvanceSeasonJob.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+
+        # Polling stops and the season can be advanced again
+        response = self.client.get(self.status_url)
+        self.assertEqual(response.json()["status"], "FAILED")
+        self.client.post(self.advance_url, {"advance": "1"})
+        self.assertEqual(
+            AdvanceSeasonJob.objects.filter(season__league=self.league)
+            .filter(status="QUEUED")
+            .count(),
+            1,
+        )
+
+    def test_worker_fails_stale_jobs_before_claiming(self):
+        self.client.post(self.advance_url, {"advance": "1"})
+        job = claim_next_job()
+        self.assertIsNone(claim_next_job())
+        AdvanceSeasonJob.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        self.assertIsNone(claim_next_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, "FAILED")
+
+    def test_pages_deliver_finished_job_messages(self):
+        # The job finished before any page polled its status
+        self.client.post(self.advance_url, {"advance": "1"})
+        run_worker(once=True)
+        league_url = reverse("leagues:league_detail", args=[self.league.slug])
+        response = self.client.get(league_url)
+        self.assertContains(response, "1 week(s)")
+        job = AdvanceSeasonJob.objects.get(season__league=self.league)
+        self.assertTrue(job.is_delivered)
+
+        response = self.client.get(league_url)
+        self.assertNotContains(response, "1 week(s)")
+
+    def test_job_failed_while_running_is_not_overwritten(self):
+        self.client.post(self.advance_url, {"advance": "1"})
+        job = claim_next_job()
+
+        def fail_stale(season, weeks, on_progress):
+            # The worker was presumed dead before the advance finished
+            AdvanceSeasonJob.objects.filter(pk=job.pk).update(status="FAILED")
+            return messages.SUCCESS, "Advanced 1 week(s)."
+
+        with mock.patch("apps.seasons.services.jobs.advance_season", fail_stale):
+            run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "FAILED")
+        self.assertNotEqual(job.message, "Advanced 1 week(s).")
+
+    def test_status_without_jobs(self):
+        response = self.client.get(self.status_url)
+        self.assertEqual(response.json(), {"status": None})
+
+    @override_settings(ADVANCE_SEASON_IN_BACKGROUND=False)
+    def test_advance_in_request(self):
+        self.client.post(self.advance_url, {"advance": "1"})
+        self.assertFalse(AdvanceSeasonJob.objects.exists())
+        self.assertEqual(self.league.current_season.week_number, 2)
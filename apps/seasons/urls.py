@@ -7,6 +7,8 @@ app_name = 'seasons'
 urlpatterns = [
     path('<slug:league>/advance-season/',
          views.AdvanceSeasonFormView.as_view(), name='advance_season'),
+    path('<slug:league>/advance-season/status/',
+         views.AdvanceSeasonStatusView.as_view(), name='advance_season_status'),
     path('<slug:league>/standings/',
          views.LeagueStandingsView.as_view(), name='league_standings'),
 ]
@@ -1,19 +1,38 @@
+from django.conf import settings
 from django.contrib import messages
-from django.core.exceptions import ObjectDoesNotExist
-from django.http import Http404, HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect, JsonResponse
 from django.utils.decorators import method_decorator
+from django.views import View
 from django.views.decorators.http import require_POST
 from django.views.generic import FormView, ListView
 
-from apps.leagues.mixins import LeagueContextMixin
+from apps.leagues.mixins import (
+    LeagueCacheMixin,
+    LeagueConditionalMixin,
+    LeagueContextMixin,
+)
 from apps.leagues.permissions import IsLeagueOwner
+from apps.leagues.resolver import get_league_resolver
 
 from .forms import AdvanceSeasonForm
-from .models import TeamStanding
+from .models import AdvanceSeasonJob, TeamStanding
+from .services.jobs import (
+    deliver_job_messages,
+    enqueue_advance_job,
+    fail_stale_jobs,
+)
+from .services.odds import get_playoff_odds
+from .services.playoffs import compute_magic_numbers
 from .services.season import advance_season_by_weeks
 
 
-class LeagueStandingsView(IsLeagueOwner, LeagueContextMixin, ListView):
+class LeagueStandingsView(
+    IsLeagueOwner,
+    LeagueConditionalMixin,
+    LeagueCacheMixin,
+    LeagueContextMixin,
+    ListView,
+):
     """
     View team standings by division, conference, or league-wide.
     """
@@ -30,6 +49,7 @@ class LeagueStandingsView(IsLeagueOwner, LeagueContextMixin, ListView):
             "division": "seasons/division_standings.html",
             "conference": "seasons/conference_standings.html",
             "power": "seasons/power_rankings.html",
+            "odds": "seasons/playoff_odds.html",
         }
         try:
             names.append(entity_tmpls[entity])
@@ -39,9 +59,9 @@ class LeagueStandingsView(IsLeagueOwner, LeagueContextMixin, ListView):
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        season = super().get_context_data(object_list=queryset)["season"]
+        season = self.get_season()
 
-        queryset = queryset.with_extras().with_wlt().filter(season=season)
+        queryset = queryset.with_extras().filter(season=season)
         entity = self.request.GET.get("entity", "division")
 
         entity_qs = {
@@ -55,6 +75,9 @@ class LeagueStandingsView(IsLeagueOwner, LeagueContextMixin, ListView):
                 "team__conference", "conference_ranking", "-team__overall_rating"
             ),
             "power": queryset.order_by("power_ranking", "-team__overall_rating"),
+            "odds": queryset.order_by(
+                "team__conference", "conference_ranking", "-team__overall_rating"
+            ),
         }
 
         try:
@@ -66,6 +89,14 @@ class LeagueStandingsView(IsLeagueOwner, LeagueContextMixin, ListView):
         context = super().get_context_data(**kwargs)
 
         context["entity"] = self.request.GET.get("entity", "division")
+        # Set magic numbers on the already-fetched standings (no extra queries)
+        compute_magic_numbers(context["standings"])
+
+        # Playoff odds are only simulated during the regular season
+        if context["entity"] == "odds" and context["season"].phase == 4:
+            odds = get_playoff_odds(context["season"])
+            for standing in context["standings"]:
+                standing.odds = odds.get(standing.team_id)
         return context
 
 
@@ -84,21 +115,15 @@ class AdvanceSeasonFormView(IsLeagueOwner, LeagueContextMixin, FormView):
         Override FormView post() method to ensure the user has
         selected a team before advancing the season.
         """
-        context = self.get_context_data()
-        league = context["league"]
-
-        try:
-            league.user_teams.get(is_active_team=True)
-        except ObjectDoesNotExist:
+        if get_league_resolver(request).user_team is None:
             messages.error(request, "Please select a team before advancing.")
             return HttpResponseRedirect(request.META.get("HTTP_REFERER", "/"))
 
         return super().post(request, *args, **kwargs)
 
     def form_valid(self, form):
-        # Get Season context provided by LeagueContextMixin
-        context = self.get_context_data()
-        season = context["season"]
+        # Season provided by LeagueContextMixin
+        season = self.get_season()
 
         # Advance to end of phase or X weeks
         advance = form.cleaned_data["advance"]
@@ -106,9 +131,45 @@ class AdvanceSeasonFormView(IsLeagueOwner, LeagueContextMixin, FormView):
             weeks = False
         else:
             weeks = int(advance)
-        advance_season_by_weeks(self.request, season, weeks)
+
+        if settings.ADVANCE_SEASON_IN_BACKGROUND:
+            # Simulated by the run_advance_worker command
+            job, created = enqueue_advance_job(season, self.request.user, weeks)
+            if created:
+                messages.info(self.request, "Advancing the season...")
+            else:
+                messages.warning(self.request, "The season is already advancing.")
+        else:
+            advance_season_by_weeks(self.request, season, weeks)
 
         return super().form_valid(form)
 
     def get_success_url(self):
         return self.request.META.get("HTTP_REFERER", "/")
+
+
+class AdvanceSeasonStatusView(IsLeagueOwner, View):
+    """
+    Report the progress of the league's latest season advance job as JSON.
+    Delivers the job's message to the user once it has finished.
+    """
+
+    def get(self, request, *args, **kwargs):
+        jobs = AdvanceSeasonJob.objects.filter(
+            season__league__slug=self.kwargs["league"], user=request.user
+        )
+        # Stop polling jobs abandoned by a worker that died
+        fail_stale_jobs(jobs)
+        job = jobs.last()
+        if job is None:
+            return JsonResponse({"status": None})
+
+        deliver_job_messages(request, [job])
+        return JsonResponse(
+            {
+                "status": job.status,
+                "weeks_done": job.weeks_done,
+                "weeks_total": job.weeks_total,
+                "message": job.message,
+            }
+        )
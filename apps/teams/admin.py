@@ -2,7 +2,7 @@ from django.contrib import admin
 
 from apps.personnel.admin import PlayerInline
 
-from .models import Team, UserTeam
+from .models import DepthChartSpot, Team, UserTeam
 
 
 class TeamAdmin(admin.ModelAdmin):
@@ -15,5 +15,11 @@ class UserTeamAdmin(admin.ModelAdmin):
     list_display = ("league", "team", "user", "is_active_team")
 
 
+class DepthChartSpotAdmin(admin.ModelAdmin):
+    list_display = ("team", "position", "depth", "player")
+    list_filter = ("team__league__name", "position")
+
+
 admin.site.register(Team, TeamAdmin)
 admin.site.register(UserTeam, UserTeamAdmin)
+admin.site.register(DepthChartSpot, DepthChartSpotAdmin)
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_depth_charts(apps, schema_editor):
+    """Rank every team's contracted players at each position."""
+    Contract = apps.get_model("personnel", "Contract")
+    DepthChartSpot = apps.get_model("teams", "DepthChartSpot")
+
+    contracts = Contract.objects.filter(is_active=True).order_by(
+        "team_id", "-player__overall_rating", "player_id"
+    )
+    depths = {}
+    spots = []
+    for team_id, player_id, position in contracts.values_list(
+        "team_id", "player_id", "player__position"
+    ):
+        depth = depths[(team_id, position)] = depths.get((team_id, position), 0) + 1
+        spots.append(
+            DepthChartSpot(
+                team_id=team_id, player_id=player_id, position=position, depth=depth
+            )
+        )
+    DepthChartSpot.objects.bulk_create(spots, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('personnel', '0001_initial'),
+        ('teams', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepthChartSpot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.CharField(max_length=50)),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='depth_chart_spots', to='personnel.player')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='depth_chart_spots', to='teams.team')),
+            ],
+            options={
+                'ordering': ['team', 'position', 'depth'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='depthchartspot',
+            constraint=models.UniqueConstraint(fields=('team', 'position', 'depth'), name='unique_depth_chart_spot'),
+        ),
+        migrations.RunPython(create_depth_charts, migrations.RunPython.noop),
+    ]
@@ -4,8 +4,6 @@ from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.utils.functional import cached_property
 
-from apps.matchups.models import Matchup
-
 from .managers import TeamManager
 
 
@@ -47,24 +45,17 @@ class Team(models.Model):
         self.overall_rating = team_overall["overall_rating__avg"]
         self.save()
 
+        from .services.depth_chart import refresh_depth_charts
+
+        refresh_depth_charts([self])
+
     @property
     def bye_week(self) -> int | None:
-        """Find a team's bye week based on their season matchups."""
-        season = self.league.current_season
-        bye_week = None
-
-        team_matchups = Matchup.objects.filter_by_team(self).filter_by_reg_season(
-            season
+        """Find a team's bye week from its current season's schedule."""
+        bye_weeks = self.schedules.filter(season__is_current=True).values_list(
+            "bye_week", flat=True
         )
-        possible_weeks = set(range(1, 19))
-        matchup_weeks = team_matchups.values_list("week_number", flat=True)
-        for m_week in matchup_weeks:
-            possible_weeks.remove(m_week)
-
-        if possible_weeks:
-            bye_week = possible_weeks.pop()
-
-        return bye_week
+        return next(iter(bye_weeks), None)
 
     @property
     def current_record(self) -> str:
@@ -92,3 +83,33 @@ class UserTeam(models.Model):
 
     def __str__(self):
         return f"User team - {self.team.abbreviation} - {self.league}"
+
+
+class DepthChartSpot(models.Model):
+    """
+    A player's place on their team's depth chart at their position, where
+    depth 1 is the starter. Maintained by apps.teams.services.depth_chart
+    from active contracts so rosters and depth charts are a single read.
+    """
+
+    team = models.ForeignKey(
+        Team, on_delete=models.CASCADE, related_name="depth_chart_spots"
+    )
+    player = models.ForeignKey(
+        "personnel.Player",
+        on_delete=models.CASCADE,
+        related_name="depth_chart_spots",
+    )
+    position = models.CharField(max_length=50)
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ["team", "position", "depth"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["team", "position", "depth"], name="unique_depth_chart_spot"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.team.abbreviation} {self.position}{self.depth} - {self.player}"
@@ -0,0 +1,97 @@
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.db import transaction
+
+from apps.core.bulk import copy_bulk_create
+from apps.personnel.services.distributions import POSITION_DIST
+
+from ..models import DepthChartSpot
+
+
+def sort_positions(positions):
+    """Order positions as they're listed in the roster distribution."""
+    order = list(POSITION_DIST)
+    return sorted(
+        positions, key=lambda pos: order.index(pos) if pos in order else len(order)
+    )
+
+
+def build_depth_chart(team, players):
+    """
+    Build a team's unsaved depth chart spots from its saved players,
+    ranked by overall rating at each position.
+    """
+    depths = Counter()
+    spots = []
+    for player in sorted(
+        players, key=lambda player: (-player.overall_rating, player.pk)
+    ):
+        depths[player.position] += 1
+        spots.append(
+            DepthChartSpot(
+                team=team,
+                player=player,
+                position=player.position,
+                depth=depths[player.position],
+            )
+        )
+    return spots
+
+
+def create_depth_charts(rosters):
+    """
+    Save the depth charts of newly created teams with one COPY load.
+    `rosters` is a list of (saved team, saved players) pairs.
+    """
+    copy_bulk_create(
+        DepthChartSpot,
+        [
+            spot
+            for team, players in rosters
+            for spot in build_depth_chart(team, players)
+        ],
+    )
+
+
+def refresh_depth_charts(teams):
+    """
+    Rebuild the depth charts of `teams` from their active contracts.
+    Call whenever player ratings or contracts change.
+    """
+    Player = apps.get_model("personnel.Player")
+
+    team_ids = [team.pk for team in teams]
+    rosters = defaultdict(list)
+    players = Player.objects.filter(
+        contracts__team_id__in=team_ids, contracts__is_active=True
+    ).values_list("contracts__team_id", "id", "position", "overall_rating")
+    for team_id, player_id, position, overall_rating in players:
+        rosters[team_id].append(
+            Player(pk=player_id, position=position, overall_rating=overall_rating)
+        )
+
+    with transaction.atomic():
+        DepthChartSpot.objects.filter(team_id__in=team_ids).delete()
+        copy_bulk_create(
+            DepthChartSpot,
+            [
+                spot
+                for team in teams
+                for spot in build_depth_chart(team, rosters[team.pk])
+            ],
+        )
+
+
+def get_depth_chart(team):
+    """
+    Map each of a team's positions to its player ids in depth order,
+    so a position's starter is `depth_chart[position][0]`.
+    """
+    depth_chart = defaultdict(list)
+    spots = team.depth_chart_spots.order_by("position", "depth").values_list(
+        "position", "player_id"
+    )
+    for position, player_id in spots:
+        depth_chart[position].append(player_id)
+    return {position: depth_chart[position] for position in sort_positions(depth_chart)}
@@ -1,20 +1,23 @@
 import csv
 import os
-
-from django.apps import apps
+from functools import lru_cache
 
 from apps.personnel.services.setup import (
-    create_team_players,
+    ROSTER_POSITIONS,
+    build_players,
+    create_players,
     read_player_names_from_csv,
 )
 
 from ..models import Team
+from .depth_chart import create_depth_charts
 
 
-def read_team_info_from_csv(league, confs, divs):
+@lru_cache(maxsize=None)
+def load_team_catalog():
     """
-    Read locations, names, and abbr of teams from CSV.
-    Return a dict w/ abbrs as keys and remaining data as values.
+    Read locations, names, abbrs, confs and divs of teams from CSV
+    once per process. Returns a tuple of row tuples.
     """
     with open(
         os.path.join(os.path.dirname(__file__), "../data/nfl-teams.csv"), "r"
@@ -22,37 +25,54 @@ def read_team_info_from_csv(league, confs, divs):
         team_reader = csv.reader(team_data_file, delimiter=",")
         next(team_reader)  # Skip headings
 
-        team_dicts = []
-        for row in team_reader:
-            loc, name, abbr, conf, div = row[1:6]
-            team_dict = {
-                "location": loc,
-                "name": name,
-                "abbreviation": abbr,
-                "slug": abbr,
-                "conference": confs.get(name=conf),
-                "division": divs.get(name=div, conference__name=conf),
-                "league": league,
-            }
-            team_dicts.append(team_dict)
+        return tuple(tuple(row[1:6]) for row in team_reader)
+
+
+def read_team_info_from_csv(league, confs, divs):
+    """
+    Build team data from the cached team catalog.
+    Return a list of dicts that map to Team model fields.
+    """
+    conf_lookup = {conf.name: conf for conf in confs}
+    div_lookup = {(div.conference.name, div.name): div for div in divs}
 
-    return team_dicts
+    return [
+        {
+            "location": loc,
+            "name": name,
+            "abbreviation": abbr,
+            "slug": abbr,
+            "conference": conf_lookup[conf],
+            "division": div_lookup[(conf, div)],
+            "league": league,
+        }
+        for loc, name, abbr, conf, div in load_team_catalog()
+    ]
 
 
-def create_teams(league):
+def create_teams(league, confs, divs):
     """
-    Create 32 teams in the correct confs and divs
+    Create 32 teams in the correct confs and divs along with their players.
+    Teams, players and contracts are built in memory and saved with one
+    bulk query each.
     Called from create_league_structure() in apps.leagues.services.setup
     """
-
-    confs = league.conferences.all()
-    Division = apps.get_model("leagues.Division")
-    divs = Division.objects.filter(conference__in=confs)
     team_dicts = read_team_info_from_csv(league, confs, divs)
-
-    team_objs = Team.objects.bulk_create(
-        [Team(**team_dict) for team_dict in team_dicts]
-    )
     player_names = read_player_names_from_csv()
-    for team in team_objs:
-        create_team_players(league, team, player_names)
+
+    players = build_players(league, player_names, len(team_dicts))
+    roster_size = len(ROSTER_POSITIONS)
+
+    rosters = []
+    for i, team_dict in enumerate(team_dicts):
+        team = Team(**team_dict)
+        team_players = players[i * roster_size : (i + 1) * roster_size]
+        # Same as Team.update_team_overall(), without the aggregate query
+        team.overall_rating = int(
+            sum(player.overall_rating for player in team_players) / roster_size
+        )
+        rosters.append((team, team_players))
+
+    Team.objects.bulk_create([team for team, players in rosters])
+    create_players(rosters)
+    create_depth_charts(rosters)
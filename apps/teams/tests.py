@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.leagues.models import League
+from apps.personnel.models import Player
+from apps.personnel.services.distributions import POSITION_DIST
+
+from .models import DepthChartSpot
+from .services.depth_chart import get_depth_chart, refresh_depth_charts
+
+
+class DepthChartTest(TestCase):
+    """Test maintaining each team's depth chart."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="depthuser@example.com", password="testpass123", is_active=True
+        )
+        cls.league = League.objects.create(
+            name="Depth League", user=cls.user, gm_name="Test GM"
+        )
+        cls.team = cls.league.teams.order_by("pk").first()
+
+    def setUp(self):
+        cache.clear()
+
+    def assertDepthOrder(self, team):
+        depth_chart = get_depth_chart(team)
+        self.assertEqual(list(depth_chart), list(POSITION_DIST))
+        for position, player_ids in depth_chart.items():
+            ratings = Player.objects.in_bulk(player_ids)
+            self.assertEqual(
+                [ratings[pk].overall_rating for pk in player_ids],
+                sorted((p.overall_rating for p in ratings.values()), reverse=True),
+            )
+            self.assertTrue(all(p.position == position for p in ratings.values()))
+
+    def test_created_teams_have_depth_charts(self):
+        self.assertEqual(
+            DepthChartSpot.objects.filter(team__league=self.league).count(), 53 * 32
+        )
+        self.assertDepthOrder(self.team)
+
+    def test_rating_changes_refresh_depth_chart(self):
+        backup_qb_id = get_depth_chart(self.team)["QB"][-1]
+        Player.objects.filter(pk=backup_qb_id).update(overall_rating=99)
+        self.team.update_team_overall()
+        self.assertEqual(get_depth_chart(self.team)["QB"][0], backup_qb_id)
+        self.assertDepthOrder(self.team)
+
+    def test_inactive_contracts_are_dropped(self):
+        starter_id = get_depth_chart(self.team)["QB"][0]
+        self.team.contracts.filter(player_id=starter_id).update(is_active=False)
+        refresh_depth_charts([self.team])
+        self.assertNotIn(starter_id, get_depth_chart(self.team)["QB"])
+        self.assertEqual(self.team.depth_chart_spots.count(), 52)
+
+    def test_views_render_from_depth_chart(self):
+        self.client.login(email="depthuser@example.com", password="testpass123")
+        for name, query in (
+            ("teams:team_roster", ""),
+            ("teams:depth_chart", "?position=HB"),
+        ):
+            url = reverse(name, args=[self.league.slug, self.team.slug]) + query
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            player_queries = [
+                captured["sql"]
+                for captured in queries
+                if '"personnel_player"' in captured["sql"]
+            ]
+            self.assertEqual(len(player_queries), 1)
+            self.assertIn("teams_depthchartspot", player_queries[0])
+
+        depth_chart = get_depth_chart(self.team)
+        self.assertEqual(
+            [player.pk for player in response.context["players"]], depth_chart["HB"]
+        )
+        self.assertEqual(response.context["positions"], list(depth_chart))
+
+    def test_unknown_position_is_not_found(self):
+        self.client.login(email="depthuser@example.com", password="testpass123")
+        url = reverse("teams:depth_chart", args=[self.league.slug, self.team.slug])
+        response = self.client.get(url + "?position=XX")
+        self.assertEqual(response.status_code, 404)
@@ -6,12 +6,18 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_POST
 from django.views.generic import DetailView, FormView, ListView
 
-from apps.leagues.mixins import LeagueContextMixin
+from apps.leagues.cache import bump_league_version
+from apps.leagues.mixins import (
+    LeagueCacheMixin,
+    LeagueConditionalMixin,
+    LeagueContextMixin,
+)
 from apps.leagues.permissions import IsLeagueOwner
 
 from .forms import TeamSelectForm
 from .mixins import LeagueTeamsMixin
 from .models import Team, UserTeam
+from .services.depth_chart import sort_positions
 
 
 @method_decorator(require_POST, name="dispatch")
@@ -25,8 +31,7 @@ class TeamSelectFormView(IsLeagueOwner, LeagueContextMixin, FormView):
     template_name = "teams/forms/team_select_form.html"
 
     def form_valid(self, form):
-        context = self.get_context_data()
-        league = context["league"]  # From LeagueContextMixin
+        league = self.get_league()  # From LeagueContextMixin
 
         team = form.cleaned_data["team"]
         user_team_exists = True
@@ -46,6 +51,7 @@ class TeamSelectFormView(IsLeagueOwner, LeagueContextMixin, FormView):
                 UserTeam.objects.create(league=league, team=team)
             except IntegrityError:
                 raise Http404("There was an error selecting your team.")
+            bump_league_version(league.pk)
             messages.add_message(
                 self.request,
                 messages.SUCCESS,
@@ -64,7 +70,13 @@ class TeamSelectFormView(IsLeagueOwner, LeagueContextMixin, FormView):
         return self.request.META.get("HTTP_REFERER", "/")
 
 
-class TeamListView(IsLeagueOwner, LeagueTeamsMixin, LeagueContextMixin, ListView):
+class TeamListView(
+    IsLeagueOwner,
+    LeagueConditionalMixin,
+    LeagueTeamsMixin,
+    LeagueContextMixin,
+    ListView,
+):
     """
     List the teams belonging to the active league and provide context
     indicating whether the user's team has been selected.
@@ -83,7 +95,13 @@ class TeamListView(IsLeagueOwner, LeagueTeamsMixin, LeagueContextMixin, ListView
         return context
 
 
-class TeamDetailView(IsLeagueOwner, LeagueTeamsMixin, LeagueContextMixin, DetailView):
+class TeamDetailView(
+    IsLeagueOwner,
+    LeagueConditionalMixin,
+    LeagueTeamsMixin,
+    LeagueContextMixin,
+    DetailView,
+):
     """
     View additional details about an individual team.
     """
@@ -93,7 +111,14 @@ class TeamDetailView(IsLeagueOwner, LeagueTeamsMixin, LeagueContextMixin, Detail
     template_name = "teams/team_detail.html"
 
 
-class TeamRosterView(IsLeagueOwner, LeagueTeamsMixin, LeagueContextMixin, DetailView):
+class TeamRosterView(
+    IsLeagueOwner,
+    LeagueConditionalMixin,
+    LeagueCacheMixin,
+    LeagueTeamsMixin,
+    LeagueContextMixin,
+    DetailView,
+):
     """
     View an individual team's roster and player attributes,
     sorted by overall rating.
@@ -108,16 +133,23 @@ class TeamRosterView(IsLeagueOwner, LeagueTeamsMixin, LeagueContextMixin, Detail
 
         Player = apps.get_model("personnel.Player")
 
-        contracts = self.object.contracts.all()
-        player_ids = contracts.values("player_id")
-        context["players"] = Player.objects.filter(id__in=player_ids).order_by(
-            "-overall_rating"
-        )
+        players = Player.objects.filter(depth_chart_spots__team=self.object)
+        players = list(players.order_by("-overall_rating"))
+        for player in players:
+            player.league = context["league"]
+        context["players"] = players
 
         return context
 
 
-class DepthChartView(IsLeagueOwner, LeagueTeamsMixin, LeagueContextMixin, DetailView):
+class DepthChartView(
+    IsLeagueOwner,
+    LeagueConditionalMixin,
+    LeagueCacheMixin,
+    LeagueTeamsMixin,
+    LeagueContextMixin,
+    DetailView,
+):
     """
     View an individual team's depth chart by position.
     """
@@ -129,22 +161,19 @@ class DepthChartView(IsLeagueOwner, LeagueTeamsMixin, LeagueContextMixin, Detail
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        Player = apps.get_model("personnel.Player")
-
-        contracts = self.object.contracts.all()
-        player_ids = contracts.values("player_id")
-        players = Player.objects.filter(id__in=player_ids)
-
-        positions = list(dict.fromkeys([player.position for player in players]))
+        spots = list(self.object.depth_chart_spots.select_related("player"))
+        positions = sort_positions({spot.position for spot in spots})
         position = self.request.GET.get("position", "QB")
 
         if position not in positions:
             raise Http404("Position does not exist")
 
+        players = [spot.player for spot in spots if spot.position == position]
+        for player in players:
+            player.league = context["league"]
+
         context["positions"] = positions
         context["active_position"] = position
-        context["players"] = players.filter(position=position).order_by(
-            "-overall_rating"
-        )
+        context["players"] = players
 
         return context
@@ -1,3 +1,4 @@
+import { Advance } from './components/advance';
 import { Messages } from './components/messages';
 import { Standings } from './components/standings';
 import { Layout } from './layouts/layout';
@@ -0,0 +1,35 @@
+'use strict';
+
+const POLL_INTERVAL = 1500;
+
+function pollAdvanceProgress() {
+  const progress = document.getElementById('advance-progress');
+  if (progress === null) {
+    return;
+  }
+  const weeks = document.getElementById('advance-progress-weeks');
+
+  const poll = () => {
+    fetch(progress.dataset.statusUrl, { credentials: 'same-origin' })
+      .then((response) => response.json())
+      .then((job) => {
+        if (job.status === 'QUEUED' || job.status === 'RUNNING') {
+          if (job.weeks_total) {
+            weeks.innerHTML = ` &middot; Week ${job.weeks_done} of ${job.weeks_total}`;
+          }
+          setTimeout(poll, POLL_INTERVAL);
+        } else {
+          // Finished; reload to show the updated league and job message
+          window.location.reload();
+        }
+      });
+  };
+
+  setTimeout(poll, POLL_INTERVAL);
+}
+
+const Advance = (() => {
+  pollAdvanceProgress();
+})();
+
+export default Advance;
@@ -100,6 +100,7 @@ TEMPLATES = [
                 # For advance season form used in base template               
                 'apps.seasons.context_processors.advance_season_form',
                 'apps.teams.context_processors.user_team',  # Active user team
+                'apps.leagues.context_processors.current_season',
             ],
         },
     },
@@ -124,6 +125,18 @@ DATABASES = {
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'  # Primary key type
 
 
+### Cache
+
+# Local memory by default; use django.core.cache.backends.filebased.FileBasedCache
+# with a directory as the location to share the cache between processes
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', default=''),
+    }
+}
+
+
 ### Internationalization
 
 USE_I18N = True
@@ -233,6 +246,34 @@ SERVER_EMAIL = 'contact@example.com' # Needed for mailing admins
 DEFAULT_FROM_EMAIL = 'admin@example.com'
 
 
+### Season advancement
+
+# Queue advance requests for the run_advance_worker command instead of
+# simulating them during the request. Only enable with a running worker
+ADVANCE_SEASON_IN_BACKGROUND = env_to_bool(os.environ.get("DJANGO_ADVANCE_SEASON_IN_BACKGROUND", default=False))
+
+# Seconds a running advance job may go without progress before it's
+# considered abandoned by a dead worker and marked as failed
+ADVANCE_JOB_TIMEOUT = int(os.environ.get("DJANGO_ADVANCE_JOB_TIMEOUT", default=300))
+
+# Monte Carlo playoff odds: number of simulated seasons and the
+# processes they are split across (1 simulates in the request process)
+PLAYOFF_ODDS_TRIALS = int(os.environ.get("DJANGO_PLAYOFF_ODDS_TRIALS", default=10000))
+PLAYOFF_ODDS_WORKERS = int(os.environ.get("DJANGO_PLAYOFF_ODDS_WORKERS", default=1))
+
+# Directory the refresh_score_tables command builds the playoff odds'
+# score tables into, see apps.matchups.services.score_tables
+SCORE_TABLES_DIR = os.environ.get("DJANGO_SCORE_TABLES_DIR", default=str(BASE_DIR.joinpath('media', 'score-tables')))
+
+# Rendered league pages are cached until the league changes, see
+# apps.leagues.cache
+LEAGUE_CACHE_TIMEOUT = int(os.environ.get("DJANGO_LEAGUE_CACHE_TIMEOUT", default=60 * 60 * 24))
+
+# Pre-built leagues kept ready by the run_league_pool_worker command so
+# creating a league only has to claim one
+LEAGUE_POOL_SIZE = int(os.environ.get("DJANGO_LEAGUE_POOL_SIZE", default=5))
+
+
 ### Messages
 
 MESSAGE_TAGS = {
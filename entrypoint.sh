@@ -16,4 +16,7 @@ fi
 # python manage.py flush --no-input
 # python manage.py migrate
 
+# Playoff odds fall back to small in-memory tables until they're built
+python manage.py refresh_score_tables --default --if-missing
+
 exec "$@"
\ No newline at end of file